@@ -1,13 +1,18 @@
+from pathlib import Path
+from typing import Optional
+
 import typer
 from typer_examples import install
 
 from fmd.__about__ import __version__
 from fmd.commands import _utils
+from fmd.commands.backup import app as backup_app
 from fmd.commands.cleanup import cleanup
 from fmd.commands.deploy import app as deploy_app
 from fmd.commands.release import app as release_app
 from fmd.commands.remote_worker import app as remote_worker_app
 from fmd.commands.search_replace import search_replace
+from fmd.tracing import get_tracer
 
 app = typer.Typer(rich_markup_mode="rich", invoke_without_command=True, no_args_is_help=True)
 install(app)
@@ -23,12 +28,28 @@ def _version_callback(value: bool):
 def main(
     ctx: typer.Context,
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose output for all commands."),
+    trace: Optional[Path] = typer.Option(
+        None,
+        "--trace",
+        envvar="FMD_TRACE",
+        help="Write a Chrome trace (chrome://tracing, Perfetto) of every manager, service and command to this file.",
+        show_default=False,
+    ),
+    trace_otlp: Optional[str] = typer.Option(
+        None,
+        "--trace-otlp",
+        envvar="FMD_TRACE_OTLP",
+        help="Write the trace as OTLP JSON to this file, or POST it to this collector URL.",
+        show_default=False,
+    ),
     version: bool = typer.Option(
         False, "--version", "-V", help="Show version.", callback=_version_callback, is_eager=True
     ),
 ):
     if verbose:
         _utils.set_verbose(True)
+    if trace or trace_otlp:
+        get_tracer().configure(chrome_path=trace, otlp_target=trace_otlp)
     if ctx.invoked_subcommand is None:
         typer.echo(ctx.get_help())
 
@@ -36,9 +57,14 @@ def main(
 app.add_typer(deploy_app, name="deploy")
 app.add_typer(release_app, name="release")
 app.add_typer(remote_worker_app, name="remote-worker")
+app.add_typer(backup_app, name="backup")
 app.command("search-replace", no_args_is_help=True)(search_replace)
 app.command("cleanup", no_args_is_help=True)(cleanup)
 
 
 def cli_entrypoint():
-    app()
+    try:
+        app()
+    finally:
+        for target in get_tracer().export():
+            typer.echo(f"Trace written to {target}", err=True)
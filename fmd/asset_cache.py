@@ -0,0 +1,137 @@
+import hashlib
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    import git
+except Exception:
+    git = None
+
+from fmd.helpers import clone_tree, file_lock, hardlink_or_copy
+from fmd.logger import get_logger
+from fmd.node_cache import NodeModulesCache
+
+ASSETS_JSON_FILES = ("assets.json", "assets-rtl.json")
+LAST_USED_STAMP = ".fmd-last-used"
+
+_BUILD_HOOKS = ("before_bench_build", "host_before_bench_build")
+
+
+def _commit(path: Path) -> Optional[str]:
+    if git is None:
+        return None
+    try:
+        repo = git.Repo(path, search_parent_directories=True)
+        if repo.is_dirty(untracked_files=False):
+            return None
+        return repo.head.commit.hexsha
+    except Exception:
+        return None
+
+
+class AssetCache:
+    """Built frontend assets per app, keyed by the app's commit, lockfile and the Node version.
+
+    An entry holds the app's ``public/dist`` tree and the app's lines from
+    ``sites/assets/assets.json`` and ``assets-rtl.json``. The key also covers frappe's
+    commit, since frappe's esbuild config builds every app.
+    """
+
+    def __init__(self, root: Path, max_age_days: int = 14) -> None:
+        self.root = root
+        self.max_age_seconds = max_age_days * 24 * 3600
+
+    @classmethod
+    def from_config(cls, config) -> Optional["AssetCache"]:
+        if not config.release.asset_cache:
+            return None
+        return cls(config.workspace_root / ".cache" / "assets", config.release.asset_cache_max_age)
+
+    @staticmethod
+    def key(app, app_path: Path, frappe_path: Path, node_version: Optional[str]) -> Optional[str]:
+        """Cache key for ``app``, or None when its sources can't be pinned to a commit."""
+        commit = _commit(app_path)
+        frappe_commit = _commit(frappe_path)
+        if commit is None or frappe_commit is None:
+            return None
+
+        digest = hashlib.sha256()
+        digest.update(f"app={commit}\0frappe={frappe_commit}\0".encode())
+        digest.update(f"node_modules={NodeModulesCache.key(app_path, node_version)}\0".encode())
+        for hook in _BUILD_HOOKS:
+            digest.update(f"{hook}={getattr(app, hook, None) or ''}\0".encode())
+        return digest.hexdigest()
+
+    def entry(self, key: str) -> Path:
+        return self.root / key
+
+    def has(self, key: str) -> bool:
+        return (self.entry(key) / "assets.json").is_file()
+
+    def restore(self, key: str, dist_path: Path, assets_dir: Path) -> str:
+        """Copy the cached dist into ``dist_path`` and merge its entries into ``assets_dir``'s assets json."""
+        entry = self.entry(key)
+        method = "none"
+        if (entry / "dist").is_dir():
+            method = clone_tree(entry / "dist", dist_path)
+
+        cached = json.loads((entry / "assets.json").read_text())
+        assets_dir.mkdir(parents=True, exist_ok=True)
+        for name in ASSETS_JSON_FILES:
+            if not cached.get(name):
+                continue
+            path = assets_dir / name
+            current = json.loads(path.read_text()) if path.is_file() else {}
+            current.update(cached[name])
+            path.write_text(json.dumps(current, indent=4))
+
+        (entry / LAST_USED_STAMP).touch()
+        return method
+
+    def store(self, key: str, module_name: str, dist_path: Path, assets_dir: Path) -> None:
+        prefix = f"/assets/{module_name}/"
+        entries = {}
+        for name in ASSETS_JSON_FILES:
+            path = assets_dir / name
+            if not path.is_file():
+                continue
+            data = json.loads(path.read_text())
+            entries[name] = {k: v for k, v in data.items() if isinstance(v, str) and v.startswith(prefix)}
+
+        with file_lock(self.root / ".lock"):
+            entry = self.entry(key)
+            if entry.exists():
+                return
+            tmp = self.root / f".{key}.tmp"
+            if tmp.exists():
+                shutil.rmtree(tmp)
+            tmp.mkdir(parents=True)
+            start = time.time()
+            if dist_path.is_dir():
+                shutil.copytree(dist_path, tmp / "dist", symlinks=True, copy_function=hardlink_or_copy)
+            (tmp / "assets.json").write_text(json.dumps(entries, indent=2))
+            (tmp / LAST_USED_STAMP).touch()
+            tmp.rename(entry)
+            get_logger().debug(f"ASSET CACHE: stored {module_name} as {key[:12]} in {time.time() - start:.2f}s")
+
+    def prune(self) -> list[str]:
+        if not self.root.is_dir():
+            return []
+
+        removed = []
+        now = time.time()
+        with file_lock(self.root / ".lock", blocking=False) as acquired:
+            if not acquired:
+                return []
+            for entry in self.root.iterdir():
+                if entry.name.startswith(".") or not entry.is_dir():
+                    continue
+                stamp = entry / LAST_USED_STAMP
+                last_used = stamp.stat().st_mtime if stamp.exists() else 0.0
+                if now - last_used > self.max_age_seconds:
+                    shutil.rmtree(entry, ignore_errors=True)
+                    removed.append(entry.name)
+        return removed
@@ -0,0 +1,269 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+from fmd.consts import BACKUP_STORE_DIR_NAME
+from fmd.db_stream import READ_SIZE, compressed_writer
+from fmd.helpers import file_lock
+from fmd.logger import get_logger
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Chunk boundaries are only considered at these anchors: row separators of multi-row
+# INSERTs and line ends, so a row added or removed only changes the chunks around it.
+_ANCHOR = re.compile(rb"\n|\),\(")
+MIN_CHUNK = 16 << 10
+MAX_CHUNK = 4 << 20
+# Past MIN_CHUNK a boundary falls about every this many bytes, whatever the row width.
+AVERAGE_GAP = 64 << 10
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def split_chunks(reader: BinaryIO) -> Iterator[bytes]:
+    """Split ``reader`` into content-defined chunks.
+
+    A chunk ends at an anchor where the bytes since the previous anchor (a row, or a
+    line) hash below a threshold proportional to their length, at least ``MIN_CHUNK`` and
+    at most ``MAX_CHUNK`` bytes in. Hashing the whole row rather than a fixed window keeps
+    rows that end in the same columns from all hashing alike. Boundaries depend only on
+    the bytes around them, so after an insertion or deletion the chunking falls back in
+    step and the rest of the file yields the same chunks as before. Data without anchors
+    is cut every ``MAX_CHUNK`` bytes.
+    """
+    # Chunks are sliced out at an offset into the buffer; the consumed prefix is only
+    # dropped once it passes MAX_CHUNK, instead of copying the remainder on every chunk.
+    buffer = bytearray()
+    view = memoryview(buffer)
+    start = 0
+    eof = False
+    while not eof or start < len(buffer):
+        if start > MAX_CHUNK:
+            view.release()
+            del buffer[:start]
+            view = memoryview(buffer)
+            start = 0
+        while not eof and len(buffer) - start < MAX_CHUNK:
+            data = reader.read(max(READ_SIZE, MAX_CHUNK - len(buffer) + start))
+            if not data:
+                eof = True
+            view.release()
+            buffer += data
+            view = memoryview(buffer)
+        if start == len(buffer):
+            return
+        cut = None
+        previous = None
+        for match in _ANCHOR.finditer(buffer, start + MIN_CHUNK // 2, start + MAX_CHUNK):
+            end = match.end()
+            if previous is not None and end - start >= MIN_CHUNK:
+                threshold = ((end - previous) << 32) // AVERAGE_GAP
+                if zlib.crc32(view[previous:end]) < threshold:
+                    cut = end
+                    break
+            previous = end
+        if cut is None:
+            cut = min(start + MAX_CHUNK, len(buffer))
+        yield bytes(view[start:cut])
+        start = cut
+
+
+def _open_source(path: Path) -> tuple[BinaryIO, Optional[str]]:
+    """Open a backup file decompressed, so that unchanged content chunks identically across backups."""
+    if path.name.endswith(".gz"):
+        return gzip.open(path, "rb"), "gzip"
+    if path.name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("Storing .zst backups needs the zstandard package: pip install zstandard")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True), "zstd"
+    return open(path, "rb"), None
+
+
+class BackupStore:
+    """Content-addressed store of deployment backups shared by every backup of a workspace.
+
+    Each file of a backup is decompressed, split with ``split_chunks`` and each chunk is
+    kept once under ``chunks/<sha256>``, compressed with zstd when available and zlib
+    otherwise. ``snapshots/<name>.json`` lists a backup's files and their chunks, so
+    successive backups of a mostly unchanged database only add the chunks that changed.
+    ``restore`` writes a backup back out in its original layout and compression. Chunks
+    no snapshot refers to are removed by ``gc``.
+    """
+
+    def __init__(self, root: Path, threads: int = 0) -> None:
+        self.root = root
+        self.threads = threads or os.cpu_count() or 1
+
+    @classmethod
+    def for_workspace(cls, workspace_root: Path) -> "BackupStore":
+        return cls(workspace_root / BACKUP_STORE_DIR_NAME)
+
+    def _lock(self):
+        return file_lock(self.root / ".lock")
+
+    def chunk_path(self, digest: str) -> Path:
+        return self.root / "chunks" / digest[:2] / digest
+
+    def snapshot_path(self, name: str) -> Path:
+        return self.root / "snapshots" / f"{name}.json"
+
+    @staticmethod
+    def _compress(chunk: bytes) -> tuple[str, bytes]:
+        digest = hashlib.sha256(chunk).hexdigest()
+        if zstandard is not None:
+            return digest, zstandard.ZstdCompressor(level=3).compress(chunk)
+        return digest, zlib.compress(chunk, 6)
+
+    @staticmethod
+    def _decompress(data: bytes) -> bytes:
+        if data[:4] == _ZSTD_MAGIC:
+            if zstandard is None:
+                raise RuntimeError("Reading this backup store needs the zstandard package: pip install zstandard")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    def _put(self, digest: str, data: bytes) -> int:
+        """Store a compressed chunk unless it's already there; returns the bytes written."""
+        path = self.chunk_path(digest)
+        if path.exists():
+            return 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{digest}.tmp-{os.getpid()}")
+        tmp.write_bytes(data)
+        tmp.rename(path)
+        return len(data)
+
+    def _add_file(self, path: Path, executor: ThreadPoolExecutor) -> tuple[dict, int]:
+        reader, compression = _open_source(path)
+        entry = {"size": 0, "compression": compression, "chunks": []}
+        written = 0
+        with reader:
+            pending = []
+            for chunk in split_chunks(reader):
+                entry["size"] += len(chunk)
+                pending.append(executor.submit(self._compress, chunk))
+                if len(pending) >= 2 * self.threads:
+                    written += self._store_pending(pending, entry)
+            written += self._store_pending(pending, entry)
+        return entry, written
+
+    def _store_pending(self, pending: list, entry: dict) -> int:
+        written = 0
+        for future in pending:
+            digest, data = future.result()
+            entry["chunks"].append(digest)
+            written += self._put(digest, data)
+        pending.clear()
+        return written
+
+    def add(self, name: str, source: Path, site: Optional[str] = None) -> dict:
+        """Store every file under ``source`` as snapshot ``name``; returns it with the bytes it added."""
+        start = time.time()
+        snapshot = {
+            "name": name,
+            "site": site,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "files": {},
+        }
+        written = 0
+        with self._lock(), ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="backup-store") as pool:
+            for path in sorted(p for p in source.rglob("*") if p.is_file()):
+                entry, added = self._add_file(path, pool)
+                snapshot["files"][path.relative_to(source).as_posix()] = entry
+                written += added
+            snapshot["size"] = sum(entry["size"] for entry in snapshot["files"].values())
+            snapshot["added_bytes"] = written
+            snapshot["seconds"] = round(time.time() - start, 3)
+            path = self.snapshot_path(name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+            tmp.write_text(json.dumps(snapshot, indent=1))
+            tmp.rename(path)
+        get_logger().debug(f"BACKUP STORE: {name} added {written} bytes in {snapshot['seconds']}s")
+        return snapshot
+
+    def snapshots(self) -> list[dict]:
+        """All snapshots, newest first."""
+        found = []
+        for path in (self.root / "snapshots").glob("*.json"):
+            try:
+                found.append(json.loads(path.read_text()))
+            except ValueError:
+                continue
+        return sorted(found, key=lambda snapshot: snapshot["name"], reverse=True)
+
+    def get(self, name: str) -> dict:
+        path = self.snapshot_path(name)
+        if not path.is_file():
+            raise FileNotFoundError(f"No backup named {name} in {self.root}")
+        return json.loads(path.read_text())
+
+    def read_file(self, entry: dict) -> Iterator[bytes]:
+        """Uncompressed contents of a snapshot file, chunk by chunk, each checked against its hash."""
+        for digest in entry["chunks"]:
+            chunk = self._decompress(self.chunk_path(digest).read_bytes())
+            if hashlib.sha256(chunk).hexdigest() != digest:
+                raise RuntimeError(f"Backup store chunk {digest} is corrupt")
+            yield chunk
+
+    def restore(self, name: str, dest: Path) -> list[Path]:
+        """Write snapshot ``name`` into ``dest`` with the files' original names and compression."""
+        snapshot = self.get(name)
+        written = []
+        for rel, entry in snapshot["files"].items():
+            path = dest / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "wb") as f:
+                if entry["compression"]:
+                    writer = compressed_writer(f, entry["compression"], level=3, threads=self.threads)
+                    try:
+                        for chunk in self.read_file(entry):
+                            writer.write(chunk)
+                    finally:
+                        writer.close()
+                else:
+                    for chunk in self.read_file(entry):
+                        f.write(chunk)
+            written.append(path)
+        return written
+
+    def remove(self, name: str) -> None:
+        with self._lock():
+            self.snapshot_path(name).unlink(missing_ok=True)
+
+    def prune(self, keep: int) -> list[str]:
+        """Remove all but the ``keep`` newest snapshots; returns the removed names."""
+        removed = [snapshot["name"] for snapshot in self.snapshots()[keep:]] if keep > 0 else []
+        for name in removed:
+            self.remove(name)
+        return removed
+
+    def gc(self) -> tuple[int, int]:
+        """Delete chunks no snapshot refers to; returns how many and their size on disk."""
+        count = size = 0
+        with self._lock():
+            referenced = {
+                digest
+                for snapshot in self.snapshots()
+                for entry in snapshot["files"].values()
+                for digest in entry["chunks"]
+            }
+            for path in (self.root / "chunks").glob("*/*"):
+                if path.name not in referenced:
+                    size += path.stat().st_size
+                    path.unlink()
+                    count += 1
+        return count, size
+
+    def disk_usage(self) -> int:
+        return sum(path.stat().st_size for path in (self.root / "chunks").glob("*/*"))
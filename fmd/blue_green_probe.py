@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""HTTP probe used by blue/green switches and warm-up, run inside the frappe container.
+
+``wait`` polls a URL until it answers 200 or the timeout passes.
+``watch`` requests a URL every interval and appends one JSON line per request
+to an output file until a stop file appears.
+``measure`` requests each URL once, in order, and prints their status and latency as JSON.
+``warm`` requests each URL ``--requests`` times with at most ``--concurrency`` requests
+in flight and prints per-URL counts as JSON.
+``replay`` does the same but prints every request's status and latency, leaving out
+the first ``--discard`` rounds.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def probe(url: str, host: str, timeout: float) -> tuple[bool, int, float]:
+    request = urllib.request.Request(url, headers={"Host": host})
+    start = time.time()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception:
+        status = 0
+    return status == 200, status, (time.time() - start) * 1000
+
+
+def wait(args) -> int:
+    url = args.urls[0]
+    deadline = time.time() + args.timeout
+    while time.time() < deadline:
+        ok, status, _ = probe(url, args.host, args.request_timeout)
+        if ok:
+            print(f"healthy: {url}")
+            return 0
+        time.sleep(args.interval)
+    print(f"not healthy after {args.timeout}s: {url} (last status {status})", file=sys.stderr)
+    return 1
+
+
+def watch(args) -> int:
+    url = args.urls[0]
+    with open(args.output, "a") as out:
+        while not os.path.exists(args.stop_file):
+            now = time.time()
+            ok, status, latency = probe(url, args.host, args.request_timeout)
+            out.write(json.dumps({"t": now, "ok": ok, "status": status, "ms": round(latency, 1)}) + "\n")
+            out.flush()
+            time.sleep(max(0.0, args.interval - (time.time() - now)))
+    return 0
+
+
+def measure(args) -> int:
+    results = {}
+    for url in args.urls:
+        ok, status, latency = probe(url, args.host, args.request_timeout)
+        results[url] = {"ok": ok, "status": status, "ms": round(latency, 1)}
+    print(json.dumps(results))
+    return 0
+
+
+def warm(args) -> int:
+    results = {url: {"requests": 0, "failed": 0, "max_ms": 0.0} for url in args.urls}
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+        futures = [
+            (url, pool.submit(probe, url, args.host, args.request_timeout))
+            for _ in range(args.requests)
+            for url in args.urls
+        ]
+        for url, future in futures:
+            ok, _, latency = future.result()
+            results[url]["requests"] += 1
+            results[url]["failed"] += 0 if ok else 1
+            results[url]["max_ms"] = max(results[url]["max_ms"], round(latency, 1))
+    print(json.dumps(results))
+    return 0
+
+
+def replay(args) -> int:
+    results = {url: [] for url in args.urls}
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+        futures = [
+            (round_, url, pool.submit(probe, url, args.host, args.request_timeout))
+            for round_ in range(args.discard + args.requests)
+            for url in args.urls
+        ]
+        for round_, url, future in futures:
+            ok, status, latency = future.result()
+            if round_ >= args.discard:
+                results[url].append({"ok": ok, "status": status, "ms": round(latency, 1)})
+    print(json.dumps(results))
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("mode", choices=["wait", "watch", "measure", "warm", "replay"])
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--host", required=True, help="Host header, i.e. the site name.")
+    parser.add_argument("--interval", type=float, default=0.5)
+    parser.add_argument("--request-timeout", type=float, default=5.0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output")
+    parser.add_argument("--stop-file")
+    parser.add_argument("--requests", type=int, default=1, help="Requests per URL (warm, replay).")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight (warm, replay).")
+    parser.add_argument("--discard", type=int, default=0, help="Leading rounds left out of the results (replay).")
+    args = parser.parse_args()
+
+    modes = {"wait": wait, "watch": watch, "measure": measure, "warm": warm, "replay": replay}
+    return modes[args.mode](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional
+
+from fmd.release_directory import BenchDirectory
+
+# Not part of an app's source: VCS data, installed or built JS, bytecode. *.egg-info
+# directories written by editable installs are skipped as well.
+_SKIPPED_DIRS = {".git", "node_modules", "__pycache__", "dist", ".github"}
+_PYTHON_SUFFIXES = (".py", ".pyc")
+
+
+def app_non_python_fingerprint(app_path: Path) -> str:
+    """Hash of every file in an app's source tree except Python modules.
+
+    Built assets are left out: they're compared through ``assets.json``, whose bundle
+    names carry content hashes.
+    """
+    digest = hashlib.sha256()
+    files = []
+    for root, dirs, names in os.walk(app_path):
+        dirs[:] = [name for name in dirs if name not in _SKIPPED_DIRS and not name.endswith(".egg-info")]
+        for name in names:
+            path = Path(root) / name
+            if (name.endswith(_PYTHON_SUFFIXES) and name != "setup.py") or not path.is_file():
+                continue
+            files.append((path.relative_to(app_path).as_posix(), path))
+    for relative, path in sorted(files):
+        digest.update(relative.encode() + b"\0" + path.read_bytes() + b"\0")
+    return digest.hexdigest()
+
+
+def non_python_fingerprint(release: BenchDirectory) -> dict:
+    apps = {}
+    if release.apps.is_dir():
+        for app_path in sorted(release.apps.iterdir()):
+            if app_path.is_dir():
+                apps[app_path.name] = app_non_python_fingerprint(app_path)
+    return apps
+
+
+def _stored_fingerprint(release: BenchDirectory) -> dict:
+    fingerprint = release.read_metadata().get("non_python_fingerprint")
+    if fingerprint is None:
+        fingerprint = non_python_fingerprint(release)
+        release.update_metadata(non_python_fingerprint=fingerprint)
+    return fingerprint
+
+
+def _read(path: Path) -> Optional[bytes]:
+    return path.read_bytes() if path.is_file() else None
+
+
+def python_only_change(new: BenchDirectory, live: BenchDirectory) -> tuple[bool, str]:
+    """Whether ``new`` differs from ``live`` only in Python source, and if not, why.
+
+    Python dependencies must match (the venv fingerprint recorded at create), as must
+    apps.txt, the built assets and every non-Python file of every app.
+    """
+    new_env = new.read_metadata().get("python_env")
+    live_env = live.read_metadata().get("python_env")
+    if not new_env or new_env != live_env or None in new_env.get("apps", {}).values():
+        return False, "Python dependencies changed or unknown"
+
+    if _read(new.sites / "apps.txt") != _read(live.sites / "apps.txt"):
+        return False, "apps.txt changed"
+
+    assets_json = Path("assets") / "assets.json"
+    new_assets = _read(new.sites / assets_json)
+    if new_assets is None or new_assets != _read(live.sites / assets_json):
+        return False, "built assets changed"
+
+    new_files, live_files = _stored_fingerprint(new), _stored_fingerprint(live)
+    changed = sorted(name for name in set(new_files) | set(live_files) if new_files.get(name) != live_files.get(name))
+    if changed:
+        return False, f"non-Python files changed in {', '.join(changed)}"
+
+    return True, "only Python code changed"
@@ -0,0 +1,19 @@
+import typer
+from typer_examples import install
+
+from fmd.commands.backup.list import list_backups
+from fmd.commands.backup.restore import restore
+
+app = typer.Typer(rich_markup_mode="rich", invoke_without_command=True, no_args_is_help=True)
+install(app)
+
+
+@app.callback()
+def backup_callback(ctx: typer.Context):
+    """Manage backups in the deduplicating backup store: list and restore."""
+    if ctx.invoked_subcommand is None:
+        typer.echo(ctx.get_help())
+
+
+app.command("list", no_args_is_help=True)(list_backups)
+app.command("restore", no_args_is_help=True)(restore)
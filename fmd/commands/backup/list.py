@@ -0,0 +1,71 @@
+from pathlib import Path
+from typing import Optional
+
+import typer
+from typer_examples import example
+
+try:
+    from rich.console import Console
+    from rich.table import Table
+except ImportError:
+    Console = None
+    Table = None
+
+from fmd.backup_store import BackupStore
+from fmd.commands._utils import load_config
+from fmd.db_stream import human_bytes
+from fmd.runner.base import is_ci
+
+
+@example(
+    "List backups by bench name",
+    "{bench_name}",
+    detail="Lists the backups in the bench's backup store, newest first, with the chunks each one added.",
+    bench_name="mybench",
+)
+def list_backups(
+    bench_name: Optional[str] = typer.Argument(None, help="Bench name (required when no config file is provided)."),
+    config_path: Optional[Path] = typer.Option(None, "--config", "-c", help="Path to site config TOML file."),
+):
+    """List the backups in the backup store."""
+    overrides = {"bench_name": bench_name, "site_name": bench_name} if bench_name else None
+    config = load_config(config_path, overrides=overrides)
+    store = BackupStore.for_workspace(config.workspace_root)
+    snapshots = store.snapshots()
+
+    if not snapshots:
+        typer.echo("No backups in the backup store.")
+        return
+
+    total = sum(snapshot["size"] for snapshot in snapshots)
+    on_disk = store.disk_usage()
+    summary = f"{len(snapshots)} backups, {human_bytes(total)} stored in {human_bytes(on_disk)}"
+
+    if not (Console and Table) or is_ci():
+        for snapshot in snapshots:
+            typer.echo(
+                f"{snapshot['name']}  {snapshot['created']}  {snapshot['site']}  {human_bytes(snapshot['size'])}  "
+                f"+{human_bytes(snapshot['added_bytes'])}"
+            )
+        typer.echo(summary)
+        return
+
+    table = Table(title="Backups", show_header=True)
+    table.add_column("Name", style="magenta")
+    table.add_column("Created", style="cyan")
+    table.add_column("Site", style="blue")
+    table.add_column("Files", justify="right")
+    table.add_column("Size", style="yellow", justify="right")
+    table.add_column("Added", style="green", justify="right")
+    for snapshot in snapshots:
+        table.add_row(
+            snapshot["name"],
+            snapshot["created"],
+            snapshot["site"] or "",
+            str(len(snapshot["files"])),
+            human_bytes(snapshot["size"]),
+            human_bytes(snapshot["added_bytes"]),
+        )
+    console = Console()
+    console.print(table)
+    console.print(summary)
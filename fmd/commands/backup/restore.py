@@ -0,0 +1,69 @@
+from pathlib import Path
+from typing import Optional
+
+import typer
+from typer_examples import example
+
+from fmd.backup_store import BackupStore
+from fmd.commands._utils import build_runners, get_printer, load_config
+from fmd.consts import BACKUP_DIR_NAME
+from fmd.services.backup import BackupService
+
+
+@example(
+    "Restore a backup's database",
+    "{name} {bench_name} --db",
+    detail="Writes the backup back to deployment-backup/<name> and restores the site's database from it.",
+    name="release_20250101_120000",
+    bench_name="mybench",
+)
+@example(
+    "Restore a backup's files",
+    "{name} --config {config_path} --to {target}",
+    detail="Writes the backup's configs and database dump to a directory, in their original layout.",
+    name="release_20250101_120000",
+    config_path="./site.toml",
+    target="/tmp/restored",
+)
+def restore(
+    name: str = typer.Argument(..., help="Backup name, as shown by `fmd backup list`."),
+    bench_name: Optional[str] = typer.Argument(None, help="Bench name (required when no config file is provided)."),
+    config_path: Optional[Path] = typer.Option(None, "--config", "-c", help="Path to site config TOML file."),
+    target: Optional[Path] = typer.Option(
+        None, "--to", help="Directory to write the backup to (default: deployment-backup/<name>)."
+    ),
+    db: bool = typer.Option(False, "--db", help="Also restore the site's database from the backup."),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Don't ask before overwriting the database."),
+):
+    """Restore a backup from the backup store."""
+    overrides = {"bench_name": bench_name, "site_name": bench_name} if bench_name else None
+    config = load_config(config_path, overrides=overrides)
+    store = BackupStore.for_workspace(config.workspace_root)
+    target = target or config.workspace_root / BACKUP_DIR_NAME / name
+    if target.exists() and any(target.iterdir()):
+        typer.echo(f"Error: {target} already exists and is not empty.")
+        raise typer.Exit(1)
+
+    try:
+        files = store.restore(name, target)
+    except FileNotFoundError as e:
+        typer.echo(f"Error: {e}")
+        raise typer.Exit(1)
+    typer.echo(f"Restored {len(files)} files to {target}")
+
+    if not db:
+        return
+
+    db_backup = BackupService.find_db_backup(target, config.site_name)
+    if db_backup is None:
+        typer.echo(f"Error: backup {name} has no database dump for {config.site_name}.")
+        raise typer.Exit(1)
+    if not yes and not typer.confirm(f"Overwrite the database of {config.site_name} with {db_backup.name}?"):
+        raise typer.Exit(1)
+
+    printer = get_printer()
+    image_runner, exec_runner, host_runner = build_runners(config)
+    printer.start("Working")
+    service = BackupService(exec_runner, host_runner, config, printer)
+    service.bench_restore(config.site_name, config.workspace_root, db_backup)
+    printer.stop()
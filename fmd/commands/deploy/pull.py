@@ -243,6 +243,12 @@ def pull(
     migrate: Optional[bool] = typer.Option(
         None, "--migrate/--no-migrate", help="Run bench migrate on switch.", rich_help_panel="Switch Options"
     ),
+    force_migrate: bool = typer.Option(
+        False,
+        "--force-migrate",
+        help="Run migrate even if no patches, doctypes, fixtures or migrate hooks changed.",
+        rich_help_panel="Switch Options",
+    ),
     migrate_timeout: Optional[int] = typer.Option(
         None,
         "--migrate-timeout",
@@ -358,6 +364,8 @@ def pull(
     switch: dict = {}
     if migrate is not None:
         switch["migrate"] = migrate
+    if force_migrate:
+        switch["force_migrate"] = True
     if migrate_timeout is not None:
         switch["migrate_timeout"] = migrate_timeout
     if maintenance_mode is not None:
@@ -125,7 +125,10 @@ def create(
 
     printer.start("Creating release")
     manager = ReleaseManager(config, release_image_runner, exec_runner, host_runner, printer)
-    release_name = manager.create(build_dir=build_dir)
+    try:
+        release_name = manager.create(build_dir=build_dir)
+    finally:
+        release_image_runner.cleanup_image()
     printer.stop()
     release_path = (build_dir.resolve() / release_name) if build_dir else release_name
     typer.echo(f"Release created: {release_path}")
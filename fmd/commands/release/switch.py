@@ -34,6 +34,9 @@ def switch(
     release_name: str = typer.Argument(..., help="Release directory name to switch to."),
     config_path: Optional[Path] = typer.Option(None, "--config", "-c", help="Path to site config TOML file."),
     migrate: Optional[bool] = typer.Option(None, "--migrate/--no-migrate", help="Run bench migrate after switch."),
+    force_migrate: bool = typer.Option(
+        False, "--force-migrate", help="Run migrate even if no patches, doctypes, fixtures or migrate hooks changed."
+    ),
     migrate_timeout: Optional[int] = typer.Option(
         None, "--migrate-timeout", help="Migrate timeout in seconds.", show_default=False
     ),
@@ -65,6 +68,8 @@ def switch(
     deploy: dict = {}
     if migrate is not None:
         deploy["migrate"] = migrate
+    if force_migrate:
+        deploy["force_migrate"] = True
     if migrate_timeout is not None:
         deploy["migrate_timeout"] = migrate_timeout
     if maintenance_mode is not None:
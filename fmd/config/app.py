@@ -25,6 +25,7 @@ class AppConfig(BaseModel):
     remove_remote: bool = Field(False)
     symlink: bool = Field(False)
     remote_name: str = Field("upstream")
+    isolated_python_install: bool = Field(False)
     before_bench_build: Optional[str] = Field(None)
     after_bench_build: Optional[str] = Field(None)
     host_before_bench_build: Optional[str] = Field(None)
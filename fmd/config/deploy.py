@@ -9,6 +9,9 @@ class DeployConfig(BaseModel):
     migrate: bool = Field(True, description="Run bench migrate.")
     migrate_timeout: int = Field(300, description="Migrate timeout in seconds.")
     migrate_command: Optional[str] = Field(None, description="Custom migrate command override.")
+    force_migrate: bool = Field(
+        False, description="Run migrate even when the release's migration fingerprint matches the live release."
+    )
     maintenance_mode: bool = Field(True, description="Enable maintenance mode during restart/migrate/install.")
     maintenance_mode_phases: List[str] = Field(
         default_factory=lambda: ["migrate"],
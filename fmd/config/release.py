@@ -15,11 +15,63 @@ class ReleaseConfig(BaseModel):
         None,
         description="Docker platform for multi-arch images (e.g., 'linux/amd64', 'linux/arm64'). Auto-detected if not set.",
     )
+    image_session: bool = Field(
+        True,
+        description="Image mode: run all build commands in one long-lived container via docker exec instead of a fresh container per command.",
+    )
+    batch_python_install: bool = Field(
+        True,
+        description="Install all apps with one `uv pip install -e a -e b ...` resolution; python-install hooks run as grouped phases around it.",
+    )
+    reuse_venv: bool = Field(
+        True,
+        description="Clone the live release's venv when the Python version and every app's dependency spec are unchanged; only changed apps are reinstalled.",
+    )
+    node_modules_cache: bool = Field(
+        True,
+        description="Reuse node_modules across releases, keyed by each app's lockfile, package.json and the Node version. Apps with a cache hit skip yarn.",
+    )
+    node_modules_cache_max_age: int = Field(14, description="Days an unused node_modules cache entry is kept.")
+    asset_cache: bool = Field(
+        True,
+        description="Restore built assets of unchanged apps (same commit, lockfile, Node version and frappe commit) and pass only changed apps to `bench build --apps`.",
+    )
+    asset_cache_max_age: int = Field(14, description="Days an unused asset cache entry is kept.")
+    build_dev_assets: bool = Field(
+        False,
+        description="Run a non-production `bench build --force` before the production build.",
+    )
+    pipeline_jobs: int = Field(
+        4,
+        description="Concurrency budget of the release create pipeline. Independent stages (cloning, fnm install, venv, node packages) run in parallel within it; 1 runs them one at a time.",
+    )
+    clone_jobs: int = Field(4, description="Number of app repos cloned concurrently during release creation.")
+    git_mirror_cache: bool = Field(
+        True,
+        description="Fetch apps into a shared bare-mirror cache and clone releases from it locally. Mirrors keep only the tips of shallow_clone apps and full history of the others.",
+    )
+    git_mirror_dir: Optional[str] = Field(
+        None,
+        description="Directory for the bare-mirror cache. Defaults to <workspace_root>/.cache/git-mirrors; set a host-level path to share across benches.",
+    )
+    git_mirror_max_size: int = Field(
+        10240, description="Size cap of the mirror cache in MB. Least recently used mirrors are evicted."
+    )
+    git_mirror_gc_interval: int = Field(24, description="Hours between git gc runs on each mirror.")
     releases_retain_limit: int = Field(7, description="Number of releases to retain during cleanup.")
     symlink_subdir_apps: bool = Field(
         False,
         description="Symlink monorepo subdirectory apps instead of copying.",
     )
+    smoke_boot: bool = Field(
+        True,
+        description="Boot the new release in a throwaway container at the end of create (imports, one gunicorn worker, ping); releases that fail are marked unswitchable.",
+    )
+    smoke_boot_timeout: int = Field(120, description="Seconds the smoke-booted gunicorn has to answer.")
+    smoke_boot_port: int = Field(8011, description="Port of the smoke-booted gunicorn inside the frappe service's network.")
+    smoke_boot_redis_db: int = Field(
+        15, description="Redis database the smoke boot uses instead of the site's, so it can't touch live cache keys."
+    )
     python_version: Optional[str] = Field(None, description="Python version to bake into the release via uv.")
     node_version: Optional[str] = Field(None, description="Node.js version to bake into the release via fnm.")
 
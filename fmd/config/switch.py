@@ -1,4 +1,4 @@
-from typing import Any, List, Optional
+from typing import Any, List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -9,17 +9,145 @@ class SwitchConfig(BaseModel):
     migrate: bool = Field(True, description="Run bench migrate.")
     migrate_timeout: int = Field(300, description="Migrate timeout in seconds.")
     migrate_command: Optional[str] = Field(None, description="Custom migrate command override.")
+    force_migrate: bool = Field(
+        False,
+        description="Run migrate even when the release's migration fingerprint matches the one the live release was migrated to.",
+    )
+    migrate_window: bool = Field(
+        False,
+        description="While migrate runs, pause the scheduler and suspend background workers (after their "
+        "running jobs finish), so migrate has the database to itself.",
+    )
+    migrate_phase_timings: bool = Field(
+        True,
+        description="In the migrate window, run migrate through fmd's timed wrapper for a per-phase breakdown "
+        "(not with migrate_command).",
+    )
     maintenance_mode: bool = Field(True, description="Enable maintenance mode during restart/migrate/install.")
     maintenance_mode_phases: List[str] = Field(
         default_factory=lambda: ["migrate"],
         description="Phases in which maintenance mode is active: 'drain' and/or 'migrate'.",
     )
     backups: bool = Field(True, description="Take DB backup before switch.")
+    backup_method: Literal["bench", "stream", "parallel"] = Field(
+        "bench",
+        description="'bench' runs bench backup; 'stream' pipes mariadb-dump through a multi-threaded compressor "
+        "straight to the backup file; 'parallel' dumps tables concurrently into one file per table.",
+    )
+    backup_jobs: int = Field(4, description="Connections dumping tables at once for 'parallel' backups.")
+    restore_jobs: int = Field(4, description="Connections loading tables at once when restoring a parallel backup.")
+    backup_incremental: bool = Field(
+        False,
+        description="Parallel backups only dump tables whose checksum changed since the previous backup and "
+        "reference the rest from it.",
+    )
+    backup_full_every: int = Field(
+        7, description="Take a full parallel backup after this many incremental ones in a chain."
+    )
+    backup_store: bool = Field(
+        False,
+        description="Move each backup into the workspace's content-addressed backup store, where successive "
+        "backups share unchanged chunks.",
+    )
+    backup_store_retain: int = Field(10, description="Backups kept in the backup store; 0 keeps all.")
+    backup_compression: Literal["gzip", "zstd"] = Field(
+        "gzip", description="Compression of 'stream' and 'parallel' backups: 'gzip' or 'zstd'."
+    )
+    backup_compression_level: Optional[int] = Field(
+        None, description="Compression level; empty = 6 for gzip, 3 for zstd."
+    )
+    backup_compression_threads: int = Field(0, description="Compression threads for 'stream' backups; 0 = all cores.")
     rollback: bool = Field(False, description="Roll back to previous release on failure.")
     search_replace: bool = Field(True, description="Run search-and-replace in DB after restore.")
     sync_workers: bool = Field(False, description="Sync to remote workers after deploy.")
     install_apps: bool = Field(True, description="Install apps during switch/deploy.")
+    post_switch_in_process: bool = Field(
+        True,
+        description="Clear caches, list and install apps in one frappe process instead of one bench command each.",
+    )
     use_fc_db: bool = Field(False, description="Download and restore latest Frappe Cloud backup at switch time.")
+    fc_db_stream: bool = Field(
+        False,
+        description="Stream the Frappe Cloud backup from its URL into the restore instead of downloading it first.",
+    )
+    restore_read_ahead_mb: int = Field(
+        0, description="MiB of the dump read and decompressed ahead of the database restore; 0 = no read-ahead."
+    )
+
+    blue_green: bool = Field(
+        False,
+        description="Serve from a pre-warmed gunicorn for the new release while services restart (no migrate).",
+    )
+    blue_green_port: int = Field(8001, description="Port of the green gunicorn inside the frappe container.")
+    blue_green_workers: int = Field(2, description="Gunicorn workers for the green instance.")
+    blue_green_health_timeout: int = Field(60, description="Seconds to wait for a gunicorn to answer ping.")
+    blue_green_probe_url: str = Field(
+        "http://nginx/api/method/ping", description="URL probed through nginx to measure unavailability."
+    )
+    blue_green_probe_interval: float = Field(0.1, description="Seconds between unavailability probes.")
+
+    hot_reload: bool = Field(
+        False,
+        description="When only Python code changed, upgrade gunicorn in place (USR2 re-exec, then WINCH/QUIT "
+        "of the old master) and restart workers one queue at a time instead of a full restart.",
+    )
+    hot_reload_timeout: int = Field(
+        120, description="Seconds for the new gunicorn master to start and answer ping on hot reload."
+    )
+    hot_reload_worker_order: List[str] = Field(
+        default_factory=lambda: ["short", "default", "long"],
+        description="Order in which worker services (matched by queue name) are restarted on hot reload.",
+    )
+
+    traffic_wait: bool = Field(
+        False, description="Wait for a quiet moment in the live request rate before swapping and restarting."
+    )
+    traffic_wait_max: int = Field(300, description="Longest wait for a quiet moment, in seconds.")
+    traffic_wait_threshold: float = Field(1.0, description="Requests/second at or below which the switch proceeds.")
+    traffic_wait_observe: int = Field(
+        60, description="Seconds of observation after which a return to the lowest rate seen also counts."
+    )
+    traffic_wait_interval: float = Field(5.0, description="Seconds between request rate samples.")
+    traffic_wait_window: int = Field(3, description="Samples averaged into the request rate.")
+    traffic_wait_logs: List[str] = Field(
+        default_factory=list,
+        description="Access logs to count requests in. Empty = nginx's access log and *access*.log in the bench logs.",
+    )
+
+    warmup: bool = Field(False, description="Warm caches and gunicorn workers at the end of switch.")
+    warmup_urls: List[str] = Field(
+        default_factory=lambda: ["/api/method/ping", "/login", "/"],
+        description="Paths (or absolute URLs) requested to warm the gunicorn workers.",
+    )
+    warmup_base_url: str = Field("http://127.0.0.1", description="Base URL of gunicorn inside the frappe container.")
+    warmup_doctypes: List[str] = Field(default_factory=list, description="DocTypes whose meta is always warmed.")
+    warmup_top_doctypes: int = Field(20, description="Also warm meta of the N most edited doctypes of the last week.")
+    warmup_requests_per_url: int = Field(
+        0, description="Warm-up requests per URL; 0 = twice the site's gunicorn_workers (default 4 workers)."
+    )
+    warmup_concurrency: int = Field(4, description="Warm-up requests in flight at once.")
+
+    latency_gate: bool = Field(
+        False, description="Roll back when latency or error rate after the switch regresses past the limits."
+    )
+    latency_gate_urls: List[str] = Field(
+        default_factory=lambda: ["/api/method/ping", "/login"],
+        description="Paths (or absolute URLs) replayed against the old and the new release.",
+    )
+    latency_gate_base_url: str = Field(
+        "http://127.0.0.1", description="Base URL of gunicorn inside the frappe container."
+    )
+    latency_gate_requests: int = Field(20, description="Measured requests per URL.")
+    latency_gate_discard: int = Field(2, description="Unmeasured rounds per URL before measuring.")
+    latency_gate_concurrency: int = Field(1, description="Replayed requests in flight at once.")
+    latency_gate_max_p50_ratio: float = Field(1.5, description="Largest allowed p50 latency growth (new/old).")
+    latency_gate_max_p95_ratio: float = Field(2.0, description="Largest allowed p95 latency growth (new/old).")
+    latency_gate_min_delta_ms: float = Field(
+        50.0, description="Latency growth below this many ms never counts as a regression."
+    )
+    latency_gate_max_error_rate_increase: float = Field(
+        0.05, description="Largest allowed error rate increase (0.05 = 5 percentage points)."
+    )
 
     drain_workers: bool = Field(False, description="Drain workers before restart.")
     drain_workers_timeout: int = Field(300, description="Seconds to wait for workers to drain.")
@@ -28,6 +156,17 @@ class SwitchConfig(BaseModel):
     skip_stale_timeout: int = Field(15, description="Seconds before a worker is considered stale.")
     worker_kill_timeout: int = Field(15, description="Seconds before force-killing workers.")
     worker_kill_poll: float = Field(3.0, description="Poll interval in seconds while waiting to kill workers.")
+    queue_drain: bool = Field(
+        False,
+        description="Drain workers through Redis: suspend RQ workers, wait until none is busy, then restart. "
+        "Replaces drain_workers; the wait uses drain_workers_timeout.",
+    )
+    queue_drain_early: bool = Field(
+        False,
+        description="With queue_drain, suspend workers on deploy while the release builds so they are idle by "
+        "the switch. Background jobs don't start for the length of the build.",
+    )
+    queue_drain_poll: float = Field(0.5, description="Seconds between Redis checks for busy workers.")
 
     common_site_config: Optional[dict[str, Any]] = Field(
         None, description="Keys to merge into common_site_config.json."
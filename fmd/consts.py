@@ -5,6 +5,8 @@ from fmd.helpers import gen_name_with_timestamp
 RELEASE_DIR_NAME = "release"
 DATA_DIR_NAME = "deployment-data"
 BACKUP_DIR_NAME = "deployment-backup"
+BACKUP_STORE_DIR_NAME = "deployment-backup-store"
+RUNTIME_STORE_DIR_NAME = ".runtimes"
 
 RELEASE_SUFFIX = gen_name_with_timestamp(RELEASE_DIR_NAME)
 LOG_FILE_NAME = Path("./frappe-deployer-run")
@@ -0,0 +1,308 @@
+import gzip
+import os
+import queue
+import subprocess
+import threading
+import time
+import urllib.parse
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Bytes read from the dump process at a time.
+READ_SIZE = 1 << 20
+# Uncompressed bytes per gzip member; large enough that the per-member dictionary reset costs little ratio.
+GZIP_BLOCK_SIZE = 4 << 20
+
+
+def compression_threads(threads: int) -> int:
+    return threads if threads > 0 else os.cpu_count() or 1
+
+
+class ParallelGzipWriter:
+    """Gzip writer that compresses fixed-size blocks on a thread pool.
+
+    Each block becomes its own gzip member and members are written in order, so the
+    output is a standard (multi-member) .gz file that gzip, zcat and Python's gzip read
+    as one stream. zlib releases the GIL, so the blocks compress on all threads at once.
+    At most two blocks per thread are held in memory.
+    """
+
+    def __init__(self, fileobj: BinaryIO, level: int = 6, threads: int = 0, block_size: int = GZIP_BLOCK_SIZE):
+        self.fileobj = fileobj
+        self.level = level
+        self.block_size = block_size
+        self.threads = compression_threads(threads)
+        self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="gzip")
+        self._pending: deque = deque()
+        self._buffer = bytearray()
+
+    def _compress(self, block: bytes) -> bytes:
+        return gzip.compress(block, compresslevel=self.level, mtime=0)
+
+    def _submit(self, block: bytes) -> None:
+        self._pending.append(self._executor.submit(self._compress, block))
+        while len(self._pending) >= 2 * self.threads:
+            self.fileobj.write(self._pending.popleft().result())
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        while len(self._buffer) >= self.block_size:
+            self._submit(bytes(self._buffer[: self.block_size]))
+            del self._buffer[: self.block_size]
+        return len(data)
+
+    def close(self) -> None:
+        try:
+            if self._buffer:
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            while self._pending:
+                self.fileobj.write(self._pending.popleft().result())
+        finally:
+            self._executor.shutdown(cancel_futures=True)
+
+    def __enter__(self) -> "ParallelGzipWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def compressed_writer(fileobj: BinaryIO, compression: str, level: int, threads: int):
+    """Writer compressing into ``fileobj`` with ``gzip`` or ``zstd`` on ``threads`` threads (0 = all cores)."""
+    if compression == "gzip":
+        return ParallelGzipWriter(fileobj, level=level, threads=threads)
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd compression needs the zstandard package: pip install zstandard")
+        compressor = zstandard.ZstdCompressor(level=level, threads=compression_threads(threads))
+        return compressor.stream_writer(fileobj, closefd=False)
+    raise ValueError(f"Unknown compression '{compression}', expected 'gzip' or 'zstd'")
+
+
+def compressed_suffix(compression: str) -> str:
+    return {"gzip": ".gz", "zstd": ".zst"}[compression]
+
+
+class ThroughputMeter:
+    """Counts bytes and reports the running rate to ``on_progress`` at most every ``interval`` seconds."""
+
+    def __init__(
+        self,
+        on_progress: Optional[Callable[[int, float], None]] = None,
+        interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.on_progress = on_progress
+        self.interval = interval
+        self.clock = clock
+        self.start = clock()
+        self.bytes = 0
+        self._last_report = self.start
+
+    def add(self, count: int) -> None:
+        self.bytes += count
+        now = self.clock()
+        if self.on_progress is not None and now - self._last_report >= self.interval:
+            self._last_report = now
+            self.on_progress(self.bytes, self.rate(now))
+
+    def rate(self, now: Optional[float] = None) -> float:
+        elapsed = (now if now is not None else self.clock()) - self.start
+        return self.bytes / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> dict:
+        now = self.clock()
+        return {
+            "bytes": self.bytes,
+            "seconds": round(now - self.start, 3),
+            "bytes_per_second": round(self.rate(now)),
+        }
+
+
+def human_bytes(count: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(count) < 1024:
+            return f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} TiB"
+
+
+def _drain(stream: BinaryIO, into: deque) -> None:
+    for line in stream:
+        into.append(line)
+
+
+def dump_to_file(
+    command: list[str],
+    path: Path,
+    compression: str = "gzip",
+    level: int = 6,
+    threads: int = 0,
+    on_progress: Optional[Callable[[int, float], None]] = None,
+    env: Optional[dict[str, str]] = None,
+) -> dict:
+    """Run ``command`` and stream its stdout through a parallel compressor into ``path``.
+
+    The dump is written to disk once, already compressed. On failure the partial file is
+    removed and RuntimeError carries the command's stderr. Returns the uncompressed and
+    compressed sizes, the duration and the uncompressed bytes/second.
+    """
+    meter = ThroughputMeter(on_progress)
+    stderr: deque = deque(maxlen=50)
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+    stderr_thread = threading.Thread(target=_drain, args=(process.stderr, stderr), daemon=True)
+    stderr_thread.start()
+
+    try:
+        with open(path, "wb") as f:
+            writer = compressed_writer(f, compression, level, threads)
+            try:
+                while chunk := process.stdout.read(READ_SIZE):
+                    writer.write(chunk)
+                    meter.add(len(chunk))
+            finally:
+                writer.close()
+        returncode = process.wait()
+        stderr_thread.join()
+        if returncode != 0:
+            message = b"".join(stderr).decode(errors="replace").strip()
+            raise RuntimeError(f"{command[0]} exited with {returncode}: {message[-2000:]}")
+    except BaseException:
+        process.kill()
+        process.wait()
+        path.unlink(missing_ok=True)
+        raise
+
+    return {**meter.summary(), "compressed_bytes": path.stat().st_size, "compression": compression}
+
+
+class ReadAhead:
+    """Reads ``reader`` on a background thread into a queue bounded to about ``max_bytes``.
+
+    Downloading and decompressing then overlap with the consumer's writes instead of
+    alternating with them. Errors on the reading side are raised from ``read``.
+    """
+
+    _EOF = object()
+
+    def __init__(self, reader: BinaryIO, max_bytes: int, chunk_size: int = READ_SIZE):
+        self.reader = reader
+        self.chunk_size = chunk_size
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_bytes // chunk_size))
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._fill, daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fill(self) -> None:
+        try:
+            while chunk := self.reader.read(self.chunk_size):
+                if not self._put(chunk):
+                    return
+            self._put(self._EOF)
+        except BaseException as e:
+            self._put(e)
+
+    def read(self, size: int = -1) -> bytes:
+        item = self._queue.get()
+        if item is self._EOF:
+            self._queue.put(item)
+            return b""
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    def close(self) -> None:
+        self._stopped.set()
+
+
+def is_url(source) -> bool:
+    return isinstance(source, str) and source.startswith(("http://", "https://"))
+
+
+def source_name(source) -> str:
+    """File name of a path or URL, without the URL's query string."""
+    if is_url(source):
+        return urllib.parse.urlsplit(source).path.rsplit("/", 1)[-1]
+    return Path(source).name
+
+
+def open_decompressed(source) -> BinaryIO:
+    """Open a local path or http(s) URL, decompressing ``.gz`` and ``.zst`` on the fly."""
+    raw = urllib.request.urlopen(source) if is_url(source) else open(source, "rb")
+    name = source_name(source)
+    if name.endswith(".gz"):
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+    if name.endswith(".zst"):
+        if zstandard is None:
+            raw.close()
+            raise RuntimeError("Reading .zst backups needs the zstandard package: pip install zstandard")
+        return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    return raw
+
+
+def restore_from_source(
+    source,
+    command: list[str],
+    read_ahead_bytes: int = 0,
+    on_progress: Optional[Callable[[int, float], None]] = None,
+    env: Optional[dict[str, str]] = None,
+) -> dict:
+    """Stream ``source`` (path or URL, optionally compressed) into ``command``'s stdin.
+
+    Nothing is written to disk. With ``read_ahead_bytes``, reading and decompressing run
+    on their own thread, up to that many bytes ahead of the command. Raises RuntimeError
+    with the command's stderr when it fails. Returns the uncompressed bytes, duration and
+    bytes/second.
+    """
+    meter = ThroughputMeter(on_progress)
+    stderr: deque = deque(maxlen=50)
+    reader = open_decompressed(source)
+    buffered = ReadAhead(reader, read_ahead_bytes) if read_ahead_bytes > 0 else None
+    process = subprocess.Popen(
+        command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=env
+    )
+    stderr_thread = threading.Thread(target=_drain, args=(process.stderr, stderr), daemon=True)
+    stderr_thread.start()
+
+    try:
+        try:
+            while chunk := (buffered or reader).read(READ_SIZE):
+                process.stdin.write(chunk)
+                meter.add(len(chunk))
+            process.stdin.close()
+        except BrokenPipeError:
+            # The command exited early; its exit code and stderr say why.
+            pass
+        returncode = process.wait()
+        stderr_thread.join()
+        if returncode != 0:
+            message = b"".join(stderr).decode(errors="replace").strip()
+            raise RuntimeError(f"{command[0]} exited with {returncode}: {message[-2000:]}")
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    finally:
+        if buffered is not None:
+            buffered.close()
+        reader.close()
+
+    return {**meter.summary(), "source": source_name(source)}
@@ -17,3 +17,10 @@ class SiteNotConfigured(Exception):
         self.path = path
         self.message = f"The site at '{self.path}' is not configured. Run 'fmd release configure' first."
         super().__init__(self.message)
+
+
+class LatencyRegression(Exception):
+    def __init__(self, reasons: list[str]):
+        self.reasons = reasons
+        self.message = "Latency gate failed: " + "; ".join(reasons)
+        super().__init__(self.message)
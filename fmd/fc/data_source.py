@@ -31,12 +31,17 @@ class FCDataSource:
                 return dep.get("version")
         return None
 
-    def download_db_backup(self, dest_dir: Path) -> Path:
-        dest_dir.mkdir(parents=True, exist_ok=True)
+    def db_backup_url(self) -> str:
+        """Download URL of the site's latest database backup."""
         urls = self._client.get_latest_backup_download_urls(self._config.site_name, files=["database"])
         db_url = urls.get("database")
         if not db_url:
             raise RuntimeError(f"No database backup URL found for site {self._config.site_name}")
+        return db_url
+
+    def download_db_backup(self, dest_dir: Path) -> Path:
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        db_url = self.db_backup_url()
 
         if _requests is None:
             raise RuntimeError("requests library is required for downloading FC backups")
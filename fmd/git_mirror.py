@@ -0,0 +1,197 @@
+import json
+import re
+import shutil
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    import git
+except Exception:
+
+    class _StubRepo:
+        @staticmethod
+        def init(*args, **kwargs):
+            raise RuntimeError("git is required for mirror operations")
+
+        @staticmethod
+        def clone_from(*args, **kwargs):
+            raise RuntimeError("git is required for mirror operations")
+
+    class _GitStub:
+        Repo = _StubRepo
+
+    git = _GitStub()
+
+from fmd.config.app import AppConfig
+from fmd.helpers import file_lock, get_dir_size_bytes
+from fmd.logger import get_logger
+
+REFS_INDEX = "fmd-refs.json"
+LAST_GC_STAMP = "fmd-last-gc"
+LAST_USED_STAMP = "fmd-last-used"
+STALE_REF_SECONDS = 30 * 24 * 3600
+
+
+class GitMirrorCache:
+    """Bare mirrors of app repos, fetched incrementally and cloned locally into releases.
+
+    Only the refs a deploy asks for are fetched (kept under refs/fmd/*), so a mirror
+    holds the branches in use rather than every branch upstream; apps with
+    ``shallow_clone`` are fetched at depth 1, so only their tips are kept.
+    Local clones hardlink the mirror's objects (shallow mirrors are fetched from
+    instead), which keeps the release independent of later mirror gc or eviction.
+    """
+
+    def __init__(self, root: Path, max_size_mb: int = 10240, gc_interval_hours: int = 24) -> None:
+        self.root = root
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.gc_interval_seconds = gc_interval_hours * 3600
+
+    @classmethod
+    def from_config(cls, config) -> Optional["GitMirrorCache"]:
+        release = config.release
+        if not release.git_mirror_cache:
+            return None
+        root = (
+            Path(release.git_mirror_dir).expanduser()
+            if release.git_mirror_dir
+            else config.workspace_root / ".cache" / "git-mirrors"
+        )
+        return cls(root, release.git_mirror_max_size, release.git_mirror_gc_interval)
+
+    def mirror_path(self, app: AppConfig) -> Path:
+        slug = re.sub(r"[^A-Za-z0-9._-]", "_", app.repo.lower().removesuffix(".git"))
+        return self.root / f"{slug}.git"
+
+    @staticmethod
+    def _ref_name(ref: Optional[str]) -> str:
+        if not ref:
+            return "refs/fmd/HEAD"
+        return "refs/fmd/" + re.sub(r"[^A-Za-z0-9._/-]", "_", ref).strip("/")
+
+    def _lock_path(self, mirror: Path) -> Path:
+        return mirror.with_suffix(".lock")
+
+    def _load_refs_index(self, mirror: Path) -> dict[str, float]:
+        try:
+            return json.loads((mirror / REFS_INDEX).read_text())
+        except Exception:
+            return {}
+
+    def _save_refs_index(self, mirror: Path, index: dict[str, float]) -> None:
+        (mirror / REFS_INDEX).write_text(json.dumps(index, indent=2))
+
+    def fetch(self, app: AppConfig, stats: Optional[dict] = None) -> tuple[str, str]:
+        """Update the mirror for ``app`` and return ``(sha, kind)`` where kind is 'branch', 'tag' or 'commit'."""
+        mirror = self.mirror_path(app)
+        ref_name = self._ref_name(app.ref)
+
+        with file_lock(self._lock_path(mirror)):
+            if not (mirror / "HEAD").exists():
+                if mirror.exists():
+                    shutil.rmtree(mirror)
+                git.Repo.init(mirror, bare=True)
+                get_logger().debug(f"MIRROR: created {mirror}")
+
+            repo = git.Repo(mirror)
+            objects_before = get_dir_size_bytes(mirror / "objects")
+            start = time.time()
+            depth = ["--depth", "1"] if app.shallow_clone else []
+            repo.git.fetch("--quiet", "--no-tags", *depth, app.repo_url, app.ref or "HEAD")
+            if stats is not None:
+                stats["bytes"] = max(get_dir_size_bytes(mirror / "objects") - objects_before, 0)
+                stats["source"] = "mirror"
+            sha = repo.git.rev_parse("FETCH_HEAD^{commit}")
+            fetch_head = (mirror / "FETCH_HEAD").read_text()
+            kind = "branch" if "\tbranch '" in fetch_head else "tag" if "\ttag '" in fetch_head else "commit"
+            repo.git.update_ref(ref_name, sha)
+            get_logger().debug(f"MIRROR: fetched {app.repo}@{app.ref or 'HEAD'} -> {sha} in {time.time() - start:.2f}s")
+
+            index = self._load_refs_index(mirror)
+            index[ref_name] = time.time()
+            self._save_refs_index(mirror, index)
+            (mirror / LAST_USED_STAMP).touch()
+
+            self._maybe_gc(repo, mirror, index)
+
+        return sha, kind
+
+    def clone(self, app: AppConfig, dest: Path, stats: Optional[dict] = None):
+        """Clone ``app`` at its ref into ``dest`` from the local mirror."""
+        sha, kind = self.fetch(app, stats)
+        mirror = self.mirror_path(app)
+
+        with file_lock(self._lock_path(mirror)):
+            cloned_repo = git.Repo.clone_from(str(mirror), dest, no_checkout=True)
+            if (mirror / "shallow").exists():
+                # git doesn't hardlink from a shallow repo and only clones its branches.
+                cloned_repo.git.fetch("--quiet", "--no-tags", "--depth", "1", "origin", self._ref_name(app.ref))
+
+        remote = cloned_repo.remote("origin")
+        remote.rename(app.remote_name)
+        cloned_repo.git.remote("set-url", app.remote_name, app.repo_url)
+
+        if app.ref and kind == "branch":
+            cloned_repo.git.update_ref(f"refs/remotes/{app.remote_name}/{app.ref}", sha)
+            cloned_repo.git.checkout("-B", app.ref, sha)
+            cloned_repo.git.branch("--set-upstream-to", f"{app.remote_name}/{app.ref}", app.ref)
+        else:
+            if app.ref and kind == "tag":
+                cloned_repo.git.tag(app.ref, sha)
+            cloned_repo.git.checkout(sha)
+
+        self.evict()
+        return cloned_repo
+
+    def _maybe_gc(self, repo, mirror: Path, index: dict[str, float]) -> None:
+        stamp = mirror / LAST_GC_STAMP
+        if stamp.exists() and time.time() - stamp.stat().st_mtime < self.gc_interval_seconds:
+            return
+
+        now = time.time()
+        stale = [ref for ref, used in index.items() if now - used > STALE_REF_SECONDS]
+        for ref in stale:
+            try:
+                repo.git.update_ref("-d", ref)
+            except Exception:
+                pass
+            index.pop(ref, None)
+        if stale:
+            self._save_refs_index(mirror, index)
+
+        start = time.time()
+        try:
+            repo.git.gc("--quiet", "--prune=now")
+            stamp.touch()
+            get_logger().debug(f"MIRROR: gc {mirror.name} in {time.time() - start:.2f}s (dropped {len(stale)} refs)")
+        except Exception as e:
+            get_logger().warning(f"MIRROR: gc failed for {mirror}: {e}")
+
+    def evict(self) -> None:
+        if not self.root.exists() or self.max_size_bytes <= 0:
+            return
+
+        with file_lock(self.root / ".evict.lock", blocking=False) as acquired:
+            if not acquired:
+                return
+
+            mirrors = [m for m in self.root.iterdir() if m.is_dir() and m.suffix == ".git"]
+            sizes = {m: get_dir_size_bytes(m) for m in mirrors}
+            total = sum(sizes.values())
+            if total <= self.max_size_bytes:
+                return
+
+            def last_used(m: Path) -> float:
+                stamp = m / LAST_USED_STAMP
+                return stamp.stat().st_mtime if stamp.exists() else 0.0
+
+            for mirror in sorted(mirrors, key=last_used):
+                if total <= self.max_size_bytes:
+                    break
+                with file_lock(self._lock_path(mirror), blocking=False) as locked:
+                    if not locked:
+                        continue
+                    shutil.rmtree(mirror, ignore_errors=True)
+                total -= sizes[mirror]
+                get_logger().debug(f"MIRROR: evicted {mirror.name} ({sizes[mirror] / 1024 / 1024:.1f} MB)")
@@ -1,10 +1,13 @@
 import datetime
+import fcntl
 import functools
 import json
 from pathlib import Path
-from typing import Any, Generator
+from typing import Any, Generator, Iterator
 import re
 import os
+import shutil
+import subprocess
 
 try:
     from frappe_manager.display_manager.DisplayManager import DisplayManager
@@ -96,6 +99,70 @@ class CloneProgress(git.remote.RemoteProgress):
                 yield "stdout", line.encode()
 
 
+def get_dir_size_bytes(path: Path) -> int:
+    total = 0
+    for p in path.rglob("*"):
+        try:
+            if p.is_file() and not p.is_symlink():
+                total += p.stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+def clone_tree(src: Path, dest: Path, copy_function=None) -> str:
+    """Copy ``src`` to ``dest`` as cheaply as the filesystem allows.
+
+    Tries a reflink copy first (btrfs/xfs), then falls back to ``shutil.copytree`` with
+    ``copy_function`` (hardlinking by default). Returns 'reflink' or 'hardlink'.
+    """
+    if dest.exists():
+        shutil.rmtree(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+
+    result = subprocess.run(["cp", "-a", "--reflink=always", str(src), str(dest)], capture_output=True, text=True)
+    if result.returncode == 0:
+        return "reflink"
+
+    if dest.exists():
+        shutil.rmtree(dest)
+    shutil.copytree(src, dest, symlinks=True, copy_function=copy_function or hardlink_or_copy)
+    return "hardlink"
+
+
+def hardlink_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def human_readable_size(size: float) -> str:
+    if size < 1024:
+        return f"{int(size)} B"
+    for unit in ("KB", "MB"):
+        size /= 1024
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+    return f"{size / 1024:.2f} GB"
+
+
+@contextmanager
+def file_lock(lock_path: Path, blocking: bool = True) -> Iterator[bool]:
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+") as fh:
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(fh.fileno(), flags)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
 def is_fqdn(name: str) -> bool:
     return bool(re.match(r"^(?!-)[A-Za-z0-9-]{1,63}(?<!-)\.(?!-)[A-Za-z0-9-]{1,63}(?<!-)$", name))
 
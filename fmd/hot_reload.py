@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Graceful in-place reload of a bench's services, run inside the frappe container.
+
+Frappe Manager runs one supervisord per service container and exposes each one's
+control socket in /fm-sockets. gunicorn is upgraded in place: ``USR2`` makes the serving
+master exec a new master, which starts from the (already swapped) bench path and loads
+the new release's code while the old one keeps serving on the shared socket. Once the
+new master runs from the swapped release and its workers are up, ``WINCH`` stops the old
+workers after their in-flight requests and the ping has to be answered by the new
+workers alone; if it isn't, ``HUP`` brings the old workers back and the new master is
+stopped. A ``HUP`` alone isn't enough: gunicorn re-forks workers from a master whose
+cwd is the old release's sites directory and, with ``--preload``, whose imported code
+is the old release's.
+
+The master supervisor started is kept, without workers: if it exited, supervisor would
+start another gunicorn that can't bind the port the new master holds. The new master's
+pid is recorded in ``/tmp/fmd-master-<program>.pid``; the next hot reload upgrades and
+stops it, and a full restart has to stop it first. Then each worker service is restarted
+in turn, one queue at a time; supervisor stops an RQ worker with a warm shutdown, so its
+current job completes first. The scheduler restarts last. Prints one JSON line with the
+timings.
+"""
+
+import argparse
+import json
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+SOCKETS = Path("/fm-sockets")
+# Pid of the gunicorn master a hot reload left serving, per web program.
+MASTER_PID_FILE = "/tmp/fmd-master-{}.pid"
+# Services that don't run Python code from the bench, or are handled separately.
+_SKIPPED_SERVICES = {"frappe", "socketio", "nginx", "schedule"}
+_STATUS = re.compile(r"^(\S+)\s+(\S+)(?:\s+pid (\d+))?")
+
+
+def supervisorctl(service: str, *args: str, timeout=None) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        ["supervisorctl", "-s", f"unix://{SOCKETS / f'{service}.sock'}", *args],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+
+
+def programs(service: str) -> list[tuple[str, str, int]]:
+    result = []
+    for line in supervisorctl(service, "status").stdout.splitlines():
+        match = _STATUS.match(line)
+        if match:
+            result.append((match.group(1), match.group(2), int(match.group(3) or 0)))
+    return result
+
+
+def release_of(pid: int) -> str:
+    """Resolved working directory of a process: the release it was started in."""
+    return os.path.realpath(f"/proc/{pid}/cwd")
+
+
+def ping(url: str, host: str) -> bool:
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers={"Host": host}), timeout=5) as response:
+            return response.status == 200
+    except (urllib.error.URLError, OSError):
+        return False
+
+
+def alive(pid: int) -> bool:
+    try:
+        return "gunicorn" in Path(f"/proc/{pid}/cmdline").read_bytes().decode(errors="replace")
+    except OSError:
+        return False
+
+
+def children(pid: int) -> list[int]:
+    result = []
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            # The command name is in parentheses and may contain spaces; ppid follows the state.
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if int(fields[1]) == pid:
+            result.append(int(stat.parent.name))
+    return result
+
+
+def reexec_child(pid: int) -> int:
+    """The master ``pid`` exec'd on ``USR2``, told apart from its workers by the GUNICORN_PID it was given."""
+    for child in children(pid):
+        try:
+            environ = Path(f"/proc/{child}/environ").read_bytes().split(b"\0")
+        except OSError:
+            continue
+        if f"GUNICORN_PID={pid}".encode() in environ:
+            return child
+    return 0
+
+
+def wait_until(condition, deadline: float, what: str):
+    while not (result := condition()):
+        if time.time() > deadline:
+            raise RuntimeError(f"{what} after the timeout")
+        time.sleep(0.2)
+    return result
+
+
+def upgrade_master(name: str, supervised: int, args, deadline: float) -> int:
+    """Replace the master serving ``name`` with one running the swapped release; returns its pid."""
+    pid_file = Path(MASTER_PID_FILE.format(name.replace(":", "-")))
+    try:
+        old = int(pid_file.read_text())
+    except (OSError, ValueError):
+        old = 0
+    if old == supervised or not alive(old):
+        old = supervised
+
+    release = os.path.realpath(args.bench)
+    os.kill(old, signal.SIGUSR2)
+    new = wait_until(lambda: reexec_child(old), deadline, f"{name}: no new master")
+    try:
+        if not release_of(new).startswith(release + os.sep):
+            raise RuntimeError(f"{name} runs from {release_of(new)}, not the swapped release {release}")
+        wait_until(lambda: children(new) or not alive(new), deadline, f"{name}: new master started no workers")
+        if not alive(new):
+            raise RuntimeError(f"{name}: new master exited, its workers failed to boot")
+    except Exception:
+        os.kill(new, signal.SIGQUIT)
+        raise
+
+    os.kill(old, signal.SIGWINCH)
+    try:
+        wait_until(lambda: ping(args.ping_url, args.site), deadline, f"{args.ping_url} not healthy on the new master")
+    except Exception:
+        os.kill(old, signal.SIGHUP)
+        os.kill(new, signal.SIGQUIT)
+        raise
+    if old != supervised:
+        os.kill(old, signal.SIGQUIT)
+    pid_file.write_text(str(new))
+    return new
+
+
+def reload_web(args) -> dict:
+    web = [(name, pid) for name, state, pid in programs("frappe") if "web" in name and state == "RUNNING" and pid]
+    if not web:
+        raise RuntimeError("no running web program found in the frappe service")
+
+    start = time.time()
+    deadline = start + args.timeout
+    masters = {name: upgrade_master(name, pid, args, deadline) for name, pid in web}
+    return {"programs": list(masters), "masters": masters, "seconds": round(time.time() - start, 3)}
+
+
+def _queue_rank(service: str, order: list[str]) -> int:
+    return next((i for i, queue in enumerate(order) if queue in service), len(order))
+
+
+def restart_services(args) -> dict:
+    services = sorted(
+        (path.stem for path in SOCKETS.glob("*.sock") if path.stem not in _SKIPPED_SERVICES),
+        key=lambda service: (_queue_rank(service, args.worker_order), service),
+    )
+    if (SOCKETS / "schedule.sock").exists():
+        services.append("schedule")
+
+    timings = {}
+    for service in services:
+        start = time.time()
+        result = supervisorctl(service, "restart", "all", timeout=args.worker_timeout)
+        if result.returncode != 0 or "ERROR" in result.stdout:
+            raise RuntimeError(f"restarting {service} failed: {result.stdout.strip()} {result.stderr.strip()}")
+        timings[service] = round(time.time() - start, 3)
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--site", required=True, help="Host header for the health check, i.e. the site name.")
+    parser.add_argument("--bench", default="/workspace/frappe-bench", help="Bench path the release is swapped at.")
+    parser.add_argument("--ping-url", default="http://127.0.0.1:80/api/method/ping")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds for the web restart to finish.")
+    parser.add_argument("--worker-timeout", type=float, default=None, help="Seconds per worker service restart.")
+    parser.add_argument("--worker-order", nargs="*", default=["short", "default", "long"])
+    args = parser.parse_args()
+
+    report = {"ok": False}
+    try:
+        report["web"] = reload_web(args)
+        report["workers"] = restart_services(args)
+        report["ok"] = True
+    except Exception as e:
+        report["error"] = f"{type(e).__name__}: {e}"
+    print(json.dumps(report))
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import math
+from typing import Any
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile; 0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _stats(samples: list[dict]) -> dict:
+    latencies = [sample.get("ms", 0.0) for sample in samples]
+    errors = sum(1 for sample in samples if not sample.get("ok"))
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+    }
+
+
+def summarize(samples: dict[str, list[dict]]) -> dict:
+    """p50/p95 latency and error rate per URL and over all requests, from the probe's ``replay`` output."""
+    summary = _stats([sample for url_samples in samples.values() for sample in url_samples])
+    summary["urls"] = {url: _stats(url_samples) for url, url_samples in samples.items()}
+    return summary
+
+
+def _latency_regressions(label: str, before: dict, after: dict, thresholds: Any) -> list[str]:
+    reasons = []
+    limits = (("p50_ms", thresholds.latency_gate_max_p50_ratio), ("p95_ms", thresholds.latency_gate_max_p95_ratio))
+    for key, max_ratio in limits:
+        old, new = before.get(key, 0.0), after.get(key, 0.0)
+        if new - old < thresholds.latency_gate_min_delta_ms:
+            continue
+        if old <= 0 or new / old > max_ratio:
+            ratio = f"{new / old:.1f}x" if old > 0 else "new"
+            reasons.append(f"{label} {key[:3]} {old:.0f}ms -> {new:.0f}ms ({ratio}, limit {max_ratio}x)")
+    return reasons
+
+
+def compare(before: dict, after: dict, thresholds: Any) -> list[str]:
+    """Reasons the ``after`` summary regressed against ``before``; empty when within the thresholds.
+
+    Latency must grow by more than ``latency_gate_min_delta_ms`` and by more than the
+    ratio limit to count, so fast endpoints don't trip the gate on noise. Each URL is
+    checked on its own as well as overall, since one endpoint slowing down 3x can hide
+    in the aggregate.
+    """
+    reasons = _latency_regressions("overall", before, after, thresholds)
+    for url, url_after in after.get("urls", {}).items():
+        url_before = before.get("urls", {}).get(url)
+        if url_before:
+            reasons += _latency_regressions(url, url_before, url_after, thresholds)
+
+    increase = after.get("error_rate", 0.0) - before.get("error_rate", 0.0)
+    if increase > thresholds.latency_gate_max_error_rate_increase:
+        reasons.append(
+            f"error rate {before.get('error_rate', 0.0):.1%} -> {after.get('error_rate', 0.0):.1%} "
+            f"(limit +{thresholds.latency_gate_max_error_rate_increase:.1%})"
+        )
+    return reasons
@@ -1,5 +1,6 @@
 from fmd.config.config import Config
 from fmd.managers.release import ReleaseManager
+from fmd.tracing import traced
 
 
 class PullManager:
@@ -8,6 +9,7 @@ class PullManager:
         self.release_manager = ReleaseManager(config, release_runner, exec_runner, host_runner, printer)
         self.printer = printer
 
+    @traced("deploy.pull", category="manager")
     def deploy(self) -> None:
         bench_path = self.config.bench_path
 
@@ -15,7 +17,7 @@ class PullManager:
             self.printer.change_head("Site not configured — running configure first")
             self.release_manager.configure()
 
-        release_name = self.release_manager.create()
+        release_name = self.release_manager.create(drain_early=True)
         self.printer.print(f"Release [blue]{release_name}[/blue] created")
 
         self.release_manager.switch(release_name)
@@ -1,19 +1,29 @@
 import json
 import shutil
 import tempfile
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
+from fmd.change_scope import python_only_change
 from fmd.config.config import Config
 from fmd.consts import DATA_DIR_NAME, BACKUP_DIR_NAME, RELEASE_DIR_NAME
-from fmd.exceptions import SiteAlreadyConfigured, SiteNotConfigured
-from fmd.helpers import gen_name_with_timestamp
+from fmd.exceptions import LatencyRegression, SiteAlreadyConfigured, SiteNotConfigured
+from fmd.helpers import gen_name_with_timestamp, get_json, update_json_keys_in_file_path
+from fmd.latency_gate import compare as compare_latency
+from fmd.migrate_fingerprint import changed_since_migrate, migration_fingerprint, record_migrated
+from fmd.pipeline import Pipeline, Stage
 from fmd.release_directory import BenchDirectory
+from fmd.runtime_store import RuntimeStore
 from fmd.services.apps import AppService
 from fmd.services.backup import BackupService
+from fmd.services.blue_green import BLUE_PORT, BlueGreenService, BlueGreenUnavailable
 from fmd.services.bench import BenchService
 from fmd.services.cleanup import CleanupService
+from fmd.services.smoke_boot import SmokeBootService
 from fmd.services.symlinks import SymlinkService
+from fmd.tracing import traced
+from fmd.traffic import LogRateSampler, find_access_logs, wait_for_quiet
 
 
 class ReleaseManager:
@@ -41,9 +51,14 @@ class ReleaseManager:
         self.image_bench_service = BenchService(image_runner, host_runner, config, printer)
         self.cleanup_service = CleanupService(exec_runner, host_runner, config, printer)
         self.symlink_service = SymlinkService(exec_runner, host_runner, config, printer)
+        self.blue_green_service = BlueGreenService(exec_runner, host_runner, config, printer)
+        self.smoke_boot_service = SmokeBootService(image_runner, host_runner, config, printer)
 
         self.bench_cli: str = "bench"
         self.site_installed_apps: dict = {}
+        self._workers_suspended = False
+        # The site's pause_scheduler value before the migrate window set it, while it's set.
+        self._scheduler_paused_from: Optional[tuple] = None
 
     def _get_merged_apps_list(self):
         apps = list(self.config.apps)
@@ -201,6 +216,7 @@ class ReleaseManager:
             if bench_script_path.exists():
                 bench_script_path.unlink()
 
+    @traced("release.configure", category="manager")
     def configure(self) -> None:
         backups = self.config.configure.backups
 
@@ -229,15 +245,19 @@ class ReleaseManager:
 
             has_apps = new_bench.apps.exists() and any(d for d in new_bench.apps.iterdir() if d.is_dir())
             if has_apps:
-                self.image_bench_service.bench_setup_requirements(
-                    new_bench,
-                    self.config.apps,
-                    self.bench_cli,
-                    self.current,
-                    self.bench_path,
-                    self.site_name,
-                    self._host_run,
-                )
+                try:
+                    self.image_bench_service.bench_setup_requirements(
+                        new_bench,
+                        self.config.apps,
+                        self.bench_cli,
+                        self.current,
+                        self.bench_path,
+                        self.site_name,
+                        self._host_run,
+                    )
+                finally:
+                    self._stop_build_session()
+            self._adopt_release_runtimes(new_bench.path)
             self.bench_service.bench_symlink(self.bench_path, new_bench)
             self.bench_service.bench_restart(
                 new_bench,
@@ -247,6 +267,8 @@ class ReleaseManager:
                 self._host_run,
                 **self._restart_kwargs(),
             )
+            if self.config.switch.migrate:
+                self._record_migrated(new_bench)
 
         except Exception:
             if self.config.configure.rollback:
@@ -255,34 +277,17 @@ class ReleaseManager:
 
     def _seed_release_runtimes(self, release_path: Path) -> None:
         current_bench = self.bench_path.resolve() if self.bench_path.is_symlink() else self.bench_path
-        release_uv = release_path / ".uv"
-        release_fnm = release_path / ".fnm"
-
-        src_uv = current_bench / ".uv"
-        src_fnm = current_bench / ".fnm"
-
-        if src_uv.is_dir() and not release_uv.exists():
-            shutil.copytree(src_uv, release_uv, symlinks=True)
-            self._open_permissions(release_uv)
-        elif not release_uv.exists():
-            # Source missing (broken symlink or first release) — create empty dir
-            release_uv.mkdir(parents=True, exist_ok=True)
-
-        if src_fnm.is_dir() and not release_fnm.exists():
-            shutil.copytree(src_fnm, release_fnm, symlinks=True)
-            self._open_permissions(release_fnm)
-        elif not release_fnm.exists():
-            # Source missing (broken symlink or first release) — create empty dir
-            release_fnm.mkdir(parents=True, exist_ok=True)
-
-    @staticmethod
-    def _open_permissions(path: Path) -> None:
-        for p in [path, *path.rglob("*")]:
-            try:
-                if not p.is_symlink():
-                    p.chmod(0o777)
-            except OSError:
-                pass
+        source = current_bench if current_bench.is_dir() and current_bench != release_path.resolve() else None
+
+        store = RuntimeStore.for_release(release_path)
+        linked = store.seed(release_path, source)
+        if linked:
+            self.printer.print(f"Linked runtimes from store: {', '.join(linked)}")
+
+    def _adopt_release_runtimes(self, release_path: Path) -> None:
+        adopted = RuntimeStore.for_release(release_path).adopt(release_path)
+        if adopted:
+            self.printer.print(f"Added runtimes to store: {', '.join(adopted)}")
 
     def _setup_supervisor_config(self, release_path: Path) -> None:
         try:
@@ -370,7 +375,8 @@ class ReleaseManager:
         if renamed and self.new.path.exists() and not self.current.path.exists():
             self.new.path.rename(self.current.path)
 
-    def create(self, build_dir: Optional[Path] = None) -> str:
+    @traced("release.create", category="manager")
+    def create(self, build_dir: Optional[Path] = None, drain_early: bool = False) -> str:
         if not self.config.ship and not self.bench_path.is_symlink():
             raise SiteNotConfigured(str(self.bench_path))
 
@@ -381,49 +387,157 @@ class ReleaseManager:
         base_dir = build_dir.resolve() if build_dir is not None else self.workspace_path
         self.new = BenchDirectory(base_dir / gen_name_with_timestamp(RELEASE_DIR_NAME))
 
-        for dir_path in [self.new.path, self.new.apps, self.new.sites]:
-            dir_path.mkdir(parents=True, exist_ok=True)
-            self.printer.print(f"Created dir [blue]{dir_path.name}[/blue]")
-        (self.new.path / "config" / "pids").mkdir(parents=True, exist_ok=True)
-        (self.new.path / "logs").mkdir(parents=True, exist_ok=True)
-
-        self._seed_release_runtimes(self.new.path)
-
-        self.config.to_toml(self.new.path / ".fmd.toml")
-
-        self.app_service.clone_apps(self.data, self.new, apps, self.site_name, self._is_app_installed)
-
-        self._create_temp_common_site_config(self.new)
-        self.image_bench_service.bench_setup_requirements(
-            self.new,
-            apps,
-            self.bench_cli,
-            self.current,
-            self.bench_path,
-            self.site_name,
-            self._host_run,
-        )
-        self.image_bench_service.bench_build(
-            self.new,
-            apps,
-            self.bench_cli,
-            self.current,
-            self.bench_path,
-            self.site_name,
-            self._host_run,
+        pipeline = Pipeline(
+            self._create_stages(self.new, apps, drain_early=drain_early),
+            self.printer,
+            budget=self.config.release.pipeline_jobs,
+            on_cancel=self._cancel_build,
         )
+        try:
+            try:
+                pipeline.run(holders=self._printer_holders())
+            finally:
+                self._stop_build_session()
+            self._adopt_release_runtimes(self.new.path)
+        except BaseException:
+            # Includes Ctrl-C: workers suspended by the early drain must not stay suspended.
+            self._resume_workers()
+            raise
 
         return self.new.path.name
 
+    def _create_release_dirs(self, new: BenchDirectory) -> None:
+        for dir_path in [new.path, new.apps, new.sites]:
+            dir_path.mkdir(parents=True, exist_ok=True)
+            self.printer.print(f"Created dir [blue]{dir_path.name}[/blue]")
+        (new.path / "config" / "pids").mkdir(parents=True, exist_ok=True)
+        (new.path / "logs").mkdir(parents=True, exist_ok=True)
+
+        self.config.to_toml(new.path / ".fmd.toml")
+
+    def _create_stages(self, new: BenchDirectory, apps: list, drain_early: bool = False) -> list[Stage]:
+        bench = self.image_bench_service
+        hook_args = (self.current, self.bench_path, self.site_name, self._host_run)
+        # Without a configured Node version it is detected from frappe, so fnm waits for the clone.
+        node_runtime_deps = ("runtimes",) if self.config.release.node_version else ("runtimes", "detect_versions")
+        build_deps = ("python_env", "node_packages", "site_config")
+
+        stages = [
+            Stage("release_dirs", lambda: self._create_release_dirs(new)),
+            Stage("runtimes", lambda: self._seed_release_runtimes(new.path), deps=("release_dirs",)),
+            Stage(
+                "clone_apps",
+                lambda: self.app_service.clone_apps(self.data, new, apps, self.site_name, self._is_app_installed),
+                deps=("release_dirs",),
+            ),
+            Stage("site_config", lambda: self._create_temp_common_site_config(new), deps=("release_dirs",)),
+            Stage("detect_versions", lambda: bench.detect_runtime_versions(new), deps=("clone_apps",)),
+            Stage(
+                "migrate_fingerprint",
+                lambda: new.update_metadata(migration_fingerprint=migration_fingerprint(new)),
+                deps=("clone_apps",),
+            ),
+            Stage(
+                "python_env",
+                lambda: bench.setup_python_env(new, apps, *hook_args),
+                deps=("runtimes", "detect_versions"),
+                weight=2,
+            ),
+            Stage("node_runtime", lambda: bench.setup_node_runtime(new), deps=node_runtime_deps),
+            Stage("apps_txt", lambda: bench.configure_apps_txt(new, apps), deps=("clone_apps",)),
+            Stage(
+                "node_packages",
+                lambda: bench.setup_node_packages(new, apps, self.bench_cli, self.current),
+                deps=("node_runtime", "apps_txt"),
+                weight=2,
+            ),
+            Stage(
+                "build",
+                lambda: bench.bench_build(new, apps, self.bench_cli, *hook_args),
+                deps=build_deps,
+                weight=self.config.release.pipeline_jobs,
+            ),
+        ]
+        if self.config.release.smoke_boot:
+            stages.append(Stage("smoke_boot", lambda: self._smoke_boot(new), deps=("build",)))
+        d = self.config.switch
+        if drain_early and d.queue_drain and d.queue_drain_early and self._queue_drain_available():
+            # Holds no budget, so it runs alongside the build instead of waiting for it.
+            stages.append(
+                Stage("queue_drain", lambda: self._start_queue_drain(new), deps=build_deps, weight=0)
+            )
+        return stages
+
+    def _start_queue_drain(self, new: BenchDirectory) -> None:
+        try:
+            self._suspend_workers(new)
+        except Exception as e:
+            self.printer.warning(f"Could not suspend background workers early: {e}")
+
+    def _smoke_boot(self, new: BenchDirectory) -> None:
+        try:
+            report = self.smoke_boot_service.boot(new, self.data, self.site_name)
+        except Exception as e:
+            self.printer.warning(f"Smoke boot could not run, release left switchable: {e}")
+            new.update_metadata(smoke_boot={"passed": None, "errors": [str(e)]})
+            return
+        if report["passed"]:
+            new.update_metadata(smoke_boot=report, unswitchable=None)
+        else:
+            new.update_metadata(smoke_boot=report, unswitchable="; ".join(report["errors"])[:1000])
+
+    def _printer_holders(self) -> list:
+        return [
+            self,
+            self.app_service,
+            self.backup_service,
+            self.bench_service,
+            self.image_bench_service,
+            self.cleanup_service,
+            self.symlink_service,
+            self.smoke_boot_service,
+            self.image_runner,
+            self.exec_runner,
+            self.host_runner,
+        ]
+
+    def _cancel_build(self) -> None:
+        cancel = getattr(self.image_runner, "cancel", None)
+        if cancel is not None:
+            cancel()
+
+    def _stop_build_session(self) -> None:
+        stop_session = getattr(self.image_runner, "stop_session", None)
+        if stop_session is not None:
+            stop_session()
+
+    @traced("release.switch", category="manager")
     def switch(self, release_name: str) -> None:
+        try:
+            self._switch(release_name)
+        finally:
+            # Workers suspended by create or the drain must never stay suspended, nor the scheduler paused.
+            self._resume_workers()
+            self._resume_scheduler()
+
+    def _switch(self, release_name: str) -> None:
         release_path = self.workspace_path / release_name
         if not release_path.exists():
             raise RuntimeError(f"Release '{release_name}' not found at {release_path}")
 
         new = BenchDirectory(release_path)
+        unswitchable = new.read_metadata().get("unswitchable")
+        if unswitchable:
+            raise RuntimeError(
+                f"Release '{release_name}' failed its smoke boot and is marked unswitchable: {unswitchable}"
+            )
         previous_release = self.bench_path.resolve()
 
-        restore_db_file_path: Optional[Path] = None
+        restore_db_source: Optional[Union[Path, str]] = None
+
+        latency_baseline = None
+        if self.config.switch.latency_gate:
+            latency_baseline = self._latency_baseline(new, previous_release)
 
         if self.config.switch.backups:
             self.backup_service.bench_db_and_configs_backup(
@@ -434,43 +548,115 @@ class ReleaseManager:
             from fmd.fc.data_source import FCDataSource
 
             fc_source = FCDataSource(self.config.fc)
-            restore_db_file_path = fc_source.download_db_backup(self.workspace_root / "deployment-backup" / "fc-db")
+            if self.config.switch.fc_db_stream:
+                restore_db_source = fc_source.db_backup_url()
+            else:
+                restore_db_source = fc_source.download_db_backup(self.workspace_root / "deployment-backup" / "fc-db")
 
         self.backup_service.sync_configs_with_files(self.current, self.site_name)
         self.symlink_service.configure_symlinks(self.data, new)
+
+        migrate, migrate_reason = self._migrate_decision(new, previous_release, restore_db_source)
+        self.printer.print(f"{'Running' if migrate else 'Skipping'} migrate: {migrate_reason}")
+        new.update_metadata(migrate={"ran": migrate, "reason": migrate_reason})
+        # Set again only once the schema is known to match this release.
+        record_migrated(new, None)
+
+        hot_reload = False
+        if self.config.switch.hot_reload:
+            hot_reload, hot_reload_reason = self._hot_reload_decision(
+                new, previous_release, migrate, restore_db_source
+            )
+            self.printer.print(f"{'Hot reload' if hot_reload else 'Full restart'}: {hot_reload_reason}")
+
+        queue_drained = False
+        if self.config.switch.queue_drain and not hot_reload and self._queue_drain_available():
+            queue_drained = self._drain_queues(new)
+
+        if self.config.switch.traffic_wait and not hot_reload:
+            self._wait_for_quiet_traffic(new)
+
+        probe = None
+        blue_green = False
+        if self.config.switch.blue_green and not hot_reload:
+            try:
+                self.blue_green_service.check_available()
+                probe = self.blue_green_service.start_probe(new, self.site_name)
+                blue_green = self._blue_green_eligible(migrate, restore_db_source)
+                if blue_green:
+                    self._start_green(new)
+            except BlueGreenUnavailable as e:
+                self.printer.warning(f"Blue/green switch unavailable, restarting in place: {e}")
+            except Exception:
+                if probe is not None:
+                    self.blue_green_service.stop_probe(probe)
+                raise
+
+        migrate_window = None
+        if migrate and self.config.switch.migrate_window:
+            migrate_window = self._open_migrate_window(new, queue_drained)
+            queue_drained = queue_drained or self._workers_suspended
+
         self.bench_service.bench_symlink(self.bench_path, new)
         self._seed_release_runtimes(new.path)
 
         try:
-            if restore_db_file_path:
-                self.backup_service.bench_restore(self.site_name, self.workspace_root, restore_db_file_path)
-                if restore_db_file_path.exists():
-                    restore_db_file_path.unlink()
+            if restore_db_source:
+                self.backup_service.bench_restore(self.site_name, self.workspace_root, restore_db_source)
+                if isinstance(restore_db_source, Path) and restore_db_source.is_file():
+                    restore_db_source.unlink()
 
-            self.bench_service.bench_restart(
-                new,
-                self.bench_path,
-                self.current,
-                self.site_name,
-                self._host_run,
-                **self._restart_kwargs(),
-            )
-            self.bench_service.bench_clear_cache(self.current, self.bench_cli, self.site_name)
-            self.site_installed_apps = self._get_site_installed_apps(self.current)
-            if self.config.switch.install_apps:
-                self.app_service.bench_install_apps(
-                    self.current, self.config.apps, self.site_name, self.bench_cli, self._is_app_installed
-                )
-            else:
-                self.printer.print("Skipping app installation (install_apps=false)")
+            try:
+                reloaded = hot_reload and self._hot_reload(new)
+                if blue_green:
+                    self.blue_green_service.route(self.config.switch.blue_green_port)
+                if not reloaded:
+                    restart_kwargs = {**self._restart_kwargs(), "migrate": migrate, "before_hooks": not hot_reload}
+                    if queue_drained:
+                        restart_kwargs["drain_workers"] = False
+                    if migrate_window is not None and self._timed_migrate():
+                        # Copied only now: before the swap, the bench path still led to the old release.
+                        restart_kwargs["migrate_command"] = self.bench_service.prepare_timed_migrate(
+                            self.current, self.site_name
+                        )
+                    restart_start = time.time()
+                    try:
+                        self.bench_service.bench_restart(
+                            new, self.bench_path, self.current, self.site_name, self._host_run, **restart_kwargs
+                        )
+                    finally:
+                        if migrate_window is not None:
+                            migrate_window["restart_and_migrate"] = round(time.time() - restart_start, 3)
+                if self.config.switch.migrate:
+                    # Migrate succeeded, or was skipped because the schema already matched.
+                    self._record_migrated(new)
+                if blue_green:
+                    self.blue_green_service.wait_healthy(new, self.site_name, BLUE_PORT)
+            finally:
+                if blue_green:
+                    self._stop_green(new)
+                if probe is not None:
+                    self._report_unavailability(new, probe, "blue_green" if blue_green else "restart")
+                if migrate_window is not None:
+                    self._close_migrate_window(new, migrate_window)
+                self._resume_workers()
+
+            self._post_switch()
+            if self.config.switch.warmup:
+                self._warm_up(new)
+            if latency_baseline is not None:
+                self._latency_gate(new, latency_baseline)
             self.cleanup_service.cleanup_releases(self.workspace_root, self.bench_path)
             self._sync_remote_workers()
 
         except Exception as e:
-            if self.config.switch.rollback:
+            if self.config.switch.rollback or isinstance(e, LatencyRegression):
                 self.printer.warning(f"Failed to switch to release {release_name}: {e}. Rolling back")
                 if self.bench_path.exists() or self.bench_path.is_symlink():
                     self.bench_path.unlink()
+                if migrate:
+                    # Migrate may have moved the schema on; the previous release's record no longer holds.
+                    record_migrated(BenchDirectory(previous_release), None)
                 self.bench_service.bench_symlink(self.bench_path, BenchDirectory(previous_release))
                 self.bench_service.bench_restart(
                     BenchDirectory(previous_release),
@@ -483,6 +669,290 @@ class ReleaseManager:
                 self.printer.print("Rolled back to previous release")
             raise
 
+    def _app_module_names(self, bench_directory: BenchDirectory) -> list[str]:
+        modules = []
+        for app in self.config.apps:
+            app_path = bench_directory.apps / app.dir_name
+            if app_path.is_dir():
+                modules.append(bench_directory.get_app_python_module_name(app_path))
+        return modules
+
+    def _post_switch(self) -> None:
+        """Clear caches and install apps on the switched-to release."""
+        install_apps = self.config.switch.install_apps
+        if self.config.switch.post_switch_in_process:
+            result = self.bench_service.bench_post_switch(
+                self.current, self.site_name, self._app_module_names(self.current) if install_apps else []
+            )
+            if result is not None:
+                self.site_installed_apps = {self.site_name: result.get("installed_apps", [])}
+                if not install_apps:
+                    self.printer.print("Skipping app installation (install_apps=false)")
+                return
+            self.printer.warning("Falling back to bench commands for cache clear and app installation")
+
+        self.bench_service.bench_clear_cache(self.current, self.bench_cli, self.site_name)
+        self.site_installed_apps = self._get_site_installed_apps(self.current)
+        if install_apps:
+            self.app_service.bench_install_apps(
+                self.current, self.config.apps, self.site_name, self.bench_cli, self._is_app_installed
+            )
+        else:
+            self.printer.print("Skipping app installation (install_apps=false)")
+
+    def _warm_up(self, new: BenchDirectory) -> None:
+        try:
+            report = self.bench_service.bench_warm_up(self.current, self.site_name)
+        except Exception as e:
+            self.printer.warning(f"Warm-up failed: {e}")
+            return
+        new.update_metadata(warmup=report)
+
+    def _wait_for_quiet_traffic(self, new: BenchDirectory) -> None:
+        d = self.config.switch
+        if d.traffic_wait_logs:
+            logs = [Path(path) for path in d.traffic_wait_logs]
+        else:
+            logs = find_access_logs(self.workspace_root / "configs" / "nginx" / "logs", self.current.logs)
+        if not logs:
+            self.printer.warning("No access logs found, not waiting for a quiet moment")
+            return
+
+        self.printer.change_head(
+            f"Waiting up to {d.traffic_wait_max}s for request rate <= {d.traffic_wait_threshold}/s"
+        )
+        report = wait_for_quiet(
+            LogRateSampler(logs),
+            d,
+            on_sample=lambda elapsed, rate: self.printer.change_head(
+                f"Waiting for a quiet moment: {rate:.1f} req/s after {elapsed:.0f}s"
+            ),
+        )
+        self.printer.print(
+            f"Switching at {report['at']} after {report['waited_seconds']}s ({report['reason']}): "
+            f"{report['rps']} req/s, peak {report['highest_rps']} req/s"
+        )
+        new.update_metadata(traffic_wait=report)
+
+    def _queue_drain_available(self) -> bool:
+        """Queue drain talks to Redis through the running frappe service of a configured bench."""
+        return getattr(self.exec_runner, "mode", None) == "exec" and self.current.path.is_symlink()
+
+    def _suspend_workers(self, new: BenchDirectory) -> None:
+        if self._workers_suspended:
+            return
+        # Set first: if the status read fails after the suspend, the flag still gets cleared.
+        self._workers_suspended = True
+        status = self.bench_service.bench_suspend_workers(self.current)
+        new.update_metadata(queue_drain={"status": status})
+
+    def _resume_workers(self) -> None:
+        if not self._workers_suspended:
+            return
+        try:
+            self.bench_service.bench_resume_workers(self.current)
+        except Exception as e:
+            self.printer.warning(f"Could not resume background workers, delete 'rq:suspended' in redis_queue: {e}")
+            return
+        self._workers_suspended = False
+
+    def _drain_queues(self, new: BenchDirectory) -> bool:
+        """Suspend workers (unless create already did) and wait until none is busy.
+
+        Returns False when Redis couldn't be read, so the restart falls back to fmx's drain.
+        """
+        d = self.config.switch
+        try:
+            self._suspend_workers(new)
+            result = self.bench_service.bench_wait_workers_idle(
+                self.current, d.drain_workers_timeout, d.queue_drain_poll
+            )
+        except Exception as e:
+            self.printer.warning(f"Queue drain failed, falling back to the restart's drain: {e}")
+            self._resume_workers()
+            return False
+        new.update_metadata(queue_drain={**new.read_metadata().get("queue_drain", {}), "wait": result})
+        return True
+
+    def _pause_scheduler(self) -> None:
+        """Set ``pause_scheduler`` in the site config; frappe's scheduler reads it on every tick."""
+        path = self.current.sites / self.site_name / "site_config.json"
+        self._scheduler_paused_from = (get_json(path).get("pause_scheduler"),)
+        update_json_keys_in_file_path(path, {"pause_scheduler": 1})
+        self.printer.print("Scheduler paused")
+
+    def _resume_scheduler(self) -> None:
+        if self._scheduler_paused_from is None:
+            return
+        path = self.current.sites / self.site_name / "site_config.json"
+        site_config = get_json(path)
+        (previous,) = self._scheduler_paused_from
+        if previous is None:
+            site_config.pop("pause_scheduler", None)
+        else:
+            site_config["pause_scheduler"] = previous
+        path.write_text(json.dumps(site_config, ensure_ascii=False, indent=4))
+        self._scheduler_paused_from = None
+        self.printer.print("Scheduler resumed")
+
+    def _open_migrate_window(self, new: BenchDirectory, queue_drained: bool) -> dict:
+        """Pause the scheduler and drain the workers so migrate runs with the database to itself.
+
+        Returns the window's timings, which the restart and ``_close_migrate_window`` add to.
+        """
+        self.printer.change_head("Pausing scheduler and background jobs for migrate")
+        window: dict = {}
+        start = time.time()
+        self._pause_scheduler()
+        window["pause_scheduler"] = round(time.time() - start, 3)
+
+        if queue_drained:
+            window["drain_workers"] = 0.0
+        elif self._queue_drain_available():
+            start = time.time()
+            self._drain_queues(new)
+            window["drain_workers"] = round(time.time() - start, 3)
+        else:
+            self.printer.warning("Workers can't be suspended without the frappe service, only the scheduler is paused")
+        return window
+
+    def _timed_migrate(self) -> bool:
+        return self.config.switch.migrate_phase_timings and not self.config.switch.migrate_command
+
+    def _close_migrate_window(self, new: BenchDirectory, window: dict) -> None:
+        start = time.time()
+        self._resume_workers()
+        self._resume_scheduler()
+        window["resume"] = round(time.time() - start, 3)
+
+        if self._timed_migrate():
+            report = self.bench_service.collect_migrate_report(self.current)
+            if report is not None:
+                window["migrate_phases"] = report.get("phases", {})
+                window["slowest_patches"] = report.get("slowest_patches", [])
+
+        steps = ("pause_scheduler", "drain_workers", "restart_and_migrate", "resume")
+        self.printer.print(
+            "Migrate window: " + ", ".join(f"{step} {window[step]}s" for step in steps if step in window)
+        )
+        new.update_metadata(migrate_window=window)
+
+    def _hot_reload_decision(
+        self, new: BenchDirectory, live_path: Path, migrate: bool, restore_db_source: Optional[Union[Path, str]]
+    ) -> tuple[bool, str]:
+        """Whether the switch to ``new`` can reload services in place instead of restarting them, and why."""
+        if getattr(self.exec_runner, "mode", None) != "exec":
+            return False, "hot reload needs the frappe service running (exec mode)"
+        if migrate:
+            return False, "migrate runs"
+        if restore_db_source:
+            return False, "database is restored"
+        if not live_path.is_dir() or live_path == new.path.resolve():
+            return False, "no other release is live"
+        return python_only_change(new, BenchDirectory(live_path))
+
+    def _hot_reload(self, new: BenchDirectory) -> bool:
+        report = self.bench_service.bench_hot_reload(
+            new, self.bench_path, self.current, self.site_name, self._host_run
+        )
+        new.update_metadata(hot_reload=report or {"ok": False})
+        if report is None:
+            self.printer.warning("Falling back to a full restart")
+            return False
+        return True
+
+    def _latency_baseline(self, new: BenchDirectory, previous_release: Path) -> Optional[dict]:
+        """Latency of the live release, measured before anything in the switch loads it."""
+        if not self.current.path.is_symlink() or previous_release == new.path.resolve():
+            self.printer.print("Skipping latency gate: no other release is live")
+            return None
+        try:
+            return self.bench_service.bench_latency_sample(self.current, self.site_name)
+        except Exception as e:
+            self.printer.warning(f"Skipping latency gate: could not sample the live release: {e}")
+            return None
+
+    def _latency_gate(self, new: BenchDirectory, baseline: dict) -> None:
+        after = self.bench_service.bench_latency_sample(self.current, self.site_name)
+        reasons = compare_latency(baseline, after, self.config.switch)
+        new.update_metadata(
+            latency_gate={"before": baseline, "after": after, "passed": not reasons, "reasons": reasons}
+        )
+        if reasons:
+            raise LatencyRegression(reasons)
+        self.printer.print("Latency gate passed")
+
+    def _migrate_decision(
+        self, new: BenchDirectory, live_path: Path, restore_db_source: Optional[Union[Path, str]]
+    ) -> tuple[bool, str]:
+        """Whether the switch to ``new`` runs migrate, and why."""
+        d = self.config.switch
+        if not d.migrate:
+            return False, "switch.migrate is disabled"
+        if d.force_migrate:
+            return True, "forced with --force-migrate"
+        if restore_db_source:
+            return True, "the database is restored from a backup"
+
+        live = BenchDirectory(live_path)
+        if live.path == new.path.resolve() or not live.apps.is_dir():
+            return True, "no live release to compare with"
+
+        new_fp = new.read_metadata().get("migration_fingerprint")
+        if new_fp is None:
+            new_fp = migration_fingerprint(new)
+            new.update_metadata(migration_fingerprint=new_fp)
+        changed = changed_since_migrate(new_fp, live)
+        if changed is None:
+            return True, f"live release {live.path.name} has no record of a successful migrate"
+        if changed:
+            return True, f"patches, doctypes, fixtures or migrate hooks changed in {', '.join(changed)}"
+        return False, f"migration fingerprint matches the schema migrated under {live.path.name}"
+
+    def _record_migrated(self, new: BenchDirectory) -> None:
+        fingerprint = new.read_metadata().get("migration_fingerprint")
+        if fingerprint is None:
+            fingerprint = migration_fingerprint(new)
+            new.update_metadata(migration_fingerprint=fingerprint)
+        record_migrated(new, fingerprint)
+
+    def _blue_green_eligible(self, migrate: bool, restore_db_source: Optional[Union[Path, str]]) -> bool:
+        if migrate:
+            self.printer.print("Switch runs migrate; restarting in place (unavailability is still measured)")
+            return False
+        if restore_db_source:
+            self.printer.print("Switch restores a database; restarting in place (unavailability is still measured)")
+            return False
+        return True
+
+    def _start_green(self, new: BenchDirectory) -> None:
+        try:
+            self.blue_green_service.start_green(new)
+            self.blue_green_service.wait_healthy(new, self.site_name, self.config.switch.blue_green_port)
+        except Exception:
+            self.blue_green_service.stop_green(new)
+            raise
+
+    def _stop_green(self, new: BenchDirectory) -> None:
+        """Route nginx back to the bench's own web server and stop green, whether or not the restart worked."""
+        try:
+            self.blue_green_service.route(BLUE_PORT)
+        finally:
+            self.blue_green_service.stop_green(new)
+
+    def _report_unavailability(self, new: BenchDirectory, probe, strategy: str) -> None:
+        try:
+            report = self.blue_green_service.stop_probe(probe)
+        except Exception as e:
+            self.printer.warning(f"Could not read switch probe results: {e}")
+            return
+        report["strategy"] = strategy
+        new.update_metadata(switch=report)
+        self.printer.print(
+            f"Unavailability ({strategy}): {report['unavailable_ms']} ms, "
+            f"{report['failed_probes']}/{report['probes']} probes failed, max latency {report['max_latency_ms']} ms"
+        )
+
     def _extract_python_version(self, release_path: Path) -> str:
         uv_default = release_path / ".uv" / "python-default"
         if not uv_default.is_symlink():
@@ -13,10 +13,11 @@ except ImportError:
     _ComposeFile = None
 
 from fmd.config.config import Config
-from fmd.consts import DATA_DIR_NAME
+from fmd.consts import DATA_DIR_NAME, RUNTIME_STORE_DIR_NAME
 from fmd.helpers import get_relative_path
 from fmd.release_directory import BenchDirectory
 from fmd.ssh import SSHClient
+from fmd.tracing import traced
 
 
 def _get_current_ip() -> str:
@@ -180,6 +181,7 @@ class RemoteWorkerManager:
 
         self.printer.print(f"Created worker configs with Redis queue URL: {common_config['redis_queue']}")
 
+    @traced("remote_worker.sync", category="manager")
     def sync(self) -> None:
         self._stop_all_compose_services()
         self._rsync_workspace()
@@ -249,6 +251,17 @@ class RemoteWorkerManager:
             },
         ]
 
+        # Cache contents stay local; the empty uv-cache and corepack dirs are kept so the
+        # release's links to them resolve on the remote.
+        rsync_dirs.append(
+            {
+                "src": self.current.path.parent / RUNTIME_STORE_DIR_NAME,
+                "dest": RUNTIME_STORE_DIR_NAME,
+                "excludes": ["--exclude=/uv-cache/**", "--exclude=/corepack/**", "--exclude=.*"],
+                "trailing_slash": True,
+            }
+        )
+
         for dir_cfg in self.rw.include_dirs or []:
             rsync_dirs.append(
                 {
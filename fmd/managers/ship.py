@@ -1,11 +1,15 @@
+import shlex
 import subprocess
 from pathlib import Path
 
 from fmd.config.config import Config
+from fmd.consts import RUNTIME_STORE_DIR_NAME
 from fmd.managers.release import ReleaseManager
 from fmd.runner.docker import DockerRunner
 from fmd.runner.host import HostRunner
+from fmd.runtime_store import SHARED_RUNTIMES, RuntimeStore
 from fmd.ssh import SSHClient
+from fmd.tracing import traced
 
 
 class ShipManager:
@@ -125,13 +129,30 @@ class ShipManager:
 
         self.printer.print(f"Image [blue]{image}[/blue] ready")
 
+    @traced("ship.rsync_release", category="manager")
     def _rsync_release(self, release_name: str) -> None:
         local_src = str(self.config.workspace_root / "workspace" / release_name) + "/"
         remote_dest = f"{self.config.ship.remote_path}/workspace/{release_name}/"
         self.printer.change_head(f"Syncing release {release_name} to remote")
         self.ssh.rsync(local_src, remote_dest, self.config.ship.rsync_options)
+        self._rsync_release_runtimes(release_name)
         self.printer.print("Release synced")
 
+    def _rsync_release_runtimes(self, release_name: str) -> None:
+        release_path = self.config.workspace_root / "workspace" / release_name
+        store = RuntimeStore.for_release(release_path)
+        for entry in store.release_entries(release_path):
+            self.printer.change_head(f"Syncing runtime {entry} to remote")
+            self.ssh.rsync(
+                f"{store.root / entry}/",
+                f"{self.config.ship.remote_path}/workspace/{RUNTIME_STORE_DIR_NAME}/{entry}/",
+                ["--mkpath"],
+            )
+        # The uv cache and corepack aren't shipped, but the release links to them.
+        remote_store = f"{self.config.ship.remote_path}/workspace/{RUNTIME_STORE_DIR_NAME}"
+        shared = " ".join(shlex.quote(f"{remote_store}/{kind}") for _, kind in SHARED_RUNTIMES)
+        self.ssh.run(f"mkdir -p {shared}")
+
     def _rsync_config(self, config_path: Path) -> None:
         self.printer.change_head("Syncing config to remote")
         self.ssh.rsync(str(config_path), f"{self.config.ship.remote_path}/")
@@ -228,6 +249,7 @@ class ShipManager:
             )
             self.printer.print("Remote configure complete")
 
+    @traced("ship.remote_switch", category="manager")
     def _remote_switch(self, release_name: str, remote_config_path: str) -> None:
         self.printer.change_head(f"Switching remote to release {release_name}")
         self._remote_fmd_command(
@@ -235,6 +257,7 @@ class ShipManager:
         )
         self.printer.print(f"Remote switched to [blue]{release_name}[/blue]")
 
+    @traced("deploy.ship", category="manager")
     def deploy(self, config_path: Path, existing_release: str | None = None, skip_rsync: bool = False) -> None:
         self._run_tag = None
         self._image_id = None
@@ -0,0 +1,109 @@
+import ast
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+from fmd.release_directory import BenchDirectory
+
+# hooks.py entries bench migrate acts on.
+MIGRATE_HOOKS = (
+    "before_migrate",
+    "after_migrate",
+    "fixtures",
+    "scheduler_events",
+    "standard_queries",
+    "override_doctype_class",
+)
+
+# Release metadata key holding the fingerprint the database schema was migrated to.
+MIGRATED_KEY = "migrated_fingerprint"
+
+# Directories inside an app module whose JSON migrate never syncs.
+_IGNORED_DIRS = {"public", "node_modules", "__pycache__", "tests", "www"}
+
+
+def _migrate_hooks_source(hooks_py: Path) -> str:
+    """Source of the migrate-relevant assignments in ``hooks_py``, independent of the rest of the file."""
+    try:
+        tree = ast.parse(hooks_py.read_text())
+    except (OSError, SyntaxError, ValueError):
+        return hooks_py.read_text(errors="replace") if hooks_py.is_file() else ""
+
+    parts = []
+    for node in tree.body:
+        targets = node.targets if isinstance(node, ast.Assign) else [getattr(node, "target", None)]
+        for target in targets:
+            if isinstance(target, ast.Name) and target.id in MIGRATE_HOOKS:
+                parts.append(f"{target.id}={ast.unparse(node.value)}")
+    return "\n".join(sorted(parts))
+
+
+def _module_dir(release: BenchDirectory, app_path: Path) -> Optional[Path]:
+    try:
+        module = release.get_app_python_module_name(app_path)
+    except RuntimeError:
+        return None
+    module_dir = app_path / module
+    return module_dir if module_dir.is_dir() else None
+
+
+def app_migration_fingerprint(release: BenchDirectory, app_path: Path) -> Optional[str]:
+    """Hash of what ``bench migrate`` reads from an app: patches.txt, synced JSON and migrate hooks.
+
+    JSON covers doctypes, fixtures, custom fields and the other records migrate syncs
+    from the app's module folders. Returns None when the app's module can't be found.
+    """
+    module_dir = _module_dir(release, app_path)
+    if module_dir is None:
+        return None
+
+    digest = hashlib.sha256()
+    patches = module_dir / "patches.txt"
+    if patches.is_file():
+        digest.update(b"patches.txt\0" + patches.read_bytes() + b"\0")
+
+    digest.update(b"hooks\0" + _migrate_hooks_source(module_dir / "hooks.py").encode() + b"\0")
+
+    json_files = []
+    for path in module_dir.rglob("*.json"):
+        relative = path.relative_to(module_dir)
+        if not _IGNORED_DIRS.intersection(relative.parts[:-1]):
+            json_files.append((relative.as_posix(), path))
+    for relative, path in sorted(json_files):
+        digest.update(relative.encode() + b"\0" + path.read_bytes() + b"\0")
+
+    return digest.hexdigest()
+
+
+def migration_fingerprint(release: BenchDirectory) -> dict:
+    """Per-app migration fingerprints of ``release``, keyed by app directory name."""
+    apps = {}
+    if release.apps.is_dir():
+        for app_path in sorted(release.apps.iterdir()):
+            if app_path.is_dir():
+                apps[app_path.name] = app_migration_fingerprint(release, app_path)
+    return apps
+
+
+def changed_apps(new: dict, live: dict) -> list[str]:
+    """Apps whose fingerprint differs, including added and removed apps and apps that couldn't be hashed."""
+    names = sorted(set(new) | set(live))
+    return [name for name in names if new.get(name) is None or new.get(name) != live.get(name)]
+
+
+def record_migrated(release: BenchDirectory, fingerprint: Optional[dict]) -> None:
+    """Record that the database schema matches ``fingerprint`` while ``release`` is live; None clears it."""
+    release.update_metadata(**{MIGRATED_KEY: fingerprint})
+
+
+def changed_since_migrate(new: dict, live: BenchDirectory) -> Optional[list[str]]:
+    """Apps whose fingerprint differs from the one the database was last migrated to under ``live``.
+
+    None when that isn't known: ``live`` was switched to without migrate, its migrate
+    failed, or it was created before fmd kept the record. The fingerprint ``live`` was
+    built with says nothing about the schema, so it isn't used here.
+    """
+    migrated = live.read_metadata().get(MIGRATED_KEY)
+    if migrated is None:
+        return None
+    return changed_apps(new, migrated)
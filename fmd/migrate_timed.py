@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""``bench migrate`` for one site with a timing breakdown, used as fmx's migrate command.
+
+Runs frappe's own ``SiteMigration`` with each phase method timed: setUp (maintenance
+flag, before_migrate hooks), pre_schema_updates (pre-model-sync patches),
+run_schema_updates (doctype sync), post_schema_updates (post-model-sync patches,
+fixtures, dashboards, customizations, after_migrate hooks) and tearDown. Every patch is
+timed as well. The report is written as JSON to ``--report``; the exit code is
+migrate's.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+
+PHASES = ("setUp", "pre_schema_updates", "run_schema_updates", "post_schema_updates", "tearDown")
+# Slowest patches kept in the report.
+_TOP_PATCHES = 10
+
+
+def timed(func, into: dict, key: str):
+    def wrapper(*args, **kwargs):
+        start = time.time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            into[key] = round(into.get(key, 0.0) + time.time() - start, 3)
+            print(f"[fmd] {key} took {into[key]}s", flush=True)
+
+    return wrapper
+
+
+def migrate(report: dict, site: str, skip_failing: bool, skip_search_index: bool) -> None:
+    """Run the migration, filling ``report`` as it goes so a failure still leaves the timings."""
+    import frappe.modules.patch_handler as patch_handler
+    from frappe.migrate import SiteMigration
+
+    report.update(phases={}, patches={})
+    run_single = patch_handler.run_single
+
+    def timed_run_single(patchmodule=None, *args, **kwargs):
+        start = time.time()
+        try:
+            return run_single(patchmodule, *args, **kwargs)
+        finally:
+            if patchmodule:
+                report["patches"][patchmodule] = round(time.time() - start, 3)
+
+    patch_handler.run_single = timed_run_single
+    migration = SiteMigration(skip_failing=skip_failing, skip_search_index=skip_search_index)
+    for phase in PHASES:
+        setattr(migration, phase, timed(getattr(migration, phase), report["phases"], phase))
+
+    start = time.time()
+    try:
+        migration.run(site=site)
+        report["ok"] = True
+    except BaseException as e:
+        report["error"] = f"{type(e).__name__}: {e}"
+        report["traceback"] = traceback.format_exc()
+        raise
+    finally:
+        patch_handler.run_single = run_single
+        report["seconds"] = round(time.time() - start, 3)
+        report["slowest_patches"] = sorted(report.pop("patches").items(), key=lambda item: -item[1])[:_TOP_PATCHES]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate a site with per-phase timings")
+    parser.add_argument("--sites", required=True, help="Bench sites directory")
+    parser.add_argument("--site", required=True, help="Frappe site name")
+    parser.add_argument("--report", required=True, help="File the JSON timing report is written to")
+    parser.add_argument("--skip-failing", action="store_true")
+    parser.add_argument("--skip-search-index", action="store_true")
+    args = parser.parse_args()
+
+    os.chdir(args.sites)
+    report = {"site": args.site, "ok": False}
+    try:
+        migrate(report, args.site, args.skip_failing, args.skip_search_index)
+    except BaseException as e:
+        report.setdefault("error", f"{type(e).__name__}: {e}")
+    finally:
+        with open(args.report, "w") as f:
+            json.dump(report, f)
+    sys.exit(0 if report["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import hashlib
+import shutil
+import time
+from pathlib import Path
+from typing import Optional
+
+from fmd.helpers import clone_tree, file_lock, hardlink_or_copy
+from fmd.logger import get_logger
+
+LOCKFILES = ("yarn.lock", "package-lock.json")
+LAST_USED_STAMP = ".fmd-last-used"
+
+
+def _ignore_build_cache(directory: str, names: list[str]) -> list[str]:
+    # node_modules/.cache is written by bundlers during `bench build`
+    return [".cache"] if directory.endswith("node_modules") and ".cache" in names else []
+
+
+class NodeModulesCache:
+    """node_modules trees keyed by an app's lockfile, package.json and the Node version.
+
+    An entry is an immutable copy of a freshly installed node_modules; releases get a
+    reflink or hardlink copy of it instead of running yarn again.
+    """
+
+    def __init__(self, root: Path, max_age_days: int = 14) -> None:
+        self.root = root
+        self.max_age_seconds = max_age_days * 24 * 3600
+
+    @classmethod
+    def from_config(cls, config) -> Optional["NodeModulesCache"]:
+        if not config.release.node_modules_cache:
+            return None
+        return cls(config.workspace_root / ".cache" / "node-modules", config.release.node_modules_cache_max_age)
+
+    @staticmethod
+    def key(app_path: Path, node_version: Optional[str]) -> Optional[str]:
+        """Cache key for ``app_path``, or None when it has no lockfile to key on."""
+        lockfile = next((app_path / name for name in LOCKFILES if (app_path / name).is_file()), None)
+        if lockfile is None:
+            return None
+
+        digest = hashlib.sha256()
+        digest.update(f"node={node_version or 'default'}\0".encode())
+        for spec in (lockfile, app_path / "package.json"):
+            if spec.is_file():
+                digest.update(spec.name.encode() + b"\0")
+                digest.update(spec.read_bytes())
+                digest.update(b"\0")
+        return digest.hexdigest()
+
+    def entry(self, key: str) -> Path:
+        return self.root / key / "node_modules"
+
+    def materialize(self, source: Path, app_path: Path) -> str:
+        """Copy ``source`` (a cache entry or another release's node_modules) into ``app_path``."""
+        dest = app_path / "node_modules"
+        method = clone_tree(source, dest)
+        if (dest / ".cache").exists():
+            shutil.rmtree(dest / ".cache")
+        if source.parent.parent == self.root:
+            (source.parent / LAST_USED_STAMP).touch()
+        return method
+
+    def store(self, key: str, app_path: Path) -> bool:
+        node_modules = app_path / "node_modules"
+        entry = self.entry(key)
+        if not node_modules.is_dir():
+            return False
+
+        with file_lock(self.root / ".lock"):
+            if entry.exists():
+                return True
+            tmp = self.root / f".{key}.tmp"
+            if tmp.exists():
+                shutil.rmtree(tmp)
+            tmp.mkdir(parents=True)
+            start = time.time()
+            shutil.copytree(
+                node_modules,
+                tmp / "node_modules",
+                symlinks=True,
+                ignore=_ignore_build_cache,
+                copy_function=hardlink_or_copy,
+            )
+            (tmp / LAST_USED_STAMP).touch()
+            tmp.rename(entry.parent)
+            get_logger().debug(f"NODE CACHE: stored {app_path.name} as {key[:12]} in {time.time() - start:.2f}s")
+        return True
+
+    def prune(self) -> list[str]:
+        if not self.root.is_dir():
+            return []
+
+        removed = []
+        now = time.time()
+        with file_lock(self.root / ".lock", blocking=False) as acquired:
+            if not acquired:
+                return []
+            for entry in self.root.iterdir():
+                if entry.name.startswith(".") or not entry.is_dir():
+                    continue
+                stamp = entry / LAST_USED_STAMP
+                last_used = stamp.stat().st_mtime if stamp.exists() else 0.0
+                if now - last_used > self.max_age_seconds:
+                    shutil.rmtree(entry, ignore_errors=True)
+                    removed.append(entry.name)
+        return removed
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""Parallel per-table dump and restore of a MariaDB database, run with the bench's Python.
+
+``dump`` takes ``FLUSH TABLES WITH READ LOCK`` just long enough for ``--jobs``
+connections to each open a consistent-snapshot transaction, so every table is read
+from the same point in time. Tables are dumped largest first, one compressed file of
+INSERT statements per table, and ``manifest.json`` records each table's schema, file,
+row count and size.
+
+With ``--base`` (an earlier backup directory) the dump is incremental: each table's
+``CHECKSUM TABLE`` is taken inside the snapshot and recorded in the manifest, and a
+table whose schema and checksum match the base is not dumped again. Its manifest entry
+points at the file it was last dumped to (``from``, relative to this directory), so
+every manifest lists the whole database and a chain never has to be walked.
+
+``restore`` loads the tables on ``--jobs`` connections with foreign-key and unique
+checks off and autocommit on, so each INSERT batch commits on its own as with
+mysqldump's output. Each table is created without its secondary indexes, which are
+added in one ``ALTER TABLE`` after the rows are in. Views are created last.
+
+The password is read from ``FMD_DB_PASSWORD``. Prints one JSON line with the timings.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pymysql
+import pymysql.cursors
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+FORMAT = "fmd-parallel-v1"
+MANIFEST = "manifest.json"
+# Approximate size of one multi-row INSERT statement.
+_STATEMENT_BYTES = 1 << 20
+_SECONDARY_INDEX = re.compile(r"^\s*(?:KEY|INDEX|FULLTEXT KEY|FULLTEXT INDEX|SPATIAL KEY|SPATIAL INDEX)\s")
+_INDEX_PARTS = re.compile(r"^\s*[A-Z ]*?(?:KEY|INDEX)\s+`((?:[^`]|``)*)`\s*\((.*)\)")
+_FOREIGN_KEY = re.compile(r"^\s*CONSTRAINT\s+`((?:[^`]|``)*)`\s+FOREIGN KEY\s*\(([^)]*)\)")
+_COLUMN = re.compile(r"`((?:[^`]|``)*)`")
+
+
+def connect(args, database=None, **kwargs) -> pymysql.connections.Connection:
+    return pymysql.connect(
+        host=args.host,
+        port=args.port,
+        user=args.user,
+        password=os.environ.get("FMD_DB_PASSWORD", ""),
+        database=database,
+        charset="utf8mb4",
+        **kwargs,
+    )
+
+
+def quote(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
+
+
+def split_indexes(create: str) -> tuple[str, list[str]]:
+    """Split SHOW CREATE TABLE output into a statement without secondary indexes and those indexes.
+
+    PRIMARY and UNIQUE keys stay in the table so inserts keep their meaning; plain,
+    FULLTEXT and SPATIAL indexes are returned for ``ALTER TABLE ... ADD``. An index a
+    FOREIGN KEY relies on also stays: InnoDB would create one in its place, named after
+    the constraint, and adding the original later would clash with it.
+    """
+    lines = create.split("\n")
+    foreign_keys = []
+    for line in lines[1:-1]:
+        match = _FOREIGN_KEY.match(line)
+        if match:
+            foreign_keys.append((match.group(1), _COLUMN.findall(match.group(2))))
+
+    def backs_foreign_key(line: str) -> bool:
+        match = _INDEX_PARTS.match(line)
+        if match is None:
+            return False
+        name, columns = match.group(1), _COLUMN.findall(match.group(2))
+        return any(name == fk_name or columns[: len(fk_columns)] == fk_columns for fk_name, fk_columns in foreign_keys)
+
+    kept, indexes = [], []
+    for line in lines[1:-1]:
+        if _SECONDARY_INDEX.match(line) and not backs_foreign_key(line):
+            indexes.append(line.strip().rstrip(","))
+        else:
+            kept.append(line.rstrip(","))
+    return "\n".join([lines[0], ",\n".join(kept), lines[-1]]), indexes
+
+
+def open_writer(path: Path, compression: str, level: int):
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd needs the zstandard package in the bench env")
+        return zstandard.ZstdCompressor(level=level).stream_writer(open(path, "wb"))
+    return gzip.open(path, "wb", compresslevel=level)
+
+
+def open_reader(path: Path):
+    if path.name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("zstd needs the zstandard package in the bench env")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+    return gzip.open(path, "rb")
+
+
+def table_checksum(conn, table: str):
+    with conn.cursor() as cursor:
+        cursor.execute(f"CHECKSUM TABLE {quote(table)}")
+        return cursor.fetchone()[1]
+
+
+def table_path(src: Path, entry: dict) -> Path:
+    """File holding a table's rows: in ``src`` or, for a table reused from an earlier backup, in ``from``."""
+    return src / entry.get("from", ".") / entry["file"]
+
+
+def dump_table(conn, table: str, path: Path, compression: str, level: int) -> dict:
+    start = time.time()
+    rows = 0
+    with conn.cursor(pymysql.cursors.SSCursor) as cursor, open_writer(path, compression, level) as out:
+        cursor.execute(f"SELECT * FROM {quote(table)}")
+        prefix = f"INSERT INTO {quote(table)} VALUES ".encode()
+        values: list[bytes] = []
+        size = 0
+        for row in cursor:
+            value = ("(" + ",".join(conn.escape(field) for field in row) + ")").encode()
+            values.append(value)
+            size += len(value)
+            rows += 1
+            if size >= _STATEMENT_BYTES:
+                out.write(prefix + b",".join(values) + b";\n")
+                values, size = [], 0
+        if values:
+            out.write(prefix + b",".join(values) + b";\n")
+    return {"rows": rows, "bytes": path.stat().st_size, "seconds": round(time.time() - start, 3)}
+
+
+def run_jobs(jobs: int, items: list, work) -> dict:
+    """Run ``work(worker_index, item)`` for every item on ``jobs`` threads; returns results by item."""
+    pending: queue.Queue = queue.Queue()
+    for item in items:
+        pending.put(item)
+    results, errors = {}, []
+
+    def worker(index: int) -> None:
+        while not errors:
+            try:
+                item = pending.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                results[item] = work(index, item)
+            except BaseException as e:
+                errors.append(f"{item}: {type(e).__name__}: {e}")
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(jobs)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise RuntimeError("; ".join(errors))
+    return results
+
+
+def dump(args) -> dict:
+    start = time.time()
+    out = Path(args.dir)
+    out.mkdir(parents=True, exist_ok=True)
+    suffix = ".sql.zst" if args.compression == "zstd" else ".sql.gz"
+    base_dir = Path(args.base) if args.base else None
+    base = json.loads((base_dir / MANIFEST).read_text()) if base_dir else None
+
+    coordinator = connect(args, args.database)
+    with coordinator.cursor() as cursor:
+        cursor.execute(
+            "SELECT table_name, table_type, data_length + index_length FROM information_schema.tables "
+            "WHERE table_schema = %s",
+            (args.database,),
+        )
+        found = cursor.fetchall()
+    sizes = {name: size or 0 for name, _, size in found}
+    tables = sorted((name for name, kind, _ in found if kind == "BASE TABLE"), key=lambda name: -sizes[name])
+    views = [name for name, kind, _ in found if kind == "VIEW"]
+
+    consistent = True
+    lock_start = time.time()
+    try:
+        with coordinator.cursor() as cursor:
+            cursor.execute("FLUSH TABLES WITH READ LOCK")
+    except pymysql.MySQLError:
+        # Without RELOAD, each connection still reads its own consistent snapshot.
+        consistent = False
+    connections = []
+    try:
+        for _ in range(max(1, min(args.jobs, len(tables) or 1))):
+            conn = connect(args, args.database)
+            with conn.cursor() as cursor:
+                cursor.execute("SET SESSION TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+                cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT")
+            connections.append(conn)
+    finally:
+        if consistent:
+            with coordinator.cursor() as cursor:
+                cursor.execute("UNLOCK TABLES")
+    locked_seconds = round(time.time() - lock_start, 3)
+
+    manifest = {
+        "format": FORMAT,
+        "database": args.database,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "consistent": consistent,
+        "compression": args.compression,
+        "base": os.path.relpath(base_dir, out) if base else None,
+        "depth": base["depth"] + 1 if base else 0,
+        "tables": {},
+        "views": {},
+    }
+    with coordinator.cursor() as cursor:
+        for table in tables:
+            cursor.execute(f"SHOW CREATE TABLE {quote(table)}")
+            file_name = f"{len(manifest['tables']):05d}{suffix}"
+            manifest["tables"][table] = {"file": file_name, "schema": cursor.fetchone()[1]}
+        for view in views:
+            cursor.execute(f"SHOW CREATE VIEW {quote(view)}")
+            manifest["views"][view] = cursor.fetchone()[1]
+
+    def work(index: int, table: str) -> dict:
+        conn = connections[index]
+        entry = manifest["tables"][table]
+        if not (args.checksums or base):
+            return dump_table(conn, table, out / entry["file"], args.compression, args.level)
+        checksum = table_checksum(conn, table)
+        previous = base["tables"].get(table) if base else None
+        if (
+            previous is not None
+            and checksum is not None
+            and previous.get("checksum") == checksum
+            and previous["schema"] == entry["schema"]
+            and table_path(base_dir, previous).exists()
+        ):
+            source = os.path.relpath(table_path(base_dir, previous).parent, out)
+            return {**previous, "from": source, "checksum": checksum, "reused": True}
+        return {**dump_table(conn, table, out / entry["file"], args.compression, args.level), "checksum": checksum}
+
+    try:
+        results = run_jobs(len(connections), tables, work)
+    finally:
+        for conn in connections:
+            conn.close()
+        coordinator.close()
+
+    for table, result in results.items():
+        if result.pop("reused", False):
+            manifest["tables"][table] = result
+        else:
+            manifest["tables"][table].update(result)
+    (out / MANIFEST).write_text(json.dumps(manifest, indent=1))
+    dumped = [e for e in manifest["tables"].values() if "from" not in e]
+    return {
+        "ok": True,
+        "tables": len(tables),
+        "dumped": len(dumped),
+        "rows": sum(e["rows"] for e in dumped),
+        "bytes": sum(e["bytes"] for e in dumped),
+        "reused_bytes": sum(e["bytes"] for e in manifest["tables"].values() if "from" in e),
+        "depth": manifest["depth"],
+        "consistent": consistent,
+        "lock_seconds": locked_seconds,
+        "seconds": round(time.time() - start, 3),
+    }
+
+
+def restore_table(conn, table: str, entry: dict, path: Path) -> dict:
+    start = time.time()
+    create, indexes = split_indexes(entry["schema"])
+    with conn.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {quote(table)}")
+        cursor.execute(create)
+        with open_reader(path) as f:
+            for line in f:
+                if line.strip():
+                    cursor.execute(line.decode())
+        loaded = time.time()
+        if indexes:
+            cursor.execute(f"ALTER TABLE {quote(table)} " + ", ".join(f"ADD {index}" for index in indexes))
+    return {"load_seconds": round(loaded - start, 3), "index_seconds": round(time.time() - loaded, 3)}
+
+
+def restore(args) -> dict:
+    start = time.time()
+    src = Path(args.dir)
+    manifest = json.loads((src / MANIFEST).read_text())
+    if manifest.get("format") != FORMAT:
+        raise RuntimeError(f"{src / MANIFEST} is not an {FORMAT} manifest")
+    tables = sorted(manifest["tables"], key=lambda t: -manifest["tables"][t].get("bytes", 0))
+    missing = [str(path) for path in (table_path(src, manifest["tables"][t]) for t in tables) if not path.exists()]
+    if missing:
+        raise RuntimeError(f"Backup chain is incomplete, missing: {', '.join(missing[:5])}")
+
+    connections = []
+    for _ in range(max(1, min(args.jobs, len(tables) or 1))):
+        conn = connect(args, args.database, autocommit=True)
+        with conn.cursor() as cursor:
+            cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+        connections.append(conn)
+
+    def work(index: int, table: str) -> dict:
+        entry = manifest["tables"][table]
+        return restore_table(connections[index], table, entry, table_path(src, entry))
+
+    try:
+        results = run_jobs(len(connections), tables, work)
+        with connections[0].cursor() as cursor:
+            for view, create in manifest["views"].items():
+                cursor.execute(f"DROP VIEW IF EXISTS {quote(view)}")
+                cursor.execute(create)
+    finally:
+        for conn in connections:
+            conn.close()
+
+    return {
+        "ok": True,
+        "tables": len(tables),
+        "rows": sum(manifest["tables"][t].get("rows", 0) for t in tables),
+        "load_seconds": round(sum(r["load_seconds"] for r in results.values()), 3),
+        "index_seconds": round(sum(r["index_seconds"] for r in results.values()), 3),
+        "seconds": round(time.time() - start, 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("mode", choices=["dump", "restore"])
+    parser.add_argument("--host", required=True)
+    parser.add_argument("--port", type=int, default=3306)
+    parser.add_argument("--user", required=True)
+    parser.add_argument("--database", required=True)
+    parser.add_argument("--dir", required=True, help="Backup directory written by dump, read by restore")
+    parser.add_argument("--jobs", type=int, default=4)
+    parser.add_argument("--compression", choices=["gzip", "zstd"], default="gzip")
+    parser.add_argument("--level", type=int, default=6)
+    parser.add_argument("--base", help="Earlier backup directory to dump incrementally against")
+    parser.add_argument("--checksums", action="store_true", help="Record table checksums for later incrementals")
+    args = parser.parse_args()
+
+    try:
+        report = dump(args) if args.mode == "dump" else restore(args)
+    except Exception as e:
+        report = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    print(json.dumps(report))
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional
+
+from fmd.logger import get_logger
+from fmd.tracing import get_tracer
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+SKIPPED = "skipped"
+
+
+class PipelineCancelled(Exception):
+    pass
+
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable[[], Any]
+    deps: tuple[str, ...] = ()
+    # Share of the pipeline's concurrency budget the stage holds while running.
+    weight: int = 1
+
+    status: str = field(default=PENDING, init=False)
+    activity: str = field(default="", init=False)
+    started: Optional[float] = field(default=None, init=False)
+    finished: Optional[float] = field(default=None, init=False)
+    error: Optional[BaseException] = field(default=None, init=False)
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+
+class PipelineOutputHandler:
+    """Printer wrapper that lets pipeline stages print from worker threads.
+
+    Calls from the main thread go straight to the wrapped printer. Calls from a stage
+    are serialized and prefixed with the stage name; ``change_head`` becomes the stage's
+    activity in the pipeline status line, and ``live_lines`` streams are logged with only
+    the tail kept, since only one live display can be active at a time.
+    """
+
+    def __init__(self, delegate, tail_lines: int = 20):
+        self.delegate = delegate
+        self.tail_lines = tail_lines
+        self._lock = threading.RLock()
+        self._local = threading.local()
+
+    @property
+    def _stage(self) -> Optional[Stage]:
+        return getattr(self._local, "stage", None)
+
+    @contextmanager
+    def stage(self, stage: Stage) -> Iterator[None]:
+        self._local.stage = stage
+        self._local.tail = deque(maxlen=self.tail_lines)
+        try:
+            yield
+        finally:
+            self._local.stage = None
+
+    def tail(self) -> list[str]:
+        return list(getattr(self._local, "tail", []))
+
+    @contextmanager
+    def attached(self, holders: list) -> Iterator["PipelineOutputHandler"]:
+        """Point ``holder.printer`` of every holder at this handler for the duration."""
+        previous = [(holder, holder.printer) for holder in holders]
+        for holder in holders:
+            holder.printer = self
+        try:
+            yield self
+        finally:
+            for holder, printer in previous:
+                holder.printer = printer
+
+    def _emit(self, method: str, message: str, **kwargs) -> None:
+        stage = self._stage
+        with self._lock:
+            if stage is None:
+                getattr(self.delegate, method)(message, **kwargs)
+            else:
+                getattr(self.delegate, method)(f"[{stage.name}] {message}", **kwargs)
+
+    def print(self, message: str, **kwargs) -> None:
+        self._emit("print", message, **kwargs)
+
+    def warning(self, message: str, **kwargs) -> None:
+        self._emit("warning", message, **kwargs)
+
+    def error(self, message: str, **kwargs) -> None:
+        self._emit("error", message, **kwargs)
+
+    def change_head(self, text: str) -> None:
+        stage = self._stage
+        if stage is None:
+            with self._lock:
+                self.delegate.change_head(text)
+            return
+        stage.activity = text
+        get_logger().info(f"[{stage.name}] {text}")
+
+    def live_lines(self, data, **kwargs) -> None:
+        stage = self._stage
+        if stage is None:
+            with self._lock:
+                self.delegate.live_lines(data, **kwargs)
+            return
+        for source, line in data:
+            if isinstance(line, bytes):
+                line = line.decode(errors="replace")
+            line = line.rstrip()
+            if line:
+                self._local.tail.append(line)
+                get_logger().info(f"[{stage.name}] [{source}] {line}")
+
+    def start(self, text: str) -> None:
+        if self._stage is None:
+            self.delegate.start(text)
+
+    def stop(self) -> None:
+        if self._stage is None:
+            self.delegate.stop()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.delegate, name)
+
+
+class Pipeline:
+    """Runs stages as soon as their dependencies finish, within a concurrency budget.
+
+    The first failing stage cancels the pipeline: stages not yet started are skipped,
+    ``on_cancel`` is called so in-flight work can be interrupted (e.g. by stopping the
+    build container), and the failure is re-raised once running stages have returned.
+    """
+
+    def __init__(
+        self,
+        stages: list[Stage],
+        printer,
+        budget: int = 4,
+        on_cancel: Optional[Callable[[], None]] = None,
+        status_interval: float = 0.5,
+    ) -> None:
+        self.stages = {stage.name: stage for stage in stages}
+        self.order = [stage.name for stage in stages]
+        self.printer = PipelineOutputHandler(printer)
+        self.budget = max(budget, 1)
+        self.on_cancel = on_cancel
+        self.status_interval = status_interval
+        self.cancelled = threading.Event()
+        self._validate()
+
+    def _validate(self) -> None:
+        for stage in self.stages.values():
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+        visiting, visited = set(), set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage dependency cycle through '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.order:
+            visit(name)
+
+    def _ready(self) -> list[Stage]:
+        ready = []
+        for name in self.order:
+            stage = self.stages[name]
+            if stage.status == PENDING and all(self.stages[dep].status == DONE for dep in stage.deps):
+                ready.append(stage)
+        return ready
+
+    def _run_stage(self, stage: Stage, output: PipelineOutputHandler) -> None:
+        with output.stage(stage), get_tracer().span(stage.name, category="stage", weight=stage.weight):
+            if self.cancelled.is_set():
+                raise PipelineCancelled()
+            try:
+                stage.func()
+            except Exception:
+                tail = output.tail()
+                if tail and not self.cancelled.is_set():
+                    get_logger().error(f"[{stage.name}] last output:\n" + "\n".join(tail))
+                    output.print("last output:\n" + "\n".join(tail[-5:]))
+                raise
+
+    def status_line(self) -> str:
+        done = sum(1 for s in self.stages.values() if s.status == DONE)
+        running = [s for s in self.stages.values() if s.status == RUNNING]
+        parts = []
+        for stage in running:
+            detail = f": {stage.activity}" if stage.activity else ""
+            parts.append(f"{stage.name} {stage.elapsed:.0f}s{detail}")
+        return f"[{done}/{len(self.stages)}] " + (" | ".join(parts) if parts else "scheduling")
+
+    def run(self, holders: Optional[list] = None) -> None:
+        output = self.printer
+        start = time.time()
+        futures: dict[Future, Stage] = {}
+        failure: Optional[BaseException] = None
+        used = 0
+
+        with output.attached(holders or []), ThreadPoolExecutor(max_workers=self.budget) as executor:
+            while True:
+                if failure is None:
+                    for stage in self._ready():
+                        # A stage heavier than the whole budget still runs, alone.
+                        if used and used + stage.weight > self.budget:
+                            break
+                        stage.status = RUNNING
+                        stage.started = time.time()
+                        used += stage.weight
+                        # Each stage runs in a copy of the caller's context so its spans nest under it.
+                        context = contextvars.copy_context()
+                        futures[executor.submit(context.run, self._run_stage, stage, output)] = stage
+
+                if not futures:
+                    break
+
+                finished, _ = wait(futures, timeout=self.status_interval, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = futures.pop(future)
+                    stage.finished = time.time()
+                    used -= stage.weight
+                    error = future.exception()
+                    if error is None:
+                        stage.status = DONE
+                        self.printer.print(f"Stage {stage.name} done in {stage.elapsed:.2f}s")
+                    elif failure is not None or isinstance(error, PipelineCancelled):
+                        stage.status = CANCELLED
+                    else:
+                        stage.status = FAILED
+                        stage.error = error
+                        failure = error
+                        self.printer.error(f"Stage {stage.name} failed: {error}")
+                        self._cancel(futures)
+
+                self.printer.change_head(self.status_line())
+
+        for stage in self.stages.values():
+            if stage.status == PENDING:
+                stage.status = SKIPPED
+
+        self.printer.print(self.summary(time.time() - start))
+        if failure is not None:
+            raise failure
+
+    def _cancel(self, in_flight: dict[Future, Stage]) -> None:
+        self.cancelled.set()
+        for future in list(in_flight):
+            if future.cancel():
+                stage = in_flight.pop(future)
+                stage.status = CANCELLED
+        if in_flight:
+            self.printer.change_head(f"Cancelling {', '.join(s.name for s in in_flight.values())}")
+        if self.on_cancel is not None:
+            try:
+                self.on_cancel()
+            except Exception as e:
+                get_logger().warning(f"PIPELINE: cancel hook failed: {e}")
+
+    def summary(self, wall_time: float) -> str:
+        serial = sum(s.elapsed for s in self.stages.values())
+        lines = [f"Pipeline: {wall_time:.2f}s wall, {serial:.2f}s of stage time"]
+        for name in self.order:
+            stage = self.stages[name]
+            lines.append(f"  {stage.status:<9} {name:<20} {stage.elapsed:7.2f}s")
+        return "\n".join(lines)
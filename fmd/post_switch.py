@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import sys
+import time
+import traceback
+from pathlib import Path
+
+import frappe
+
+RESULT_MARKER = "FMD_POST_SWITCH_RESULT "
+
+
+def _cache():
+    return frappe.cache() if callable(frappe.cache) else frappe.cache
+
+
+class Steps:
+    """Runs named steps in order, recording their duration and errors instead of aborting."""
+
+    def __init__(self):
+        self.results = []
+
+    def run(self, name, func, *args, **kwargs):
+        start = time.time()
+        entry = {"name": name, "ok": True}
+        try:
+            value = func(*args, **kwargs)
+            if value is not None:
+                entry["result"] = value
+        except Exception as e:
+            entry["ok"] = False
+            entry["error"] = f"{type(e).__name__}: {e}"
+            entry["traceback"] = traceback.format_exc()
+            frappe.db.rollback()
+        entry["seconds"] = round(time.time() - start, 3)
+        self.results.append(entry)
+        return entry
+
+
+def clear_cache():
+    frappe.clear_cache()
+
+
+def clear_website_cache():
+    from frappe.website.utils import clear_website_cache as _clear_website_cache
+
+    _clear_website_cache()
+
+
+def clear_assets_json():
+    # get_assets_json caches under the raw, unprefixed key.
+    _cache().delete_value("assets_json", make_keys=False)
+
+
+def warm_assets_json():
+    from frappe.utils import get_assets_json
+
+    return len(get_assets_json() or {})
+
+
+def most_edited_doctypes(limit, days=7):
+    """DocTypes with the most Version rows recently, a proxy for what users open most."""
+    if limit <= 0:
+        return []
+    rows = frappe.db.sql(
+        """select ref_doctype, count(*) from `tabVersion`
+        where creation > now() - interval %s day
+        group by ref_doctype order by count(*) desc limit %s""",
+        (days, limit),
+    )
+    return [row[0] for row in rows]
+
+
+def warm_doctype_meta(doctypes):
+    warmed = []
+    for doctype in doctypes:
+        if frappe.db.exists("DocType", doctype):
+            frappe.get_meta(doctype)
+            warmed.append(doctype)
+    return warmed
+
+
+def warm_website_routes():
+    from frappe.website.router import get_pages
+
+    return len(get_pages())
+
+
+def install_app(app):
+    from frappe.installer import install_app as _install_app
+
+    _install_app(app, verbose=False)
+    frappe.db.commit()
+
+
+def warm_up(steps, doctypes, top_doctypes):
+    steps.run("warm_assets_json", warm_assets_json)
+    top = steps.run("most_edited_doctypes", most_edited_doctypes, top_doctypes).get("result", [])
+    steps.run("warm_doctype_meta", warm_doctype_meta, list(dict.fromkeys([*doctypes, *top])))
+    steps.run("warm_website_routes", warm_website_routes)
+
+
+def post_switch(site_name, apps_to_install, skip_cache=False, warm=False, doctypes=(), top_doctypes=0):
+    result = {"site": site_name, "steps": [], "installed": [], "already_installed": []}
+    steps = Steps()
+    start = time.time()
+
+    frappe.init(site=site_name, sites_path=".")
+    frappe.connect()
+    try:
+        if not skip_cache:
+            steps.run("clear_cache", clear_cache)
+            steps.run("clear_website_cache", clear_website_cache)
+            steps.run("clear_assets_json", clear_assets_json)
+
+        installed = steps.run("list_apps", frappe.get_installed_apps).get("result", [])
+        result["installed_apps_before"] = list(installed)
+
+        for app in apps_to_install:
+            if app in installed:
+                result["already_installed"].append(app)
+                continue
+            if steps.run(f"install_app:{app}", install_app, app)["ok"]:
+                result["installed"].append(app)
+
+        result["installed_apps"] = frappe.get_installed_apps()
+
+        if warm:
+            warm_up(steps, doctypes, top_doctypes)
+    finally:
+        frappe.destroy()
+
+    result["steps"] = steps.results
+    result["ok"] = all(step["ok"] for step in steps.results)
+    result["seconds"] = round(time.time() - start, 3)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clear caches and install apps for a site in one frappe process")
+    parser.add_argument("site", help="Frappe site name (e.g. mysite.localhost)")
+    parser.add_argument("--install", nargs="*", default=[], help="App modules to install if missing")
+    parser.add_argument("--skip-cache", action="store_true", help="Don't clear caches")
+    parser.add_argument("--warm", action="store_true", help="Rebuild assets_json, doctype meta and website routes")
+    parser.add_argument("--warm-doctype", action="append", default=[], help="DocType whose meta to warm")
+    parser.add_argument("--warm-top-doctypes", type=int, default=0, help="Also warm the N most edited doctypes")
+    args = parser.parse_args()
+
+    if not (Path(".") / args.site).is_dir():
+        print(f"Error: Site '{args.site}' not found in {Path('.').absolute()}", file=sys.stderr)
+        sys.exit(1)
+
+    result = post_switch(
+        args.site, args.install, args.skip_cache, args.warm, args.warm_doctype, args.warm_top_doctypes
+    )
+    print(RESULT_MARKER + json.dumps(result))
+    sys.exit(0 if result["ok"] else 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Inspect and drain the bench's RQ workers straight from Redis, run from the sites directory.
+
+Reads ``redis_queue`` from common_site_config.json and uses RQ's key layout directly:
+
+``status``   per-queue depth, running jobs and a drain-time estimate from finished jobs
+``suspend``  set RQ's suspension flag: workers finish their current job and take no new ones
+``resume``   clear the suspension flag
+``wait``     block until no worker is busy, polling every ``--poll`` seconds
+
+RQ has no notification for a worker finishing its job, and its suspension flag is global,
+so a worker can't be restarted on its own: ``wait`` re-reads only the still-busy workers'
+state on each poll and records when each one went idle.
+
+Each mode prints one JSON line.
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import redis
+
+SUSPENDED_KEY = "rq:suspended"
+# frappe enqueues every job as execute_job(..., method=...), so the method names the job kind.
+_METHOD = re.compile(r"""['"]?method['"]?\s*[:=]\s*(?:['"]|<function )([\w.]+)""")
+# Finished jobs per queue looked at for the duration history.
+_HISTORY = 200
+
+
+def connect() -> redis.Redis:
+    with open("common_site_config.json") as f:
+        config = json.load(f)
+    url = config.get("redis_queue")
+    if not url:
+        raise SystemExit("redis_queue not set in common_site_config.json")
+    return redis.Redis.from_url(
+        url, username=config.get("rq_username"), password=config.get("rq_password"), decode_responses=True
+    )
+
+
+def parse_time(value):
+    if not value:
+        return None
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S"):
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=timezone.utc).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+def job_kind(job: dict) -> str:
+    description = job.get("description") or ""
+    match = _METHOD.search(description)
+    return match.group(1) if match else description.split("(", 1)[0]
+
+
+def jobs(conn: redis.Redis, ids: list[str]) -> list[dict]:
+    pipe = conn.pipeline()
+    for job_id in ids:
+        pipe.hmget(f"rq:job:{job_id}", "description", "started_at", "ended_at")
+    result = []
+    for job_id, (description, started_at, ended_at) in zip(ids, pipe.execute()):
+        result.append(
+            {"id": job_id, "description": description, "started": parse_time(started_at), "ended": parse_time(ended_at)}
+        )
+    return result
+
+
+def durations(conn: redis.Redis, queues: list[str]) -> dict[str, float]:
+    """Median run time per job kind over the most recently finished jobs."""
+    by_kind: dict[str, list[float]] = {}
+    for queue in queues:
+        ids = conn.zrevrange(f"rq:finished:{queue}", 0, _HISTORY - 1)
+        for job in jobs(conn, ids):
+            if job["started"] and job["ended"]:
+                by_kind.setdefault(job_kind(job), []).append(job["ended"] - job["started"])
+    return {kind: statistics.median(values) for kind, values in by_kind.items()}
+
+
+def busy_workers(conn: redis.Redis) -> list[dict]:
+    busy = []
+    for key in sorted(conn.smembers("rq:workers")):
+        state, current_job, queues = conn.hmget(key, "state", "current_job", "queues")
+        if state == "busy":
+            busy.append({"name": key.rsplit(":", 1)[-1], "job": current_job, "queues": queues})
+    return busy
+
+
+def status(conn: redis.Redis, args) -> dict:
+    now = time.time()
+    queues = sorted(key.split("rq:queue:", 1)[1] for key in conn.smembers("rq:queues"))
+    history = durations(conn, queues)
+    report = {"suspended": bool(conn.exists(SUSPENDED_KEY)), "queues": [], "estimate_seconds": 0.0}
+    for queue in queues:
+        running = []
+        for job in jobs(conn, conn.zrange(f"rq:wip:{queue}", 0, -1)):
+            kind = job_kind(job)
+            elapsed = now - job["started"] if job["started"] else 0.0
+            expected = history.get(kind)
+            remaining = max(0.0, expected - elapsed) if expected is not None else None
+            running.append({"id": job["id"], "kind": kind, "elapsed": round(elapsed, 1), "remaining": remaining})
+            if remaining is not None:
+                report["estimate_seconds"] = max(report["estimate_seconds"], round(remaining, 1))
+        report["queues"].append({"name": queue, "depth": conn.llen(f"rq:queue:{queue}"), "running": running})
+    report["workers"] = len(conn.smembers("rq:workers"))
+    report["busy_workers"] = busy_workers(conn)
+    return report
+
+
+def suspend(conn: redis.Redis, args) -> dict:
+    conn.set(SUSPENDED_KEY, 1)
+    return {"suspended": True}
+
+
+def resume(conn: redis.Redis, args) -> dict:
+    conn.delete(SUSPENDED_KEY)
+    return {"suspended": False}
+
+
+def wait(conn: redis.Redis, args) -> dict:
+    start = time.time()
+    busy = {worker["name"]: worker for worker in busy_workers(conn)}
+    released = []
+    while busy and time.time() - start < args.timeout:
+        time.sleep(args.poll)
+        pipe = conn.pipeline()
+        for name in busy:
+            pipe.hget(f"rq:worker:{name}", "state")
+        for name, state in zip(list(busy), pipe.execute()):
+            if state != "busy":
+                worker = busy.pop(name)
+                released.append({"name": name, "job": worker["job"], "after": round(time.time() - start, 2)})
+    return {
+        "idle": not busy,
+        "waited": round(time.time() - start, 2),
+        "released": released,
+        "busy_workers": list(busy.values()),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("mode", choices=["status", "suspend", "resume", "wait"])
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--poll", type=float, default=0.5)
+    args = parser.parse_args()
+
+    modes = {"status": status, "suspend": suspend, "resume": resume, "wait": wait}
+    print(json.dumps(modes[args.mode](connect(), args)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
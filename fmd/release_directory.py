@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 import json
 import re
+import threading
 from typing import Optional
 
 try:
@@ -20,6 +21,8 @@ from pathlib import Path
 
 from fmd.config.app import AppConfig
 
+_metadata_lock = threading.Lock()
+
 
 @dataclass
 class BenchDirectory:
@@ -57,6 +60,22 @@ class BenchDirectory:
     def nginx_conf(self) -> Path:
         return self.config / "nginx.conf"
 
+    @property
+    def metadata_file(self) -> Path:
+        return self.path / ".fmd-release.json"
+
+    def read_metadata(self) -> dict:
+        try:
+            return json.loads(self.metadata_file.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def update_metadata(self, **data) -> None:
+        with _metadata_lock:
+            metadata = self.read_metadata()
+            metadata.update(data)
+            self.metadata_file.write_text(json.dumps(metadata, indent=2))
+
     def setup_dir(self, create_tmps=False):
         self.sites.mkdir(parents=True, exist_ok=True)
         self.apps.mkdir(parents=True, exist_ok=True)
@@ -75,7 +94,14 @@ class BenchDirectory:
     def clone(**kwargs):
         git.Repo.clone_from(**kwargs)
 
-    def clone_app(self, app: AppConfig, clone_path: Path, move_to_subdir: bool = True) -> Path:
+    def clone_app(
+        self,
+        app: AppConfig,
+        clone_path: Path,
+        move_to_subdir: bool = True,
+        mirror=None,
+        stats: Optional[dict] = None,
+    ) -> Path:
         import shutil
 
         clone_path_tmp = Path(str(clone_path) + "_tmp")
@@ -87,11 +113,24 @@ class BenchDirectory:
 
         depth = 1 if app.shallow_clone else None
 
-        if not app.is_ref_commit:
+        cloned_repo = None
+        if mirror is not None:
+            try:
+                cloned_repo = mirror.clone(app, clone_path_tmp, stats)
+            except Exception as e:
+                from fmd.logger import get_logger
+
+                get_logger().warning(f"Mirror clone failed for {app.repo}, falling back to network clone: {e}")
+                shutil.rmtree(clone_path_tmp, ignore_errors=True)
+                clone_path_tmp.mkdir(parents=True, exist_ok=True)
+                if stats is not None:
+                    stats.clear()
+
+        if cloned_repo is None and not app.is_ref_commit:
             cloned_repo = git.Repo.clone_from(
                 app.repo_url, clone_path_tmp, depth=depth, origin=app.remote_name, branch=app.ref
             )
-        else:
+        elif cloned_repo is None:
             cloned_repo = git.Repo.clone_from(app.repo_url, clone_path_tmp, depth=depth, origin=app.remote_name)
 
             if app.shallow_clone:
@@ -99,6 +138,12 @@ class BenchDirectory:
 
             cloned_repo.git.checkout(app.ref)
 
+        if stats is not None and "source" not in stats:
+            from fmd.helpers import get_dir_size_bytes
+
+            stats["bytes"] = get_dir_size_bytes(clone_path_tmp / ".git")
+            stats["source"] = "network"
+
         move_path = clone_path_tmp
 
         if app.remove_remote:
@@ -1,10 +1,14 @@
 import importlib
 import os
+import shlex
 import sys
 import time
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple, Union
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from fmd.tracing import command_label, get_tracer
 
 _dock = None
 try:
@@ -45,7 +49,40 @@ class CommandRunner(ABC):
         except Exception:
             pass
 
+    @contextmanager
+    def _command_span(self, command: list[str], mode: str) -> Iterator[None]:
+        with get_tracer().span(
+            command_label(command), category="command", command=shlex.join(command), mode=mode
+        ) as span:
+            try:
+                yield
+            except Exception as e:
+                span.set(exit_code=getattr(getattr(e, "output", None), "exit_code", None))
+                raise
+            span.attributes.setdefault("exit_code", 0)
+
+    def _count_stream(self, stream: Iterable) -> Iterable:
+        """Pass a streamed command output through, adding its size and exit code to the command span."""
+        span = get_tracer().current()
+        if span is None:
+            return stream
+        return self._counted(stream, span)
+
+    @staticmethod
+    def _counted(stream: Iterable, span) -> Iterable:
+        for source, line in stream:
+            if source == "exit_code":
+                span.set(exit_code=int(line))
+            else:
+                span.add_output(len(line))
+            yield source, line
+
     def _log_output(self, output) -> None:
+        span = get_tracer().current()
+        if span is not None:
+            lines = getattr(output, "combined", None) or []
+            span.set(exit_code=getattr(output, "exit_code", None))
+            span.add_output(sum(len(line.encode() if isinstance(line, str) else line) + 1 for line in lines))
         try:
             from fmd.logger import get_logger
 
@@ -77,6 +114,14 @@ class CommandRunner(ABC):
     def supports_db_restore(self) -> bool:
         return True
 
+    def piped_command(self, command: list[str], env: dict[str, str]) -> tuple[list[str], dict[str, str]]:
+        """Command line running ``command`` with its stdin/stdout attached, and the environment to start it with.
+
+        ``env`` is passed through the environment rather than argv, so secrets such as
+        ``MYSQL_PWD`` don't show up in ``ps``.
+        """
+        return command, {**os.environ, **env}
+
     @abstractmethod
     def run(
         self,
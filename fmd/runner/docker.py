@@ -1,6 +1,8 @@
 import importlib
 import os
 import shlex
+import tempfile
+import threading
 import time
 from pathlib import Path
 from typing import Iterable, List, Literal, Optional, Tuple, Union
@@ -45,6 +47,9 @@ class DockerRunner(CommandRunner):
         self._run_tag: Optional[str] = None
         self._resolved_image: Optional[str] = None
         self._image_id: Optional[str] = None
+        self._session = None
+        self._image_lock = threading.Lock()
+        self._cancelled = False
 
     def _resolve_image(self) -> str:
         if self.config.release.runner_image:
@@ -98,6 +103,22 @@ class DockerRunner(CommandRunner):
     def backup_path(self, host_backup_dir: Path, file_name: str) -> str:
         return f"/workspace/{'/'.join(host_backup_dir.parts[-2:])}/{file_name}"
 
+    def piped_command(self, command: list[str], env: dict[str, str]) -> tuple[list[str], dict[str, str]]:
+        """``docker compose exec`` of ``command`` in the bench's frappe service, which reaches the
+        database server over the network like ``run`` does.
+
+        Only the names of ``env`` go on the command line; compose takes a bare ``-e NAME``'s
+        value from its own environment.
+        """
+        compose_file = self._compose_project_dir() / "docker-compose.yml"
+        exec_cmd = ["docker", "compose", "-f", str(compose_file), "exec", "-T", "--user", "frappe"]
+        for key in env:
+            exec_cmd += ["-e", key]
+        docker_env = {**os.environ, **env}
+        if self.docker_host:
+            docker_env["DOCKER_HOST"] = self.docker_host
+        return [*exec_cmd, "frappe", *command], docker_env
+
     def restart_services(self, args: List[str], bench_directory) -> None:
         self.run(
             ["fmx", "restart"] + args,
@@ -118,16 +139,26 @@ class DockerRunner(CommandRunner):
         env: Optional[dict[str, str]] = None,
         tag_streams: bool = False,
     ) -> Union[Iterable[Tuple[str, bytes]], SubprocessOutput, None]:
+        if self._cancelled:
+            raise RuntimeError(f"Cancelled before running: {shlex.join(command)}")
+
         start_time = time.time()
 
         self._log_command(command, mode=self.mode)
 
-        if self.mode == "image":
-            result = self._run_in_image(command, bench_directory, capture_output, live_lines, workdir, env, tag_streams)
-        else:
-            result = self._run_in_exec(command, bench_directory, capture_output, live_lines, workdir, env, tag_streams)
+        with self._command_span(command, self.mode):
+            if self.mode == "image":
+                result = self._run_in_image(
+                    command, bench_directory, capture_output, live_lines, workdir, env, tag_streams
+                )
+            else:
+                result = self._run_in_exec(
+                    command, bench_directory, capture_output, live_lines, workdir, env, tag_streams
+                )
 
         self._log_timing(start_time, command, mode=self.mode)
+        if self._session is not None and self.mode == "image":
+            self._session.record(time.time() - start_time)
         return result
 
     @staticmethod
@@ -143,6 +174,21 @@ class DockerRunner(CommandRunner):
             yield source, line
 
     def _run_in_image(self, command, bench_directory, capture_output, live_lines, workdir, env, tag_streams=False):
+        bench_mount = "/workspace/frappe-bench"
+        image = self._resolve_image()
+
+        with self._image_lock:
+            if self._run_tag is None and self._resolved_image is None:
+                from fmd.runner.image_lifecycle import tag_image_for_run
+
+                self._resolved_image = image
+                self._run_tag, self._image_id = tag_image_for_run(image)
+
+        if self.config.release.image_session:
+            return self._run_in_session(
+                image, command, bench_directory, capture_output, live_lines, workdir, env, tag_streams
+            )
+
         _DockerClient = None
         try:
             _dc = importlib.import_module("frappe_manager.docker.docker_client")
@@ -153,7 +199,6 @@ class DockerRunner(CommandRunner):
         if _DockerClient is None:
             raise RuntimeError("frappe_manager.docker.docker_client.DockerClient unavailable")
 
-        bench_mount = "/workspace/frappe-bench"
         docker_command = shlex.join(command)
 
         # Remap frappe uid/gid to match the host runner so the bind-mount is
@@ -172,48 +217,14 @@ class DockerRunner(CommandRunner):
         bash_command = ["-c", bash_script]
 
         effective_workdir = workdir or bench_mount
-        image = self._resolve_image()
-        volumes = [f"{bench_directory.path.absolute()}:{bench_mount}"]
-
-        if self._run_tag is None and self._resolved_image is None:
-            from fmd.runner.image_lifecycle import tag_image_for_run
-
-            self._resolved_image = image
-            self._run_tag, self._image_id = tag_image_for_run(image)
+        volumes = [f"{bench_directory.path.absolute()}:{bench_mount}", *self._runtime_store_volumes(bench_directory)]
 
         output = _DockerClient().run(
             image=image,
             user="root",
             command=shlex.join(bash_command),
             workdir=effective_workdir,
-            env={
-                "HOME": bench_mount,
-                "USER": "frappe",
-                "GROUP": "frappe",
-                "PATH": f"{bench_mount}/.uv/python-default/bin:{bench_mount}/.fnm/aliases/default/bin:/usr/local/bin:/opt/user/.bin:/usr/local/sbin:/usr/sbin:/usr/bin:/sbin:/bin",
-                "FNM_DIR": f"{bench_mount}/.fnm",
-                "FNM_NODE_DIST_MIRROR": "https://nodejs.org/dist",
-                "FNM_MULTISHELL_PATH": f"{bench_mount}/.fnm",
-                "FNM_COREPACK_ENABLED": "true",
-                "COREPACK_HOME": f"{bench_mount}/.fnm/corepack",
-                "COREPACK_ENABLE_DOWNLOAD_PROMPT": "0",
-                "UV_PYTHON_INSTALL_DIR": f"{bench_mount}/.uv/python",
-                "UV_CACHE_DIR": f"{bench_mount}/.uv/cache",
-                "UV_PYTHON_DOWNLOADS": "automatic",
-                "UV_PYTHON_PREFERENCE": "only-managed",
-                "BENCH_USE_UV": "true",
-                "PYTHONUNBUFFERED": "1",
-                "LC_ALL": "en_US.UTF-8",
-                "LANG": "en_US.UTF-8",
-                "LANGUAGE": "en_US.UTF-8",
-                **{
-                    k: os.environ[k]
-                    for k in ("DOCKER_HOST", "GITHUB_TOKEN", "GIT_TOKEN", "UV_LINK_MODE", "DOCKER_DEFAULT_PLATFORM")
-                    if k in os.environ
-                },
-                **(env or {}),
-                **({"DOCKER_HOST": self.docker_host} if self.docker_host else {}),
-            },
+            env=self._image_env(env),
             entrypoint="/bin/bash",
             platform=self.platform or None,
             pull="missing",
@@ -226,10 +237,152 @@ class DockerRunner(CommandRunner):
             self._log_output(output)
             return output
 
+        output = self._count_stream(output)
+        stream = self._tag_stderr_stream(output) if tag_streams else output
+        self.printer.live_lines(stream, lines=live_lines)
+        return None
+
+    def _image_env(self, env: Optional[dict[str, str]] = None) -> dict[str, str]:
+        bench_mount = "/workspace/frappe-bench"
+        return {
+            "HOME": bench_mount,
+            "USER": "frappe",
+            "GROUP": "frappe",
+            "PATH": f"{bench_mount}/.uv/python-default/bin:{bench_mount}/.fnm/aliases/default/bin:/usr/local/bin:/opt/user/.bin:/usr/local/sbin:/usr/sbin:/usr/bin:/sbin:/bin",
+            "FNM_DIR": f"{bench_mount}/.fnm",
+            "FNM_NODE_DIST_MIRROR": "https://nodejs.org/dist",
+            "FNM_MULTISHELL_PATH": f"{bench_mount}/.fnm",
+            "FNM_COREPACK_ENABLED": "true",
+            "COREPACK_HOME": f"{bench_mount}/.fnm/corepack",
+            "COREPACK_ENABLE_DOWNLOAD_PROMPT": "0",
+            "UV_PYTHON_INSTALL_DIR": f"{bench_mount}/.uv/python",
+            "UV_CACHE_DIR": f"{bench_mount}/.uv/cache",
+            "UV_PYTHON_DOWNLOADS": "automatic",
+            "UV_PYTHON_PREFERENCE": "only-managed",
+            "BENCH_USE_UV": "true",
+            "PYTHONUNBUFFERED": "1",
+            "LC_ALL": "en_US.UTF-8",
+            "LANG": "en_US.UTF-8",
+            "LANGUAGE": "en_US.UTF-8",
+            **{
+                k: os.environ[k]
+                for k in ("DOCKER_HOST", "GITHUB_TOKEN", "GIT_TOKEN", "UV_LINK_MODE", "DOCKER_DEFAULT_PLATFORM")
+                if k in os.environ
+            },
+            **(env or {}),
+            **({"DOCKER_HOST": self.docker_host} if self.docker_host else {}),
+        }
+
+    @staticmethod
+    def _runtime_store_volumes(bench_directory) -> list[str]:
+        from fmd.runtime_store import CONTAINER_STORE_PATH, RuntimeStore
+
+        store = RuntimeStore.for_release(bench_directory.path.absolute())
+        if not store.root.is_dir():
+            return []
+        return [f"{store.root}:{CONTAINER_STORE_PATH}"]
+
+    def _ensure_session(self, image: str, bench_directory):
+        from fmd.runner.image_session import ImageSession
+
+        bench_host_path = bench_directory.path.absolute()
+        with self._image_lock:
+            if self._session is not None and self._session.bench_path != bench_host_path:
+                self.stop_session()
+
+            if self._session is None:
+                session = ImageSession(
+                    image=image,
+                    bench_path=bench_host_path,
+                    env=self._image_env(),
+                    platform=self.platform,
+                    docker_host=self.docker_host,
+                    extra_volumes=self._runtime_store_volumes(bench_directory),
+                )
+                self.printer.change_head("Starting build session container")
+                session.start()
+                self._session = session
+            return self._session
+
+    def _run_in_session(self, image, command, bench_directory, capture_output, live_lines, workdir, env, tag_streams):
+        session = self._ensure_session(image, bench_directory)
+        exec_cmd = session.exec_command(command, workdir, env)
+
+        output = _run_cmd(
+            exec_cmd,
+            stream=not capture_output,
+            capture_output=capture_output,
+            env=session.docker_env(),
+        )
+
+        if capture_output:
+            self._log_output(output)
+            return output
+
+        output = self._count_stream(output)
         stream = self._tag_stderr_stream(output) if tag_streams else output
         self.printer.live_lines(stream, lines=live_lines)
         return None
 
+    def run_isolated(
+        self,
+        command: list[str],
+        bench_directory,
+        network: Optional[str] = None,
+        env: Optional[dict[str, str]] = None,
+    ) -> SubprocessOutput:
+        """Run ``command`` in a fresh ``--rm`` container of the runner image, as the host user.
+
+        Unlike image mode it doesn't remap the frappe user or chown the bench mount, so the
+        release is left exactly as built; ``network`` is passed to ``docker run --network``.
+        """
+        bench_mount = "/workspace/frappe-bench"
+        image = self._resolve_image()
+        volumes = [f"{bench_directory.path.absolute()}:{bench_mount}", *self._runtime_store_volumes(bench_directory)]
+
+        docker_cmd = ["docker", "run", "--rm", "--user", f"{os.getuid()}:{os.getgid()}", "--entrypoint", "/bin/bash"]
+        docker_cmd += ["-w", bench_mount, "--pull", "missing"]
+        if network:
+            docker_cmd += ["--network", network]
+        if self.platform:
+            docker_cmd += ["--platform", self.platform]
+        for volume in volumes:
+            docker_cmd += ["-v", volume]
+
+        start_time = time.time()
+        self._log_command(command, mode="isolated")
+        docker_env = os.environ.copy()
+        if self.docker_host:
+            docker_env["DOCKER_HOST"] = self.docker_host
+        # Through a private file rather than -e, so tokens stay out of argv and the debug log.
+        with tempfile.NamedTemporaryFile("w", prefix="fmd-isolated-", suffix=".env") as env_file:
+            env_file.write("".join(f"{key}={value}\n" for key, value in self._image_env(env).items()))
+            env_file.flush()
+            docker_cmd += ["--env-file", env_file.name, image, "-c", f"source /etc/bash.bashrc; {shlex.join(command)}"]
+            with self._command_span(command, "isolated"):
+                output = _run_cmd(docker_cmd, stream=False, capture_output=True, env=docker_env)
+                self._log_output(output)
+        self._log_timing(start_time, command, mode="isolated")
+        return output
+
+    def cancel(self) -> None:
+        """Refuse further commands and kill the in-flight ones by removing the build session container."""
+        with self._image_lock:
+            self._cancelled = True
+            session, self._session = self._session, None
+        if session is not None:
+            session.stop()
+
+    def stop_session(self) -> None:
+        self._cancelled = False
+        if self._session is None:
+            return
+        session = self._session
+        self._session = None
+        if session.commands:
+            self.printer.print(session.summary())
+        session.stop()
+
     def _run_in_exec(self, command, bench_directory, capture_output, live_lines, workdir, env, tag_streams=False):
         from frappe_manager.docker.docker_compose import DockerComposeWrapper
 
@@ -278,11 +431,13 @@ class DockerRunner(CommandRunner):
             self._log_output(output)
             return output
 
+        output = self._count_stream(output)
         stream = self._tag_stderr_stream(output) if tag_streams else output
         self.printer.live_lines(stream, lines=live_lines)
         return None
 
     def cleanup_image(self) -> None:
+        self.stop_session()
         if self._run_tag and self._resolved_image and self._image_id:
             from fmd.runner.image_lifecycle import cleanup_run_tag
 
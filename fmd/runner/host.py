@@ -66,15 +66,16 @@ class HostRunner(CommandRunner):
         if env:
             base_env.update(env)
 
-        output = _run_cmd(
-            command,
-            stream=False,
-            capture_output=True,
-            cwd=cwd,
-            env=base_env,
-        )
-
-        self._log_output(output)
+        with self._command_span(command, "host"):
+            output = _run_cmd(
+                command,
+                stream=False,
+                capture_output=True,
+                cwd=cwd,
+                env=base_env,
+            )
+            self._log_output(output)
+
         self._log_timing(start_time, command, mode="host")
         return output
 
@@ -96,26 +97,24 @@ class HostRunner(CommandRunner):
         if env:
             base_env.update(env)
 
-        output = _run_cmd(
-            command,
-            stream=not capture_output,
-            capture_output=capture_output,
-            cwd=workdir or str(bench_directory.path.absolute()),
-            env=base_env,
-        )
-
-        if capture_output:
-            self._log_output(output)
-            self._log_timing(start_time, command, mode="host")
-            return output
-
-        if not is_ci() and is_tty():
-            self.printer.live_lines(output, lines=live_lines)
-        else:
-            for source, line in output:
-                if isinstance(line, bytes):
-                    line = line.decode(errors="replace")
-                self.printer.print(line.rstrip(), emoji_code="")
+        with self._command_span(command, "host"):
+            output = _run_cmd(
+                command,
+                stream=not capture_output,
+                capture_output=capture_output,
+                cwd=workdir or str(bench_directory.path.absolute()),
+                env=base_env,
+            )
+
+            if capture_output:
+                self._log_output(output)
+            elif not is_ci() and is_tty():
+                self.printer.live_lines(self._count_stream(output), lines=live_lines)
+            else:
+                for source, line in self._count_stream(output):
+                    if isinstance(line, bytes):
+                        line = line.decode(errors="replace")
+                    self.printer.print(line.rstrip(), emoji_code="")
 
         self._log_timing(start_time, command, mode="host")
-        return None
+        return output if capture_output else None
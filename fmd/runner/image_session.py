@@ -0,0 +1,152 @@
+import atexit
+import os
+import shlex
+import subprocess
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from fmd.logger import get_logger
+
+BENCH_MOUNT = "/workspace/frappe-bench"
+
+
+class ImageSession:
+    """One long-lived build container per release, commands run through `docker exec`.
+
+    The uid/gid remap and the recursive chown of the bench mount happen once in
+    `start()` instead of on every `docker run --rm`.
+    """
+
+    def __init__(
+        self,
+        image: str,
+        bench_path: Path,
+        env: dict[str, str],
+        platform: Optional[str] = None,
+        docker_host: Optional[str] = None,
+        extra_volumes: Optional[list[str]] = None,
+    ) -> None:
+        self.image = image
+        self.bench_path = bench_path
+        self.env = env
+        self.platform = platform
+        self.docker_host = docker_host
+        self.extra_volumes = extra_volumes or []
+        self.container_name = f"fmd-build-{uuid.uuid4().hex[:10]}"
+        self.started = False
+
+        self.startup_seconds = 0.0
+        self.ownership_seconds = 0.0
+        self.exec_overhead_seconds = 0.0
+        self.commands = 0
+        self.command_seconds = 0.0
+
+    def docker_env(self) -> dict[str, str]:
+        docker_env = os.environ.copy()
+        if self.docker_host:
+            docker_env["DOCKER_HOST"] = self.docker_host
+        return docker_env
+
+    def _docker(self, args: list[str], timeout: Optional[int] = None) -> subprocess.CompletedProcess:
+        cmd = ["docker"] + args
+        get_logger().debug(f"COMMAND [session]: {shlex.join(cmd)}")
+        return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, env=self.docker_env())
+
+    def start(self) -> None:
+        run_args = [
+            "run",
+            "-d",
+            "--rm",
+            "--name",
+            self.container_name,
+            "--label",
+            "fmd.session=1",
+            "--user",
+            "root",
+            "--entrypoint",
+            "/bin/bash",
+            "--pull",
+            "missing",
+            "-w",
+            BENCH_MOUNT,
+            "-v",
+            f"{self.bench_path}:{BENCH_MOUNT}",
+        ]
+        for volume in self.extra_volumes:
+            run_args += ["-v", volume]
+        if self.platform:
+            run_args += ["--platform", self.platform]
+
+        # Through a private file rather than -e, so tokens stay out of argv and the debug log.
+        with tempfile.NamedTemporaryFile("w", prefix="fmd-session-", suffix=".env") as env_file:
+            env_file.write("".join(f"{key}={value}\n" for key, value in self.env.items()))
+            env_file.flush()
+            run_args += ["--env-file", env_file.name, self.image, "-c", "exec sleep infinity"]
+
+            start = time.time()
+            result = self._docker(run_args)
+        if result.returncode != 0:
+            raise RuntimeError(f"Failed to start build session container: {result.stderr.strip()}")
+        self.startup_seconds = time.time() - start
+        self.started = True
+        atexit.register(self.stop)
+
+        host_uid = os.getuid()
+        host_gid = os.getgid()
+        fix_ownership = (
+            f"usermod -u {host_uid} frappe 2>/dev/null; "
+            f"groupmod -g {host_gid} frappe 2>/dev/null; "
+            f"chown -R frappe:frappe {BENCH_MOUNT} 2>/dev/null; true"
+        )
+        start = time.time()
+        self._docker(["exec", "-u", "root", self.container_name, "/bin/bash", "-c", fix_ownership])
+        self.ownership_seconds = time.time() - start
+
+        start = time.time()
+        self._docker(["exec", "-u", "frappe", self.container_name, "true"], timeout=30)
+        self.exec_overhead_seconds = time.time() - start
+
+        get_logger().debug(
+            f"SESSION: started {self.container_name} for {self.bench_path} "
+            f"(startup {self.startup_seconds:.2f}s, chown {self.ownership_seconds:.2f}s, "
+            f"exec overhead {self.exec_overhead_seconds:.3f}s)"
+        )
+
+    def exec_command(self, command: list[str], workdir: Optional[str], env: Optional[dict[str, str]]) -> list[str]:
+        inner_cmd = f"source /etc/bash.bashrc; {shlex.join(command)}"
+        cmd = ["docker", "exec", "-u", "frappe", "-w", workdir or BENCH_MOUNT]
+        for key, value in (env or {}).items():
+            cmd += ["-e", f"{key}={value}"]
+        cmd += [self.container_name, "/bin/bash", "-c", inner_cmd]
+        return cmd
+
+    def record(self, elapsed: float) -> None:
+        self.commands += 1
+        self.command_seconds += elapsed
+
+    def summary(self) -> str:
+        fresh_overhead = self.startup_seconds + self.ownership_seconds
+        setup = fresh_overhead + self.exec_overhead_seconds
+        saved = max(self.commands * fresh_overhead - setup - self.commands * self.exec_overhead_seconds, 0.0)
+        return (
+            f"Build session: {self.commands} commands in {self.command_seconds:.2f}s, "
+            f"one-time setup {setup:.2f}s, per-command overhead {self.exec_overhead_seconds:.3f}s "
+            f"(vs ~{fresh_overhead:.2f}s per fresh container), ~{saved:.2f}s saved"
+        )
+
+    def stop(self) -> None:
+        if not self.started:
+            return
+        self.started = False
+        try:
+            atexit.unregister(self.stop)
+        except Exception:
+            pass
+        try:
+            self._docker(["rm", "-f", self.container_name], timeout=60)
+            get_logger().debug(f"SESSION: removed {self.container_name}")
+        except Exception as e:
+            get_logger().warning(f"Failed to remove build session container {self.container_name}: {e}")
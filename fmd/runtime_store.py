@@ -0,0 +1,233 @@
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Optional
+
+from fmd.consts import RUNTIME_STORE_DIR_NAME
+from fmd.helpers import file_lock
+from fmd.logger import get_logger
+
+# Release-relative directories holding one immutable subdirectory per runtime version.
+VERSIONED_RUNTIMES = ((".uv/python", "python"), (".fnm/node-versions", "node"))
+# Release-relative directories shared as a whole by every release.
+SHARED_RUNTIMES = ((".uv/cache", "uv-cache"), (".fnm/corepack", "corepack"))
+RUNTIME_ROOTS = (".uv", ".fnm")
+REFS_INDEX = "refs.json"
+
+# Mount point of the store inside build containers; relative links from a release
+# mounted at /workspace/frappe-bench resolve to it.
+CONTAINER_STORE_PATH = f"/workspace/{RUNTIME_STORE_DIR_NAME}"
+
+
+def open_permissions(path: Path) -> None:
+    for p in [path, *path.rglob("*")]:
+        try:
+            if not p.is_symlink():
+                p.chmod(0o777)
+        except OSError:
+            pass
+
+
+class RuntimeStore:
+    """Python interpreters and Node versions shared by all releases next to the store.
+
+    Each version is stored once under ``<kind>/<version dir name>`` and releases reference
+    it through relative symlinks from ``.uv/python/*`` and ``.fnm/node-versions/*``, so the
+    links resolve on the host and inside containers that mount the workspace. Permissions
+    are opened once when a version enters the store. Versions no retained release links
+    to are removed by ``gc``.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    @classmethod
+    def for_release(cls, release_path: Path) -> "RuntimeStore":
+        return cls(release_path.parent / RUNTIME_STORE_DIR_NAME)
+
+    def _lock(self):
+        return file_lock(self.root / ".lock")
+
+    @staticmethod
+    def _link(link: Path, target: Path) -> None:
+        if link.is_symlink():
+            link.unlink()
+        link.parent.mkdir(parents=True, exist_ok=True)
+        link.symlink_to(os.path.relpath(target, link.parent), target_is_directory=True)
+
+    def _ingest(self, kind: str, path: Path, move: bool) -> Optional[Path]:
+        entry = self.root / kind / path.name
+        if entry.exists():
+            return entry
+
+        real = path.resolve()
+        if not real.is_dir():
+            return None
+
+        tmp = entry.with_name(f".{path.name}.tmp-{os.getpid()}")
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        tmp.parent.mkdir(parents=True, exist_ok=True)
+        start = time.time()
+        if move:
+            shutil.move(str(real), str(tmp))
+        else:
+            shutil.copytree(real, tmp, symlinks=True)
+        open_permissions(tmp)
+        tmp.rename(entry)
+        get_logger().debug(f"RUNTIMES: stored {kind}/{path.name} in {time.time() - start:.2f}s")
+        return entry
+
+    def seed(self, release_path: Path, source_path: Optional[Path]) -> list[str]:
+        """Link every runtime version ``source_path`` has into ``release_path``.
+
+        Versions the store doesn't have yet are copied in once. Returns the
+        ``kind/version`` entries linked.
+        """
+        linked = []
+        handled = {rel for rel, _ in VERSIONED_RUNTIMES + SHARED_RUNTIMES}
+
+        with self._lock():
+            for root in RUNTIME_ROOTS:
+                (release_path / root).mkdir(parents=True, exist_ok=True)
+
+            for rel, kind in VERSIONED_RUNTIMES:
+                release_dir = release_path / rel
+                release_dir.mkdir(parents=True, exist_ok=True)
+                source_dir = source_path / rel if source_path else None
+                if source_dir is None or not source_dir.is_dir():
+                    continue
+                for child in source_dir.iterdir():
+                    link = release_dir / child.name
+                    if child.name.startswith(".") or link.exists():
+                        continue
+                    entry = self._ingest(kind, child, move=False)
+                    if entry is not None:
+                        self._link(link, entry)
+                        linked.append(f"{kind}/{child.name}")
+
+            for rel, kind in SHARED_RUNTIMES:
+                link = release_path / rel
+                if link.exists():
+                    continue
+                entry = self.root / kind
+                if not entry.exists():
+                    source_dir = source_path / rel if source_path else None
+                    if source_dir is not None and source_dir.is_dir():
+                        shutil.copytree(source_dir.resolve(), entry, symlinks=True)
+                    else:
+                        entry.mkdir(parents=True, exist_ok=True)
+                    open_permissions(entry)
+                self._link(link, entry)
+
+        # Small per-release state (python-default, fnm aliases) is still copied.
+        for root in RUNTIME_ROOTS:
+            source_root = source_path / root if source_path else None
+            if source_root is None or not source_root.is_dir():
+                continue
+            for child in source_root.iterdir():
+                dest = release_path / root / child.name
+                if f"{root}/{child.name}" in handled or dest.exists() or dest.is_symlink():
+                    continue
+                if child.is_symlink():
+                    dest.symlink_to(os.readlink(child))
+                elif child.is_dir():
+                    shutil.copytree(child, dest, symlinks=True)
+                else:
+                    shutil.copy2(child, dest)
+
+        return linked
+
+    @staticmethod
+    def _selected_versions(release_path: Path) -> set[str]:
+        """Path components of the interpreter and Node version the release is set up to use."""
+        references = []
+        python_default = release_path / ".uv" / "python-default"
+        if python_default.is_symlink():
+            references.append(os.readlink(python_default))
+        pyvenv_cfg = release_path / "env" / "pyvenv.cfg"
+        if pyvenv_cfg.is_file():
+            references += [line for line in pyvenv_cfg.read_text().splitlines() if line.startswith("home")]
+        aliases = release_path / ".fnm" / "aliases"
+        if aliases.is_dir():
+            references += [os.readlink(alias) for alias in aliases.iterdir() if alias.is_symlink()]
+        return {part for reference in references for part in Path(reference.split("=")[-1].strip()).parts}
+
+    def adopt(self, release_path: Path) -> list[str]:
+        """Move runtime versions installed into ``release_path`` during the build into the store.
+
+        Links to versions inherited from the previous release but not selected by this one
+        are dropped, so the store can collect them once older releases are gone.
+        """
+        adopted = []
+        selected = self._selected_versions(release_path)
+        with self._lock():
+            for rel, kind in VERSIONED_RUNTIMES:
+                release_dir = release_path / rel
+                if not release_dir.is_dir():
+                    continue
+                for child in release_dir.iterdir():
+                    if child.name.startswith(".") or child.is_symlink() or not child.is_dir():
+                        continue
+                    entry = self._ingest(kind, child, move=True)
+                    if entry is None:
+                        continue
+                    if child.exists():
+                        shutil.rmtree(child)
+                    self._link(child, entry)
+                    adopted.append(f"{kind}/{child.name}")
+
+                links = [c for c in release_dir.iterdir() if c.is_symlink()]
+                if any(link.name in selected for link in links):
+                    for link in links:
+                        if link.name not in selected:
+                            link.unlink()
+        return adopted
+
+    def release_entries(self, release_path: Path) -> list[str]:
+        """The ``kind/version`` store entries ``release_path`` links to."""
+        entries = []
+        for rel, kind in VERSIONED_RUNTIMES:
+            release_dir = release_path / rel
+            if not release_dir.is_dir():
+                continue
+            for child in release_dir.iterdir():
+                if not child.is_symlink():
+                    continue
+                target = child.resolve()
+                if target.parent == (self.root / kind).resolve():
+                    entries.append(f"{kind}/{target.name}")
+        return entries
+
+    def gc(self, releases: list[Path]) -> list[str]:
+        """Remove store versions none of ``releases`` link to and record reference counts."""
+        if not self.root.exists():
+            return []
+
+        removed = []
+        with self._lock():
+            refs: dict[str, list[str]] = {}
+            for release in releases:
+                for entry in self.release_entries(release):
+                    refs.setdefault(entry, []).append(release.name)
+
+            for _, kind in VERSIONED_RUNTIMES:
+                kind_dir = self.root / kind
+                if not kind_dir.is_dir():
+                    continue
+                for entry in kind_dir.iterdir():
+                    if entry.name.startswith("."):
+                        continue
+                    if f"{kind}/{entry.name}" not in refs:
+                        shutil.rmtree(entry, ignore_errors=True)
+                        removed.append(f"{kind}/{entry.name}")
+
+            (self.root / REFS_INDEX).write_text(
+                json.dumps({entry: sorted(names) for entry, names in sorted(refs.items())}, indent=2)
+            )
+
+        for entry in removed:
+            get_logger().debug(f"RUNTIMES: removed unreferenced {entry}")
+        return removed
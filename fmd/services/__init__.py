@@ -1,7 +1,9 @@
 from fmd.services.apps import AppService
 from fmd.services.backup import BackupService
+from fmd.services.blue_green import BlueGreenService
 from fmd.services.bench import BenchService
 from fmd.services.symlinks import SymlinkService
 from fmd.services.cleanup import CleanupService
+from fmd.services.smoke_boot import SmokeBootService
 
-__all__ = ["AppService", "BackupService", "BenchService", "SymlinkService", "CleanupService"]
+__all__ = ["AppService", "BackupService", "BlueGreenService", "BenchService", "SymlinkService", "CleanupService", "SmokeBootService"]
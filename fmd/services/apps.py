@@ -1,11 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any, Callable
 import shutil
+import time
 
 from fmd.release_directory import BenchDirectory
-from fmd.helpers import get_relative_path
+from fmd.helpers import get_relative_path, human_readable_size
+from fmd.tracing import traced_service
 
 
+@traced_service
 class AppService:
     def __init__(self, runner: Any, host_runner: Any, config: Any, printer: Any):
         self.runner = runner
@@ -23,11 +27,17 @@ class AppService:
         overwrite: bool = False,
         backup: bool = True,
     ):
-        clone_map = {}
+        from fmd.git_mirror import GitMirrorCache
 
-        for app in apps:
-            self.printer.change_head(f"Cloning repo {app.repo}")
+        mirror = GitMirrorCache.from_config(self.config)
+
+        # Plan one clone per target up front so monorepo apps sharing (repo, ref)
+        # resolve to the same clone no matter which worker runs it.
+        clone_map: dict = {}
+        clone_jobs: dict = {}
+        app_clone_keys = []
 
+        for app in apps:
             if app.symlink:
                 if not app.subdir_path:
                     raise ValueError(
@@ -35,16 +45,23 @@ class AppService:
                         "Symlinks are only supported for monorepo apps with subdir_path."
                     )
                 key = (app.repo, app.ref)
-                if key in clone_map:
-                    clone_path = clone_map[key]
-                    self.printer.print(f"Reusing clone for {app.repo}@{app.ref} subdir: {app.subdir_path}")
-                else:
-                    clone_path = bench_directory.get_monorepo_clone_path(app)
-                    bench_directory.clone_app(app, clone_path=clone_path, move_to_subdir=False)
-                    clone_map[key] = clone_path
+                if key not in clone_map:
+                    clone_map[key] = bench_directory.get_monorepo_clone_path(app)
+                    clone_jobs[key] = (app, clone_map[key], False)
             else:
-                clone_path = bench_directory.get_frappe_bench_app_path(app, suffix="_clone")
-                bench_directory.clone_app(app, clone_path=clone_path)
+                key = (app.repo, app.ref, app.subdir_path, app.dir_name)
+                clone_map[key] = bench_directory.get_frappe_bench_app_path(app, suffix="_clone")
+                clone_jobs[key] = (app, clone_map[key], True)
+            app_clone_keys.append(key)
+
+        self._clone_parallel(bench_directory, clone_jobs, mirror)
+
+        seen_keys = set()
+        for app, key in zip(apps, app_clone_keys):
+            clone_path = clone_map[key]
+            if app.symlink and key in seen_keys:
+                self.printer.print(f"Reusing clone for {app.repo}@{app.ref} subdir: {app.subdir_path}")
+            seen_keys.add(key)
 
             from_dir = clone_path
 
@@ -84,6 +101,49 @@ class AppService:
                 f"{'Remote removed ' if app.remove_remote else ''}Cloned Repo: {app.repo}, Module Name: '{app_name}'"
             )
 
+    def _clone_parallel(self, bench_directory: BenchDirectory, clone_jobs: dict, mirror) -> None:
+        if not clone_jobs:
+            return
+
+        jobs = max(1, min(self.config.release.clone_jobs, len(clone_jobs)))
+        total = len(clone_jobs)
+        self.printer.change_head(f"Cloning {total} repos ({jobs} parallel)")
+
+        def _clone(app, clone_path: Path, move_to_subdir: bool) -> dict:
+            stats: dict = {}
+            start = time.time()
+            bench_directory.clone_app(
+                app, clone_path=clone_path, move_to_subdir=move_to_subdir, mirror=mirror, stats=stats
+            )
+            stats["seconds"] = time.time() - start
+            return stats
+
+        started = time.time()
+        transferred = 0
+        executor = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="fmd-clone")
+        try:
+            futures = {executor.submit(_clone, *job): job[0] for job in clone_jobs.values()}
+            for done, future in enumerate(as_completed(futures), 1):
+                app = futures[future]
+                label = f"[{app.dir_name}]"
+                try:
+                    stats = future.result()
+                except Exception as e:
+                    self.printer.error(f"{label} clone of {app.repo}@{app.ref} failed: {e}")
+                    raise
+                transferred += stats.get("bytes", 0)
+                self.printer.print(
+                    f"{label} cloned {app.repo}@{app.ref or 'HEAD'} in {stats['seconds']:.2f}s, "
+                    f"{human_readable_size(stats.get('bytes', 0))} via {stats.get('source', 'network')}"
+                )
+                self.printer.change_head(f"Cloning {total} repos ({done}/{total} done)")
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        self.printer.print(
+            f"Cloned {total} repos in {time.time() - started:.2f}s, {human_readable_size(transferred)} transferred"
+        )
+
     def bench_install_apps(
         self,
         bench_directory: BenchDirectory,
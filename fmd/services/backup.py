@@ -1,11 +1,22 @@
 from pathlib import Path
-from typing import Any, Optional
-import gzip
+from typing import Any, Optional, Union
+import json
 import shutil
 import importlib
 
+from fmd.backup_store import BackupStore
+from fmd.db_stream import (
+    compressed_suffix,
+    dump_to_file,
+    human_bytes,
+    is_url,
+    open_decompressed,
+    restore_from_source,
+    source_name,
+)
 from fmd.release_directory import BenchDirectory
 from fmd.helpers import get_json, update_json_keys_in_file_path
+from fmd.tracing import traced_service
 
 _mm = None
 try:
@@ -22,6 +33,37 @@ def _create_migration_bench(name: str, path: Path):
     return MigrationBench(name=name, path=path)
 
 
+# Directory of a parallel (per-table) backup, next to where the classic .sql.gz would be.
+PARALLEL_BACKUP_SUFFIX = ".sql.d"
+PARALLEL_DUMP_SCRIPT = ".fmd-parallel-dump.py"
+PARALLEL_MANIFEST = "manifest.json"
+DUMP_FALLBACK = 'if command -v mariadb-dump >/dev/null 2>&1; then exec mariadb-dump "$@"; else exec mysqldump "$@"; fi'
+
+
+def parallel_backup_dependencies(backup_dirs: list[Path]) -> set[Path]:
+    """Backup directories (``deployment-backup/<release>``) that ``backup_dirs`` need restored from.
+
+    Incremental parallel backups read unchanged tables from the earlier backups they were
+    taken against; this follows those references transitively.
+    """
+    needed: set[Path] = set()
+    pending = list(backup_dirs)
+    while pending:
+        for manifest_path in pending.pop().glob(f"*{PARALLEL_BACKUP_SUFFIX}/{PARALLEL_MANIFEST}"):
+            try:
+                tables = json.loads(manifest_path.read_text())["tables"].values()
+            except (OSError, ValueError, KeyError):
+                continue
+            for entry in tables:
+                if "from" in entry:
+                    release_dir = (manifest_path.parent / entry["from"]).resolve().parent
+                    if release_dir not in needed:
+                        needed.add(release_dir)
+                        pending.append(release_dir)
+    return needed
+
+
+@traced_service
 class BackupService:
     def __init__(self, runner: Any, host_runner: Any, config: Any, printer: Any):
         self.runner = runner
@@ -43,10 +85,47 @@ class BackupService:
             shutil.copyfile(current.common_site_config, backup.common_site_config)
             frappe_app_dir = current.apps / "frappe"
             if frappe_app_dir.exists():
-                self.bench_backup(current, backup, site_name, bench_cli, workspace_root)
+                method = self.config.switch.backup_method
+                if method != "bench":
+                    shutil.copyfile(current.sites / site_name / "site_config.json", backup.path / "site_config.json")
+                self.bench_backup(
+                    current,
+                    backup,
+                    site_name,
+                    bench_cli,
+                    workspace_root,
+                    using_bench_backup=method == "bench",
+                    parallel=method == "parallel",
+                )
                 self.printer.print("Backed up db, common_site_config and site_config.json")
             else:
                 self.printer.print("Skipped DB backup: apps/frappe does not exist in current bench.")
+            if self.config.switch.backup_store:
+                self.store_backup(backup, site_name, workspace_root)
+
+    def store_backup(self, backup: BenchDirectory, site_name: str, workspace_root: Path) -> dict:
+        """Move ``backup`` into the workspace's deduplicating backup store and apply its retention."""
+        store = BackupStore.for_workspace(workspace_root)
+        self.printer.change_head(f"Adding {backup.path.name} to the backup store")
+        snapshot = store.add(backup.path.name, backup.path, site=site_name)
+        shutil.rmtree(backup.path)
+        self.printer.print(
+            f"Stored {human_bytes(snapshot['size'])} backup as {human_bytes(snapshot['added_bytes'])} of new chunks "
+            f"in {snapshot['seconds']}s"
+        )
+        removed = store.prune(self.config.switch.backup_store_retain)
+        if removed:
+            count, size = store.gc()
+            self.printer.print(f"Removed {len(removed)} old backups and {count} chunks ({human_bytes(size)})")
+        return snapshot
+
+    @staticmethod
+    def find_db_backup(backup_dir: Path, site_name: str) -> Optional[Path]:
+        """The database dump in a backup directory: a parallel backup directory or a .sql(.gz/.zst) file."""
+        for suffix in (PARALLEL_BACKUP_SUFFIX, ".sql.gz", ".sql.zst", ".sql"):
+            if (backup_dir / f"{site_name}{suffix}").exists():
+                return backup_dir / f"{site_name}{suffix}"
+        return None
 
     def bench_backup(
         self,
@@ -58,11 +137,12 @@ class BackupService:
         file_name: Optional[str] = None,
         using_bench_backup: bool = True,
         compress: bool = True,
-        sql_delete_after_compress: bool = True,
+        parallel: bool = False,
     ) -> Optional[Path]:
         self.printer.change_head(f"Exporting {site_name} db")
 
-        file_name = f"{site_name if file_name is None else file_name}.sql.gz"
+        base_name = site_name if file_name is None else file_name
+        file_name = f"{base_name}.sql.gz"
 
         host_backup_db_path = backup.path / file_name
 
@@ -89,46 +169,173 @@ class BackupService:
         bench_db_name = backup_bench_db_info.get("name")
         mariadb_client = self._get_mariadb_client(site_name, workspace_root)
 
-        host_backup_db_path = host_backup_db_path.parent / host_backup_db_path.name.rstrip(".gz")
-
         backup.path.mkdir(exist_ok=True, parents=True)
 
-        backup_db_path = backup_db_path.rstrip(".gz")
-
-        mariadb_client.db_export(bench_db_name, export_file_path=backup_db_path)
-
-        self.printer.print(f"Exported {site_name} db")
-
-        if compress:
-            self.printer.change_head(f"Compress {site_name} db")
-            with open(host_backup_db_path, "rb") as f_in:
-                with gzip.open(str(host_backup_db_path) + ".gz", "wb") as f_out:
-                    shutil.copyfileobj(f_in, f_out)
-
-            if sql_delete_after_compress:
-                if host_backup_db_path.exists():
-                    host_backup_db_path.unlink()
+        if parallel:
+            return self._parallel_dump(current, backup, base_name, mariadb_client, bench_db_name)
 
-            self.printer.print("DB has been compressed.")
+        if not compress:
+            host_backup_db_path = backup.path / f"{base_name}.sql"
+            export_path = self.runner.backup_path(backup.path, f"{base_name}.sql")
+            mariadb_client.db_export(bench_db_name, export_file_path=export_path)
+            self.printer.print(f"Exported {site_name} db")
+            return host_backup_db_path
 
+        d = self.config.switch
+        host_backup_db_path = backup.path / f"{base_name}.sql{compressed_suffix(d.backup_compression)}"
+        command, env = self._db_dump_command(mariadb_client, bench_db_name)
+        result = dump_to_file(
+            command,
+            host_backup_db_path,
+            compression=d.backup_compression,
+            level=d.backup_compression_level or (6 if d.backup_compression == "gzip" else 3),
+            threads=d.backup_compression_threads,
+            on_progress=lambda count, rate: self.printer.change_head(
+                f"Exporting {site_name} db: {human_bytes(count)} at {human_bytes(rate)}/s"
+            ),
+            env=env,
+        )
+        self.printer.print(
+            f"Exported {site_name} db: {human_bytes(result['bytes'])} in {result['seconds']}s "
+            f"({human_bytes(result['bytes_per_second'])}/s), {human_bytes(result['compressed_bytes'])} "
+            f"{d.backup_compression} on disk"
+        )
         return host_backup_db_path
 
-    def bench_restore(self, site_name: str, workspace_root: Path, db_file_path: Path):
+    def _run_parallel_dump(
+        self,
+        current: BenchDirectory,
+        mode: str,
+        host_dir: Path,
+        mariadb_client: Any,
+        db_name: str,
+        jobs: int,
+        *args: str,
+    ) -> dict:
+        """Run ``parallel_dump.py`` with the bench's Python, which has pymysql, and return its report."""
+        d = self.config.switch
+        db_info = mariadb_client.database_server_info
+        workdir = self.runner.workdir_for_bench(current)
+        script = current.path / PARALLEL_DUMP_SCRIPT
+        shutil.copy2(Path(__file__).parent.parent / "parallel_dump.py", script)
+        command = [
+            f"{workdir}/env/bin/python",
+            f"{workdir}/{PARALLEL_DUMP_SCRIPT}",
+            mode,
+            "--host",
+            db_info.host,
+            "--port",
+            str(db_info.port),
+            "--user",
+            db_info.user,
+            "--database",
+            db_name,
+            "--dir",
+            self.runner.backup_path(host_dir.parent, host_dir.name),
+            "--jobs",
+            str(jobs),
+            "--compression",
+            d.backup_compression,
+            "--level",
+            str(d.backup_compression_level or (6 if d.backup_compression == "gzip" else 3)),
+            *args,
+        ]
+        try:
+            output = self.runner.run(command, current, capture_output=True, env={"FMD_DB_PASSWORD": db_info.password})
+        except Exception as e:
+            output = getattr(e, "output", None)
+            if output is None:
+                raise
+        finally:
+            script.unlink(missing_ok=True)
+        lines = [line for line in (getattr(output, "stdout", None) or []) if line.strip()]
+        try:
+            report = json.loads(lines[-1])
+        except (IndexError, ValueError):
+            stderr = "\n".join(getattr(output, "stderr", None) or [])[-2000:]
+            raise RuntimeError(f"parallel_dump.py {mode} produced no result: {stderr}")
+        if not report["ok"]:
+            raise RuntimeError(f"parallel {mode} failed: {report['error']}")
+        return report
+
+    def _parallel_dump(
+        self, current: BenchDirectory, backup: BenchDirectory, base_name: str, mariadb_client: Any, db_name: str
+    ) -> Path:
+        host_dir = backup.path / f"{base_name}{PARALLEL_BACKUP_SUFFIX}"
+        jobs = self.config.switch.backup_jobs
+        args = []
+        # Backups moved into the backup store leave no directory to reference tables from.
+        if self.config.switch.backup_incremental and not self.config.switch.backup_store:
+            args.append("--checksums")
+            base = self._incremental_base(backup, host_dir.name, db_name)
+            if base is not None:
+                args += ["--base", self.runner.backup_path(base.parent, base.name)]
+                self.printer.print(f"Incremental against {base.parent.name}")
+        self.printer.change_head(f"Dumping {db_name} table by table on {jobs} connections")
+        report = self._run_parallel_dump(current, "dump", host_dir, mariadb_client, db_name, jobs, *args)
+        if not report["consistent"]:
+            self.printer.warning("No RELOAD privilege: tables were dumped from separate snapshots")
+        self.printer.print(
+            f"Dumped {report['dumped']}/{report['tables']} tables ({report['rows']} rows, "
+            f"{human_bytes(report['bytes'])}) in {report['seconds']}s, tables locked {report['lock_seconds']}s"
+        )
+        if report["dumped"] < report["tables"]:
+            self.printer.print(
+                f"{report['tables'] - report['dumped']} unchanged tables ({human_bytes(report['reused_bytes'])}) "
+                "reused from earlier backups"
+            )
+        return host_dir
+
+    def _incremental_base(self, backup: BenchDirectory, dir_name: str, db_name: str) -> Optional[Path]:
+        """Most recent earlier parallel backup of the same database to dump incrementally against.
+
+        None, for a full dump, when there is none or its chain already has ``backup_full_every``
+        incrementals.
+        """
+        earlier = sorted((d for d in backup.path.parent.iterdir() if d.name < backup.path.name), reverse=True)
+        for release_dir in earlier:
+            manifest_path = release_dir / dir_name / PARALLEL_MANIFEST
+            if not manifest_path.is_file():
+                continue
+            try:
+                manifest = json.loads(manifest_path.read_text())
+            except ValueError:
+                continue
+            if manifest.get("database") != db_name:
+                continue
+            if manifest.get("depth", 0) >= self.config.switch.backup_full_every:
+                self.printer.print(f"{manifest['depth']} incremental backups since the last full one, taking a full")
+                return None
+            return manifest_path.parent
+        return None
+
+    def _db_dump_command(self, mariadb_client: Any, db_name: str) -> tuple[list[str], dict[str, str]]:
+        """Dump command line run through the runner, and the environment carrying the password."""
+        db_info = mariadb_client.database_server_info
+        # --single-transaction: consistent InnoDB snapshot without locking; --quick: rows aren't buffered.
+        args = [f"-u{db_info.user}", f"-h{db_info.host}", f"-P{db_info.port}", "--single-transaction", "--quick"]
+        # MariaDB 11 images only ship mariadb-dump; older ones may only have mysqldump.
+        dump = ["sh", "-c", DUMP_FALLBACK, "dump", *args, db_name]
+        return self.runner.piped_command(dump, {"MYSQL_PWD": db_info.password})
+
+    def bench_restore(self, site_name: str, workspace_root: Path, db_source: Union[Path, str]):
+        """Restore the site's database from a local ``.sql``/``.sql.gz``/``.sql.zst``, an http(s) URL
+        or a parallel backup directory.
+
+        A dump is decompressed on the fly and streamed into a mariadb client in the bench's
+        frappe service, so nothing is written to disk; if that fails a local file is imported
+        with frappe-manager's ``db_import`` instead. A parallel backup (a directory
+        with ``manifest.json``) is loaded table by table on ``restore_jobs`` connections, taking
+        the tables an incremental backup didn't dump from the earlier backups it points to.
+        """
         if not self.runner.supports_db_restore:
             self.printer.warning("db restore is not implemented in host mode")
             return
 
-        if db_file_path.suffix == ".gz":
-            self.printer.change_head(f"Decompressing {db_file_path}")
-            with gzip.open(db_file_path, "rb") as f_in:
-                decompressed_path = db_file_path.with_suffix("")
-                with open(decompressed_path, "wb") as f_out:
-                    shutil.copyfileobj(f_in, f_out)
-            db_file_path = decompressed_path
-
         backup_bench = _create_migration_bench(name=site_name, path=workspace_root)
+        source = source_name(db_source)
 
-        self.printer.change_head(f"Restoring {site_name} with db from {db_file_path}")
+        self.printer.change_head(f"Restoring {site_name} with db from {source}")
 
         backup_bench_db_info = backup_bench.get_db_connection_info()
 
@@ -136,8 +343,60 @@ class BackupService:
 
         mariadb_client = self._get_mariadb_client(site_name, workspace_root)
 
-        mariadb_client.db_import(db_name=bench_db_name, host_db_file_path=db_file_path)
-        self.printer.print(f"Restored {site_name} with db from {db_file_path}")
+        if isinstance(db_source, Path) and (db_source / PARALLEL_MANIFEST).is_file():
+            jobs = self.config.switch.restore_jobs
+            self.printer.change_head(f"Restoring {site_name} table by table on {jobs} connections")
+            # Any bench dir will do to run the script; the bench path is the live one.
+            current = BenchDirectory(self.config.bench_path)
+            report = self._run_parallel_dump(current, "restore", db_source, mariadb_client, bench_db_name, jobs)
+            self.printer.print(
+                f"Restored {report['tables']} tables ({report['rows']} rows) in {report['seconds']}s: "
+                f"loading {report['load_seconds']}s, indexes {report['index_seconds']}s (summed over tables)"
+            )
+            return
+
+        db_info = mariadb_client.database_server_info
+        command, env = self.runner.piped_command(
+            ["mariadb", f"-u{db_info.user}", f"-h{db_info.host}", f"-P{db_info.port}", bench_db_name],
+            {"MYSQL_PWD": db_info.password},
+        )
+
+        try:
+            result = restore_from_source(
+                db_source,
+                command,
+                read_ahead_bytes=self.config.switch.restore_read_ahead_mb << 20,
+                on_progress=lambda count, rate: self.printer.change_head(
+                    f"Restoring {site_name} from {source}: {human_bytes(count)} at {human_bytes(rate)}/s"
+                ),
+                env=env,
+            )
+        except RuntimeError as e:
+            if is_url(db_source):
+                raise
+            # The frappe service may lack a mariadb client; the dump recreates every table it loads.
+            self.printer.warning(f"Streaming restore failed, importing through frappe-manager: {e}")
+            self._db_import(mariadb_client, bench_db_name, Path(db_source))
+            self.printer.print(f"Restored {site_name} with db from {source}")
+            return
+        self.printer.print(
+            f"Restored {site_name} with db from {source}: {human_bytes(result['bytes'])} in {result['seconds']}s "
+            f"({human_bytes(result['bytes_per_second'])}/s)"
+        )
+
+    def _db_import(self, mariadb_client: Any, db_name: str, db_file_path: Path) -> None:
+        """Import ``db_file_path`` with frappe-manager's ``db_import``, decompressing it next to itself first."""
+        if db_file_path.suffix not in (".gz", ".zst"):
+            mariadb_client.db_import(db_name=db_name, host_db_file_path=db_file_path)
+            return
+        decompressed_path = db_file_path.with_suffix("")
+        self.printer.change_head(f"Decompressing {db_file_path}")
+        try:
+            with open_decompressed(db_file_path) as f_in, open(decompressed_path, "wb") as f_out:
+                shutil.copyfileobj(f_in, f_out)
+            mariadb_client.db_import(db_name=db_name, host_db_file_path=decompressed_path)
+        finally:
+            decompressed_path.unlink(missing_ok=True)
 
     def _get_mariadb_client(self, site_name: str, workspace_root: Path) -> Any:
         from frappe_manager.compose_manager.ComposeFile import ComposeFile
@@ -1,15 +1,34 @@
 from pathlib import Path
 import json
+import os
 import shutil
 import time
+import uuid
 from typing import Any, Callable, Optional
 
 from pydantic import BaseModel
 
 from fmd.release_directory import BenchDirectory
 from fmd.helpers import extract_timestamp as _extract_timestamp, get_relative_path, human_readable_time
-
-
+from fmd.asset_cache import AssetCache
+from fmd.node_cache import NodeModulesCache
+from fmd.venv_reuse import app_dependency_fingerprint, clone_venv
+from fmd.tracing import traced_service
+from fmd.latency_gate import summarize as summarize_latency
+from fmd.services.blue_green import PROBE_SCRIPT
+
+# Prefix of the JSON result line printed by post_switch.py (kept in sync with its RESULT_MARKER).
+POST_SWITCH_RESULT_MARKER = "FMD_POST_SWITCH_RESULT "
+MIGRATE_SCRIPT = ".fmd-migrate.py"
+MIGRATE_REPORT = ".fmd-migrate-report.json"
+# QUIT the gunicorn masters hot reloads left serving (see hot_reload.py), so the ones
+# supervisor starts on a full restart can bind the port.
+STOP_HOT_RELOAD_MASTERS = (
+    'for f in /tmp/fmd-master-*.pid; do [ -f "$f" ] && kill -QUIT "$(cat "$f")"; rm -f "$f"; done; true'
+)
+
+
+@traced_service
 class BenchService:
     def __init__(self, runner: Any, host_runner: Any, config: Any, printer: Any):
         self.runner = runner
@@ -83,14 +102,14 @@ class BenchService:
             # Write temp script inside the release directory (which is mounted in Docker)
             script_dir = bench_directory.path / ".fmd_tmp"
             script_dir.mkdir(parents=True, exist_ok=True)
-            script_name = f"temp_script_{int(time.time())}.sh"
+            script_name = f"temp_script_{int(time.time())}_{uuid.uuid4().hex[:6]}.sh"
             script_path = script_dir / script_name
             container_script_path = f"/workspace/frappe-bench/.fmd_tmp/{script_name}"
             workdir = custom_workdir or "/workspace/frappe-bench"
         else:
             script_dir = bench_directory.path / "deployment_tmp"
             script_dir.mkdir(parents=True, exist_ok=True)
-            script_name = f"temp_script_{int(time.time())}.sh"
+            script_name = f"temp_script_{int(time.time())}_{uuid.uuid4().hex[:6]}.sh"
             script_path = script_dir / script_name
             container_script_path = str(script_path)
             workdir = custom_workdir or str(script_dir)
@@ -176,6 +195,203 @@ class BenchService:
 
         self.clear_assets_json(bench_directory)
 
+    def _run_post_switch_script(self, bench_directory: BenchDirectory, args: list[str]) -> Optional[dict]:
+        """Run ``post_switch.py`` from the sites directory and return its JSON result, if any."""
+        script = Path(__file__).parent.parent / "post_switch.py"
+        bench_script_path = bench_directory.sites / "fmd_post_switch.py"
+        shutil.copy2(script, bench_script_path)
+
+        try:
+            output = self.runner.run(
+                ["../env/bin/python", "fmd_post_switch.py", *args],
+                bench_directory,
+                capture_output=True,
+                workdir=self.runner.workdir_for_sites(bench_directory),
+            )
+        except Exception as e:
+            output = getattr(e, "output", None)
+            if output is None:
+                self.printer.warning(f"post_switch.py failed: {e}")
+                return None
+        finally:
+            bench_script_path.unlink(missing_ok=True)
+
+        result = None
+        for line in getattr(output, "stdout", None) or []:
+            if line.startswith(POST_SWITCH_RESULT_MARKER):
+                result = json.loads(line[len(POST_SWITCH_RESULT_MARKER) :])
+        if result is None:
+            self.printer.warning("post_switch.py produced no result")
+            return None
+
+        for step in result["steps"]:
+            status = "done" if step["ok"] else f"failed: {step['error']}"
+            self.printer.print(f"{step['name']} {status} ({step['seconds']}s)")
+        return result
+
+    def bench_post_switch(
+        self, bench_directory: BenchDirectory, site_name: str, install_apps: list[str], clear_cache: bool = True
+    ) -> Optional[dict]:
+        """Clear caches, list installed apps and install missing ones in a single frappe process.
+
+        Runs ``post_switch.py`` from the sites directory instead of one ``bench`` process per
+        action, each of which pays frappe's import and site connection cost. Returns the
+        script's result, or None when it didn't produce one so the caller can fall back to
+        the per-command path. Raises RuntimeError when a step failed.
+        """
+        self.printer.change_head("Clearing cache and installing apps in one frappe process")
+        args = [site_name]
+        if install_apps:
+            args += ["--install", *install_apps]
+        if not clear_cache:
+            args.append("--skip-cache")
+
+        result = self._run_post_switch_script(bench_directory, args)
+        if result is None:
+            return None
+
+        for app in result["already_installed"]:
+            self.printer.print(f"App {app} is already installed.")
+        self.printer.print(f"Post-switch steps took {result['seconds']}s")
+
+        if not result["ok"]:
+            failed = [step for step in result["steps"] if not step["ok"]]
+            raise RuntimeError(
+                "post-switch steps failed: " + "; ".join(f"{s['name']}: {s['error']}" for s in failed)
+            )
+        return result
+
+    def _gunicorn_workers(self, bench_directory: BenchDirectory) -> int:
+        try:
+            return int(json.loads(bench_directory.common_site_config.read_text()).get("gunicorn_workers") or 4)
+        except (OSError, ValueError, TypeError):
+            return 4
+
+    def _run_probe(
+        self, bench_directory: BenchDirectory, site_name: str, mode: str, urls: list[str], *args: str
+    ) -> dict:
+        workdir = self.runner.workdir_for_bench(bench_directory)
+        script = bench_directory.path / PROBE_SCRIPT
+        shutil.copy2(Path(__file__).parent.parent / "blue_green_probe.py", script)
+        try:
+            output = self.runner.run(
+                [f"{workdir}/env/bin/python", f"{workdir}/{PROBE_SCRIPT}", mode, *urls, "--host", site_name, *args],
+                bench_directory,
+                capture_output=True,
+            )
+        finally:
+            script.unlink(missing_ok=True)
+        lines = [line for line in (getattr(output, "stdout", None) or []) if line.strip()]
+        return json.loads(lines[-1]) if lines else {}
+
+    def bench_warm_up(self, bench_directory: BenchDirectory, site_name: str) -> dict:
+        """Rebuild the caches a cache clear dropped and send warm-up requests to every gunicorn worker.
+
+        First-request latency of each warm-up URL is measured before anything is warmed and
+        again afterwards; the returned report holds both along with the step timings.
+        """
+        d = self.config.switch
+        start = time.time()
+        base_url = d.warmup_base_url.rstrip("/")
+        urls = [url if "://" in url else f"{base_url}/{url.lstrip('/')}" for url in d.warmup_urls]
+        report: dict = {"urls": urls}
+
+        self.printer.change_head("Warming up caches and gunicorn workers")
+        if urls:
+            report["before"] = self._run_probe(bench_directory, site_name, "measure", urls)
+
+        args = [site_name, "--skip-cache", "--warm", "--warm-top-doctypes", str(d.warmup_top_doctypes)]
+        for doctype in d.warmup_doctypes:
+            args += ["--warm-doctype", doctype]
+        result = self._run_post_switch_script(bench_directory, args)
+        if result is not None:
+            report["steps"] = {step["name"]: step["seconds"] for step in result["steps"]}
+            warmed = next((s for s in result["steps"] if s["name"] == "warm_doctype_meta"), {})
+            report["doctypes"] = warmed.get("result", [])
+
+        if urls:
+            requests = d.warmup_requests_per_url or 2 * self._gunicorn_workers(bench_directory)
+            report["requests"] = self._run_probe(
+                bench_directory,
+                site_name,
+                "warm",
+                urls,
+                "--requests",
+                str(requests),
+                "--concurrency",
+                str(d.warmup_concurrency),
+            )
+            report["after"] = self._run_probe(bench_directory, site_name, "measure", urls)
+            for url in urls:
+                before = report["before"].get(url, {}).get("ms")
+                after = report["after"].get(url, {}).get("ms")
+                self.printer.print(f"{url}: first request {before}ms -> {after}ms after warm-up")
+
+        report["seconds"] = round(time.time() - start, 3)
+        self.printer.print(f"Warm-up took {report['seconds']}s")
+        return report
+
+    def bench_latency_sample(self, bench_directory: BenchDirectory, site_name: str) -> dict:
+        """Replay the latency gate's URLs against the running bench and summarize p50/p95 and errors."""
+        d = self.config.switch
+        base_url = d.latency_gate_base_url.rstrip("/")
+        urls = [url if "://" in url else f"{base_url}/{url.lstrip('/')}" for url in d.latency_gate_urls]
+        self.printer.change_head(f"Sampling latency of {len(urls)} URLs on {bench_directory.path.resolve().name}")
+        samples = self._run_probe(
+            bench_directory,
+            site_name,
+            "replay",
+            urls,
+            "--requests",
+            str(d.latency_gate_requests),
+            "--discard",
+            str(d.latency_gate_discard),
+            "--concurrency",
+            str(d.latency_gate_concurrency),
+        )
+        summary = summarize_latency(samples)
+        self.printer.print(
+            f"p50 {summary['p50_ms']}ms, p95 {summary['p95_ms']}ms, "
+            f"{summary['errors']}/{summary['requests']} errors"
+        )
+        return summary
+
+    def _run_python_install_hooks(
+        self,
+        app,
+        phase: str,
+        bench_directory: BenchDirectory,
+        current: BenchDirectory,
+        bench_path: Path,
+        site_name: str,
+        host_run: Callable,
+    ) -> None:
+        if phase == "before":
+            hooks = [
+                (app.host_before_python_install, f"host pre-python-install for {app.dir_name}", False),
+                (app.before_python_install, f"pre-python-install for {app.dir_name}", True),
+            ]
+        else:
+            hooks = [
+                (app.after_python_install, f"post-python-install for {app.dir_name}", True),
+                (app.host_after_python_install, f"host post-python-install for {app.dir_name}", False),
+            ]
+
+        for script, script_type, container in hooks:
+            if not script:
+                continue
+            self._run_script(
+                script,
+                bench_directory,
+                current,
+                bench_path,
+                site_name,
+                host_run,
+                script_type,
+                container=container,
+                app_name=app.dir_name,
+            )
+
     def bench_install_all_apps_in_python_env(
         self,
         bench_directory: BenchDirectory,
@@ -195,71 +411,177 @@ class BenchService:
             "--python",
             python_path,
             "-U",
-            "-e",
         ]
-        for app in apps:
-            app_path = bench_directory.apps / app.dir_name
-            if not app_path.is_dir():
-                continue
-            if app.host_before_python_install:
-                self._run_script(
-                    app.host_before_python_install,
-                    bench_directory,
-                    current,
-                    bench_path,
-                    site_name,
-                    host_run,
-                    f"host pre-python-install for {app.dir_name}",
-                    app_name=app.dir_name,
-                )
-            if app.before_python_install:
-                self._run_script(
-                    app.before_python_install,
-                    bench_directory,
-                    current,
-                    bench_path,
-                    site_name,
-                    host_run,
-                    f"pre-python-install for {app.dir_name}",
-                    container=True,
-                    app_name=app.dir_name,
-                )
+        hook_args = (bench_directory, current, bench_path, site_name, host_run)
+
+        installable = [app for app in apps if (bench_directory.apps / app.dir_name).is_dir()]
+        if self.config.release.batch_python_install:
+            batched = [app for app in installable if not app.isolated_python_install]
+            isolated = [app for app in installable if app.isolated_python_install]
+        else:
+            batched, isolated = [], installable
+
+        if batched:
+            for app in batched:
+                self._run_python_install_hooks(app, "before", *hook_args)
+
+            editable_args = []
+            for app in batched:
+                editable_args += ["-e", f"{self.runner.workdir_for_bench(bench_directory)}/apps/{app.dir_name}"]
+
+            self.printer.change_head(f"Installing {len(batched)} apps in one uv resolution")
+            try:
+                self.runner.run(install_cmd + editable_args, bench_directory, capture_output=False)
+            except Exception as e:
+                raise RuntimeError(
+                    f"Failed to install apps {', '.join(app.dir_name for app in batched)} in python env "
+                    f"(command: {' '.join(install_cmd + editable_args)})"
+                ) from e
+
+            for app in batched:
+                self._run_python_install_hooks(app, "after", *hook_args)
+
+        for app in isolated:
+            self._run_python_install_hooks(app, "before", *hook_args)
 
             app_abs_path = f"{self.runner.workdir_for_bench(bench_directory)}/apps/{app.dir_name}"
             try:
-                self.runner.run(install_cmd + [app_abs_path], bench_directory, capture_output=False)
+                self.runner.run(install_cmd + ["-e", app_abs_path], bench_directory, capture_output=False)
             except Exception as e:
                 raise RuntimeError(
                     f"Failed to install app '{app.dir_name}' in python env "
-                    f"(command: {' '.join(install_cmd + [app_abs_path])})"
+                    f"(command: {' '.join(install_cmd + ['-e', app_abs_path])})"
                 ) from e
 
-            if app.after_python_install:
-                self._run_script(
-                    app.after_python_install,
-                    bench_directory,
-                    current,
-                    bench_path,
-                    site_name,
-                    host_run,
-                    f"post-python-install for {app.dir_name}",
-                    container=True,
-                    app_name=app.dir_name,
-                )
-            if app.host_after_python_install:
-                self._run_script(
-                    app.host_after_python_install,
-                    bench_directory,
-                    current,
-                    bench_path,
-                    site_name,
-                    host_run,
-                    f"host post-python-install for {app.dir_name}",
-                    app_name=app.dir_name,
-                )
+            self._run_python_install_hooks(app, "after", *hook_args)
 
         self.printer.print("Installed apps in python env")
 
+    def _python_env_fingerprint(self, bench_directory: BenchDirectory, apps: list) -> dict:
+        return {
+            "python_version": self.config.release.python_version,
+            "apps": {
+                app.dir_name: app_dependency_fingerprint(app, bench_directory.apps / app.dir_name)
+                for app in apps
+                if (bench_directory.apps / app.dir_name).is_dir()
+            },
+        }
+
+    def _reuse_live_venv(
+        self, bench_directory: BenchDirectory, apps: list, current: BenchDirectory, python_env: dict
+    ) -> Optional[list]:
+        """Clone the live release's venv into ``bench_directory`` when its dependency fingerprint matches.
+
+        Returns the apps that still need a full install, or None when the venv has to be built from scratch.
+        """
+        if not self.config.release.reuse_venv:
+            return None
+        if not (current.env / "pyvenv.cfg").exists():
+            return None
+        if current.path.resolve() == bench_directory.path.resolve():
+            return None
+
+        live_env = current.read_metadata().get("python_env")
+        if not live_env:
+            self.printer.print("Live release has no venv fingerprint, building venv from scratch")
+            return None
+        if live_env.get("python_version") != python_env["python_version"]:
+            self.printer.print(
+                f"Python version changed ({live_env.get('python_version')} -> {python_env['python_version']}), "
+                "building venv from scratch"
+            )
+            return None
+
+        live_apps = live_env.get("apps", {})
+        removed = [name for name in live_apps if name not in python_env["apps"]]
+        if removed:
+            self.printer.print(f"Apps removed since live release ({', '.join(removed)}), building venv from scratch")
+            return None
+
+        installable = [app for app in apps if app.dir_name in python_env["apps"]]
+        unchanged = [
+            app
+            for app in installable
+            if python_env["apps"][app.dir_name] is not None
+            and live_apps.get(app.dir_name) == python_env["apps"][app.dir_name]
+        ]
+        if not unchanged:
+            return None
+        changed = [app for app in installable if app not in unchanged]
+
+        self.printer.change_head("Cloning live release's Python venv")
+        start = time.time()
+        method = clone_venv(current.env.resolve(), bench_directory.env)
+        self.printer.print(
+            f"Cloned venv from {current.path.resolve().name} via {method} in {time.time() - start:.2f}s "
+            f"({len(unchanged)}/{len(installable)} apps unchanged)"
+        )
+
+        self.printer.change_head(f"Re-linking {len(unchanged)} unchanged editable apps")
+        workdir = self.runner.workdir_for_bench(bench_directory)
+        relink_cmd = ["uv", "pip", "install", "--python", f"{workdir}/env/bin/python", "--no-deps"]
+        for app in unchanged:
+            relink_cmd += ["-e", f"{workdir}/apps/{app.dir_name}"]
+        self.runner.run(relink_cmd, bench_directory, capture_output=False)
+        self.printer.print(f"Re-linked {', '.join(app.dir_name for app in unchanged)}")
+
+        if changed:
+            self.printer.print(f"Dependency spec changed for {', '.join(app.dir_name for app in changed)}")
+        return changed
+
+    def bench_install_node_packages(
+        self, bench_directory: BenchDirectory, apps: list, node_cmd: list[str], current: BenchDirectory
+    ) -> None:
+        cache = NodeModulesCache.from_config(self.config)
+        if cache is None:
+            self.printer.change_head("Installing all apps node packages")
+            self.runner.run(node_cmd, bench_directory, capture_output=False)
+            self.printer.print("Installed all apps node packages")
+            return
+
+        self.printer.change_head("Reusing cached node_modules")
+        live_keys = current.read_metadata().get("node_modules", {})
+        keys: dict[str, str] = {}
+        pending = []
+        for app in apps:
+            app_path = bench_directory.apps / app.dir_name
+            if not (app_path / "package.json").is_file():
+                continue
+            key = cache.key(app_path, self.config.release.node_version)
+            if key is None:
+                pending.append(app)
+                continue
+            keys[app.dir_name] = key
+
+            live_node_modules = current.apps / app.dir_name / "node_modules"
+            if live_keys.get(app.dir_name) == key and live_node_modules.is_dir():
+                source, origin = live_node_modules, "live release"
+            elif cache.entry(key).is_dir():
+                source, origin = cache.entry(key), "cache"
+            else:
+                pending.append(app)
+                continue
+
+            start = time.time()
+            method = cache.materialize(source, app_path)
+            self.printer.print(
+                f"[{app.dir_name}] node_modules from {origin} via {method} in {time.time() - start:.2f}s"
+            )
+
+        if pending:
+            names = [app.dir_name for app in pending]
+            self.printer.change_head(f"Installing node packages for {', '.join(names)}")
+            self.runner.run(node_cmd + names, bench_directory, capture_output=False)
+            for app in pending:
+                if app.dir_name in keys:
+                    cache.store(keys[app.dir_name], bench_directory.apps / app.dir_name)
+            self.printer.print(f"Installed node packages for {', '.join(names)}")
+        else:
+            self.printer.print("All apps node packages reused, skipped yarn")
+
+        bench_directory.update_metadata(node_modules=keys)
+        cache.prune()
+
     def bench_setup_requirements(
         self,
         bench_directory: BenchDirectory,
@@ -270,6 +592,13 @@ class BenchService:
         site_name: str,
         host_run: Callable,
     ):
+        self.detect_runtime_versions(bench_directory)
+        self.setup_python_env(bench_directory, apps, current, bench_path, site_name, host_run)
+        self.setup_node_runtime(bench_directory)
+        self.setup_node_packages(bench_directory, apps, bench_cli, current)
+        self.configure_apps_txt(bench_directory, apps)
+
+    def detect_runtime_versions(self, bench_directory: BenchDirectory) -> None:
         from frappe_manager.site_manager.bench_config import (
             extract_node_version_requirement,
             extract_python_version_requirement,
@@ -290,7 +619,15 @@ class BenchService:
                     self.config.release.node_version = parse_node_version_for_runtime(detected)
                     self.printer.print(f"Auto-detected Node version: {self.config.release.node_version}")
 
-        # --- Python venv first ---
+    def setup_python_env(
+        self,
+        bench_directory: BenchDirectory,
+        apps: list,
+        current: BenchDirectory,
+        bench_path: Path,
+        site_name: str,
+        host_run: Callable,
+    ) -> None:
         if bench_directory.env.exists():
             self.printer.change_head("Backing up existing Python venv")
             env_bak = bench_directory.path / "env.bak"
@@ -299,44 +636,57 @@ class BenchService:
             self.runner.run(["mv", "env", "env.bak"], bench_directory, capture_output=False)
             self.printer.print("Backed up env to env.bak")
 
-        self.printer.change_head("Creating Python venv using uv")
-        venv_cmd = ["uv", "venv", "env", "--seed", "--relocatable", "--no-project"]
-        if self.config.release.python_version:
-            venv_cmd += ["--python", self.config.release.python_version]
-        self.runner.run(venv_cmd, bench_directory, capture_output=False)
-        self.printer.print("Python venv created")
-
+        python_env = self._python_env_fingerprint(bench_directory, apps)
         start_time = time.time()
 
-        self.bench_install_all_apps_in_python_env(bench_directory, apps, current, bench_path, site_name, host_run)
+        changed_apps = self._reuse_live_venv(bench_directory, apps, current, python_env)
+        if changed_apps is None:
+            self.printer.change_head("Creating Python venv using uv")
+            venv_cmd = ["uv", "venv", "env", "--seed", "--relocatable", "--no-project"]
+            if self.config.release.python_version:
+                venv_cmd += ["--python", self.config.release.python_version]
+            self.runner.run(venv_cmd, bench_directory, capture_output=False)
+            self.printer.print("Python venv created")
+
+            self.bench_install_all_apps_in_python_env(bench_directory, apps, current, bench_path, site_name, host_run)
+        elif changed_apps:
+            self.bench_install_all_apps_in_python_env(
+                bench_directory, changed_apps, current, bench_path, site_name, host_run
+            )
+
+        bench_directory.update_metadata(python_env=python_env)
 
         end_time = time.time()
         elapsed_time = end_time - start_time
         self.printer.print(f"Apps python env install time: {elapsed_time:.2f} seconds")
 
-        # --- Now Node ---
-        node_cmd = [bench_cli, "setup", "requirements", "--node"]
-
-        if self.config.release.node_version:
-            nv = self.config.release.node_version
-            self.printer.change_head(f"Installing Node {nv} via fnm")
-
-            # Ensure .fnm directory exists (may be missing when bench symlink is broken)
-            fnm_dir = bench_directory.path / ".fnm"
-            if not fnm_dir.exists():
-                fnm_dir.mkdir(parents=True, exist_ok=True)
-                self.printer.print("Created missing .fnm directory")
-
-            # Use --fnm-dir explicitly because `source /etc/bash.bashrc` in exec mode
-            # runs `eval "$(fnm env)"` which overrides FNM_DIR env var back to the
-            # container's default (the bench's .fnm, not the release's).
-            # Must use container path, not host path.
-            container_workdir = self.runner.workdir_for_bench(bench_directory)
-            fnm_dir_arg = f"{container_workdir}/.fnm"
+    def setup_node_runtime(self, bench_directory: BenchDirectory) -> None:
+        if not self.config.release.node_version:
+            return
 
+        nv = self.config.release.node_version
+        self.printer.change_head(f"Installing Node {nv} via fnm")
+
+        # Ensure .fnm directory exists (may be missing when bench symlink is broken)
+        fnm_dir = bench_directory.path / ".fnm"
+        if not fnm_dir.exists():
+            fnm_dir.mkdir(parents=True, exist_ok=True)
+            self.printer.print("Created missing .fnm directory")
+
+        # Use --fnm-dir explicitly because `source /etc/bash.bashrc` in exec mode
+        # runs `eval "$(fnm env)"` which overrides FNM_DIR env var back to the
+        # container's default (the bench's .fnm, not the release's).
+        # Must use container path, not host path.
+        container_workdir = self.runner.workdir_for_bench(bench_directory)
+        fnm_dir_arg = f"{container_workdir}/.fnm"
+
+        version_dir = fnm_dir / "node-versions" / f"v{nv}"
+        if version_dir.is_symlink() and (version_dir / "installation").is_dir():
+            # Linked from the runtime store, already complete
+            self.printer.print(f"Node {nv} linked from runtime store")
+        else:
             # Clean up any leftover state from previous failed installs
-            version_dir = fnm_dir / "node-versions" / f"v{nv}"
-            if version_dir.exists():
+            if version_dir.exists() or version_dir.is_symlink():
                 self.runner.run(["rm", "-rf", str(version_dir)], bench_directory, capture_output=False)
                 self.printer.print(f"Cleaned up existing Node v{nv} directory")
             # Clean fnm's temp download directory (where crashed installs leave debris)
@@ -346,16 +696,22 @@ class BenchService:
 
             self.runner.run(["fnm", "install", nv, "--fnm-dir", fnm_dir_arg], bench_directory, capture_output=False)
             self.printer.print(f"Node {nv} installed")
-            self.runner.run(["fnm", "default", nv, "--fnm-dir", fnm_dir_arg], bench_directory, capture_output=False)
-            self.printer.print(f"Node {nv} set as default")
+        self.runner.run(["fnm", "default", nv, "--fnm-dir", fnm_dir_arg], bench_directory, capture_output=False)
+        self.printer.print(f"Node {nv} set as default")
+
+    def setup_node_packages(
+        self, bench_directory: BenchDirectory, apps: list, bench_cli: str, current: BenchDirectory
+    ) -> None:
+        node_cmd = [bench_cli, "setup", "requirements", "--node"]
 
         if apps:
-            self.printer.change_head("Installing all apps node packages")
-            self.runner.run(node_cmd, bench_directory, capture_output=False)
-            self.printer.print("Installed all apps node packages")
+            start_time = time.time()
+            self.bench_install_node_packages(bench_directory, apps, node_cmd, current)
+            self.printer.print(f"Apps node packages install time: {time.time() - start_time:.2f} seconds")
         else:
             self.printer.print("Skipping node packages install (no apps)")
 
+    def configure_apps_txt(self, bench_directory: BenchDirectory, apps: list) -> None:
         self.printer.change_head("Configuring apps.txt")
         apps_txt_path = bench_directory.sites / "apps.txt"
         apps_txt_path.parent.mkdir(parents=True, exist_ok=True)
@@ -417,8 +773,9 @@ class BenchService:
         ]
 
         if apps:
-            self.runner.run(prod_build_cmd[:-1], bench_directory, capture_output=False)
-            self.runner.run(prod_build_cmd, bench_directory, capture_output=False)
+            if self.config.release.build_dev_assets:
+                self.runner.run(prod_build_cmd[:-1], bench_directory, capture_output=False)
+            self._build_assets(bench_directory, apps, prod_build_cmd)
 
         for app in apps:
             app_dir_path = self.runner.app_exec_path(bench_directory, app.app_name)
@@ -450,6 +807,62 @@ class BenchService:
                 )
         self.printer.print("Built all apps")
 
+    def _build_assets(self, bench_directory: BenchDirectory, apps: list, build_cmd: list[str]) -> None:
+        cache = AssetCache.from_config(self.config)
+        if cache is None:
+            self.runner.run(build_cmd, bench_directory, capture_output=False)
+            return
+
+        assets_dir = bench_directory.sites / "assets"
+        frappe_path = bench_directory.apps / "frappe"
+        keyed: dict[str, tuple[str, str, Path]] = {}
+        pending = []
+        for app in apps:
+            app_path = bench_directory.apps / app.dir_name
+            if not app_path.is_dir():
+                continue
+            try:
+                module_name = bench_directory.get_app_python_module_name(app_path)
+            except RuntimeError:
+                pending.append(app)
+                continue
+            dist_path = app_path / module_name / "public" / "dist"
+            key = cache.key(app, app_path, frappe_path, self.config.release.node_version)
+            if key is None:
+                pending.append(app)
+                continue
+            keyed[app.dir_name] = (key, module_name, dist_path)
+
+            if not cache.has(key):
+                pending.append(app)
+                continue
+            start = time.time()
+            method = cache.restore(key, dist_path, assets_dir)
+            self.printer.print(
+                f"[{app.dir_name}] assets restored from cache via {method} in {time.time() - start:.2f}s"
+            )
+
+        if pending:
+            names = [app.dir_name for app in pending]
+            self.printer.change_head(f"Building assets for {', '.join(names)}")
+            self.runner.run(build_cmd + ["--apps", ",".join(names)], bench_directory, capture_output=False)
+            for app in pending:
+                if app.dir_name in keyed:
+                    key, module_name, dist_path = keyed[app.dir_name]
+                    cache.store(key, module_name, dist_path, assets_dir)
+        else:
+            # Nothing to build; bench build would also have linked sites/assets/<app> to each app's public dir
+            self.printer.change_head("All app assets restored from cache, linking asset dirs")
+            link_assets = "import frappe, frappe.build; frappe.init(''); frappe.build.make_asset_dirs()"
+            self.runner.run(
+                ["../env/bin/python", "-c", link_assets],
+                bench_directory,
+                capture_output=False,
+                workdir=self.runner.workdir_for_sites(bench_directory),
+            )
+
+        cache.prune()
+
     def run_bench_migrate(self, bench_directory: BenchDirectory, bench_cli: str) -> None:
         if not self.config.switch.migrate:
             self.printer.print("Skipped. Bench migrate")
@@ -462,14 +875,18 @@ class BenchService:
     def bench_symlink(self, bench_path: Path, bench_directory: BenchDirectory):
         self.printer.change_head("Symlinking")
 
-        if bench_path.is_symlink():
-            bench_path.unlink()
-        elif bench_path.is_dir():
+        if bench_path.is_dir() and not bench_path.is_symlink():
             shutil.rmtree(bench_path)
-        elif bench_path.exists():
-            bench_path.unlink()
 
-        bench_path.symlink_to(get_relative_path(bench_path, bench_directory.path), True)
+        # Build the link next to bench_path and rename it over the old one, so bench_path
+        # always resolves to either the old or the new release.
+        tmp_link = bench_path.with_name(f".{bench_path.name}.{uuid.uuid4().hex[:6]}")
+        tmp_link.symlink_to(get_relative_path(bench_path, bench_directory.path), True)
+        try:
+            os.replace(tmp_link, bench_path)
+        except OSError:
+            tmp_link.unlink(missing_ok=True)
+            raise
 
     def bench_restart(
         self,
@@ -489,6 +906,7 @@ class BenchService:
         worker_kill_timeout: int = 15,
         worker_kill_poll: float = 3.0,
         maintenance_phases: Optional[list] = None,
+        before_hooks: bool = True,
     ):
         self.printer.change_head("Restart and Migrate")
 
@@ -522,31 +940,13 @@ class BenchService:
             for phase in maintenance_phases:
                 args += ["--maintenance-mode", phase]
 
-        if self.config.switch.host_before_restart:
-            self._run_script(
-                self.config.switch.host_before_restart,
-                bench_directory,
-                current,
-                bench_path,
-                site_name,
-                host_run,
-                "host pre-restart",
-            )
-
-        if self.config.switch.before_restart:
-            self._run_script(
-                self.config.switch.before_restart,
-                bench_directory,
-                current,
-                bench_path,
-                site_name,
-                host_run,
-                "container pre-restart",
-                container=True,
-            )
+        if before_hooks:
+            self._run_restart_hooks("before", bench_directory, current, bench_path, site_name, host_run)
 
         start_time = time.time()
 
+        if self.config.switch.hot_reload:
+            self.runner.run(["sh", "-c", STOP_HOT_RELOAD_MASTERS], bench_directory, capture_output=True)
         self.runner.restart_services(args, bench_directory)
 
         if self.config.verbose:
@@ -558,25 +958,176 @@ class BenchService:
         self.printer.start("Working")
         self.printer.print("Symlinked and restarted")
 
-        if self.config.switch.after_restart:
+        self._run_restart_hooks("after", bench_directory, current, bench_path, site_name, host_run)
+
+    def _run_restart_hooks(
+        self,
+        phase: str,
+        bench_directory: BenchDirectory,
+        current: BenchDirectory,
+        bench_path: Path,
+        site_name: str,
+        host_run: Callable,
+    ) -> None:
+        d = self.config.switch
+        if phase == "before":
+            hooks = [
+                (d.host_before_restart, "host pre-restart", False),
+                (d.before_restart, "container pre-restart", True),
+            ]
+        else:
+            hooks = [
+                (d.after_restart, "container post-restart", True),
+                (d.host_after_restart, "host post-restart", False),
+            ]
+
+        for script, script_type, container in hooks:
+            if not script:
+                continue
             self._run_script(
-                self.config.switch.after_restart,
-                bench_directory,
-                current,
-                bench_path,
-                site_name,
-                host_run,
-                "container post-restart",
-                container=True,
+                script, bench_directory, current, bench_path, site_name, host_run, script_type, container=container
             )
 
-        if self.config.switch.host_after_restart:
-            self._run_script(
-                self.config.switch.host_after_restart,
+    def bench_hot_reload(
+        self,
+        bench_directory: BenchDirectory,
+        bench_path: Path,
+        current: BenchDirectory,
+        site_name: str,
+        host_run: Callable,
+    ) -> Optional[dict]:
+        """Reload the running services onto the swapped release without a full restart.
+
+        Runs ``hot_reload.py`` in the frappe service: gunicorn is upgraded in place with
+        ``USR2`` to a master checked to run from the swapped release, then worker services
+        are restarted one at a time. Returns its report, or None when the reload didn't
+        complete, in which case the caller should fall back to ``bench_restart`` without
+        running the pre-restart hooks again.
+        """
+        d = self.config.switch
+        self.printer.change_head("Upgrading gunicorn and restarting workers one queue at a time")
+        self._run_restart_hooks("before", bench_directory, current, bench_path, site_name, host_run)
+
+        workdir = self.runner.workdir_for_bench(bench_directory)
+        script = bench_directory.path / ".fmd-hot-reload.py"
+        shutil.copy2(Path(__file__).parent.parent / "hot_reload.py", script)
+        command = [
+            f"{workdir}/env/bin/python",
+            f"{workdir}/{script.name}",
+            "--site",
+            site_name,
+            "--bench",
+            workdir,
+            "--timeout",
+            str(d.hot_reload_timeout),
+            "--worker-order",
+            *d.hot_reload_worker_order,
+        ]
+        try:
+            output = self.runner.run(command, bench_directory, capture_output=True)
+        except Exception as e:
+            output = getattr(e, "output", None)
+        finally:
+            script.unlink(missing_ok=True)
+
+        lines = [line for line in (getattr(output, "stdout", None) or []) if line.strip()]
+        try:
+            report = json.loads(lines[-1])
+        except (IndexError, ValueError):
+            report = {"ok": False, "error": "hot_reload.py produced no result"}
+        if not report.get("ok"):
+            self.printer.warning(f"Hot reload failed: {report.get('error')}")
+            return None
+
+        self.printer.print(f"Upgraded {', '.join(report['web']['programs'])} in {report['web']['seconds']}s")
+        for service, seconds in report["workers"].items():
+            self.printer.print(f"Restarted {service} in {seconds}s")
+        self._run_restart_hooks("after", bench_directory, current, bench_path, site_name, host_run)
+        return report
+
+    def _run_queue_drain(self, bench_directory: BenchDirectory, mode: str, *args: str) -> dict:
+        """Run ``queue_drain.py`` from the sites directory and return its JSON result."""
+        script = bench_directory.sites / ".fmd-queue-drain.py"
+        shutil.copy2(Path(__file__).parent.parent / "queue_drain.py", script)
+        try:
+            output = self.runner.run(
+                ["../env/bin/python", script.name, mode, *args],
                 bench_directory,
-                current,
-                bench_path,
-                site_name,
-                host_run,
-                "host post-restart",
+                capture_output=True,
+                workdir=self.runner.workdir_for_sites(bench_directory),
             )
+        finally:
+            script.unlink(missing_ok=True)
+        lines = [line for line in (getattr(output, "stdout", None) or []) if line.strip()]
+        try:
+            return json.loads(lines[-1])
+        except (IndexError, ValueError):
+            raise RuntimeError(f"queue_drain.py {mode} produced no result")
+
+    def bench_suspend_workers(self, bench_directory: BenchDirectory) -> dict:
+        """Suspend the RQ workers and report what they still have to finish.
+
+        Suspended workers complete the job they're running and take no new ones; enqueued
+        jobs wait in Redis until ``bench_resume_workers``. Returns the queue status with
+        per-queue depth, running jobs and the drain estimate from recent job durations.
+        """
+        self.printer.change_head("Suspending background workers")
+        self._run_queue_drain(bench_directory, "suspend")
+        status = self._run_queue_drain(bench_directory, "status")
+        for queue in status["queues"]:
+            self.printer.print(f"Queue {queue['name']}: {queue['depth']} queued, {len(queue['running'])} running")
+            for job in queue["running"]:
+                remaining = "unknown" if job["remaining"] is None else f"~{job['remaining']:.0f}s"
+                self.printer.print(f"  {job['kind']} running {job['elapsed']:.0f}s, remaining {remaining}")
+        self.printer.print(
+            f"{len(status['busy_workers'])}/{status['workers']} workers busy, "
+            f"estimated drain {status['estimate_seconds']:.0f}s"
+        )
+        return status
+
+    def bench_wait_workers_idle(self, bench_directory: BenchDirectory, timeout: float, poll: float) -> dict:
+        """Block until no RQ worker is busy or ``timeout`` passes; the result says which."""
+        self.printer.change_head(f"Waiting up to {timeout:.0f}s for workers to finish their jobs")
+        result = self._run_queue_drain(bench_directory, "wait", "--timeout", str(timeout), "--poll", str(poll))
+        for worker in result["released"]:
+            self.printer.print(f"Worker {worker['name']} idle after {worker['after']}s")
+        if result["idle"]:
+            self.printer.print(f"Workers idle after {result['waited']}s")
+        else:
+            busy = ", ".join(f"{worker['name']} ({worker['job']})" for worker in result["busy_workers"])
+            self.printer.warning(f"Workers still busy after {result['waited']}s, restarting anyway: {busy}")
+        return result
+
+    def bench_resume_workers(self, bench_directory: BenchDirectory) -> None:
+        self._run_queue_drain(bench_directory, "resume")
+        self.printer.print("Background workers resumed")
+
+    def prepare_timed_migrate(self, bench_directory: BenchDirectory, site_name: str) -> str:
+        """Copy ``migrate_timed.py`` into the bench and return the fmx migrate command that runs it.
+
+        The script writes its per-phase timings to ``MIGRATE_REPORT``; read them back with
+        ``collect_migrate_report`` once the restart is done.
+        """
+        workdir = self.runner.workdir_for_bench(bench_directory)
+        shutil.copy2(Path(__file__).parent.parent / "migrate_timed.py", bench_directory.path / MIGRATE_SCRIPT)
+        (bench_directory.path / MIGRATE_REPORT).unlink(missing_ok=True)
+        return (
+            f"{workdir}/env/bin/python {workdir}/{MIGRATE_SCRIPT} --sites {workdir}/sites "
+            f"--site {site_name} --report {workdir}/{MIGRATE_REPORT}"
+        )
+
+    def collect_migrate_report(self, bench_directory: BenchDirectory) -> Optional[dict]:
+        (bench_directory.path / MIGRATE_SCRIPT).unlink(missing_ok=True)
+        report_path = bench_directory.path / MIGRATE_REPORT
+        try:
+            report = json.loads(report_path.read_text())
+        except (OSError, ValueError):
+            return None
+        finally:
+            report_path.unlink(missing_ok=True)
+
+        for phase, seconds in report.get("phases", {}).items():
+            self.printer.print(f"Migrate {phase}: {seconds}s")
+        for patch, seconds in report.get("slowest_patches", [])[:3]:
+            self.printer.print(f"Slow patch {patch}: {seconds}s")
+        return report
@@ -0,0 +1,220 @@
+import json
+import re
+import shlex
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from fmd.release_directory import BenchDirectory
+from fmd.tracing import traced_service
+
+BLUE_PORT = 80
+GREEN_PID_FILE = "/tmp/fmd-green-gunicorn.pid"
+PROBE_SCRIPT = ".fmd-probe.py"
+PROBE_OUTPUT = ".fmd-switch-probe.jsonl"
+PROBE_STOP = ".fmd-switch-probe.stop"
+
+# The frappe upstream in the nginx service's generated site config.
+_FRAPPE_UPSTREAM = re.compile(r"\bfrappe:(\d+)\b")
+# nginx finishes in-flight requests on old workers; give new workers a moment to take over.
+_NGINX_RELOAD_SETTLE = 1.0
+
+
+class BlueGreenUnavailable(Exception):
+    pass
+
+
+@dataclass
+class SwitchProbe:
+    release: BenchDirectory
+
+    @property
+    def output(self) -> Path:
+        return self.release.path / PROBE_OUTPUT
+
+    @property
+    def stop_file(self) -> Path:
+        return self.release.path / PROBE_STOP
+
+
+def unavailability_report(samples: list[dict]) -> dict:
+    """Summarize probe samples: the longest run of failed requests, measured up to the next success."""
+    report = {"probes": len(samples), "failed_probes": 0, "unavailable_ms": 0, "max_latency_ms": 0}
+    window_start: Optional[float] = None
+    for sample in samples:
+        report["max_latency_ms"] = max(report["max_latency_ms"], round(sample.get("ms", 0)))
+        if not sample.get("ok"):
+            report["failed_probes"] += 1
+            if window_start is None:
+                window_start = sample["t"]
+            continue
+        if window_start is not None:
+            report["unavailable_ms"] = max(report["unavailable_ms"], round((sample["t"] - window_start) * 1000))
+            window_start = None
+    if window_start is not None and samples:
+        last = samples[-1]
+        report["unavailable_ms"] = max(
+            report["unavailable_ms"], round((last["t"] - window_start) * 1000 + last.get("ms", 0))
+        )
+    return report
+
+
+@traced_service
+class BlueGreenService:
+    """Runs a second gunicorn for the new release and moves nginx traffic between it and the bench's own.
+
+    The green gunicorn serves the new release from its own path on ``blue_green_port`` while
+    the supervisor-managed services restart onto the new release; nginx's frappe upstream is
+    pointed at green for that window and back once the restarted web server is healthy.
+    """
+
+    def __init__(self, runner: Any, host_runner: Any, config: Any, printer: Any):
+        self.runner = runner
+        self.host_runner = host_runner
+        self.config = config
+        self.printer = printer
+
+    @property
+    def _compose_file(self) -> Path:
+        return self.config.workspace_root / "docker-compose.yml"
+
+    @property
+    def _nginx_site_conf(self) -> Path:
+        return self.config.workspace_root / "configs" / "nginx" / "conf" / "conf.d" / "default.conf"
+
+    def _container_path(self, release: BenchDirectory, *parts: str) -> str:
+        return "/".join([self.runner.workdir_for_bench(release), *parts])
+
+    def _install_probe_script(self, release: BenchDirectory) -> str:
+        shutil.copy2(Path(__file__).parent.parent / "blue_green_probe.py", release.path / PROBE_SCRIPT)
+        return self._container_path(release, PROBE_SCRIPT)
+
+    def _run_detached(self, release: BenchDirectory, command: list[str], log: str, env: Optional[dict] = None):
+        script = f"nohup setsid {shlex.join(command)} > {shlex.quote(log)} 2>&1 < /dev/null &"
+        self.runner.run(["bash", "-c", script], release, capture_output=True, env=env)
+
+    def check_available(self) -> None:
+        if getattr(self.runner, "mode", None) != "exec":
+            raise BlueGreenUnavailable("blue/green needs the frappe service running (exec mode)")
+        conf = self._nginx_site_conf
+        if not conf.is_file():
+            raise BlueGreenUnavailable(f"nginx site config not found at {conf}")
+        if not _FRAPPE_UPSTREAM.search(conf.read_text()):
+            raise BlueGreenUnavailable(f"no frappe upstream found in {conf}")
+
+    def start_probe(self, release: BenchDirectory, site_name: str) -> SwitchProbe:
+        probe = SwitchProbe(release)
+        probe.output.unlink(missing_ok=True)
+        probe.stop_file.unlink(missing_ok=True)
+        script = self._install_probe_script(release)
+        d = self.config.switch
+        self._run_detached(
+            release,
+            [
+                self._container_path(release, "env", "bin", "python"),
+                script,
+                "watch",
+                d.blue_green_probe_url,
+                "--host",
+                site_name,
+                "--interval",
+                str(d.blue_green_probe_interval),
+                "--output",
+                self._container_path(release, PROBE_OUTPUT),
+                "--stop-file",
+                self._container_path(release, PROBE_STOP),
+            ],
+            "/dev/null",
+        )
+        return probe
+
+    def stop_probe(self, probe: SwitchProbe) -> dict:
+        probe.stop_file.touch()
+        time.sleep(self.config.switch.blue_green_probe_interval * 2)
+        samples = []
+        if probe.output.is_file():
+            for line in probe.output.read_text().splitlines():
+                try:
+                    samples.append(json.loads(line))
+                except ValueError:
+                    continue
+        for path in (probe.output, probe.stop_file, probe.release.path / PROBE_SCRIPT):
+            path.unlink(missing_ok=True)
+        return unavailability_report(samples)
+
+    def start_green(self, release: BenchDirectory) -> None:
+        """Start gunicorn for ``release`` from its own path, ahead of the symlink swap."""
+        d = self.config.switch
+        self.printer.change_head(f"Starting green gunicorn on port {d.blue_green_port}")
+        # Editable installs point at /workspace/frappe-bench/apps, which still resolves to
+        # the live release; put the new release's apps first on the path.
+        app_paths = sorted(
+            self._container_path(release, "apps", path.name) for path in release.apps.iterdir() if path.is_dir()
+        )
+        self._run_detached(
+            release,
+            [
+                self._container_path(release, "env", "bin", "gunicorn"),
+                "--chdir",
+                self._container_path(release, "sites"),
+                "--bind",
+                f"0.0.0.0:{d.blue_green_port}",
+                "--workers",
+                str(d.blue_green_workers),
+                "--timeout",
+                "120",
+                "--pid",
+                GREEN_PID_FILE,
+                "--preload",
+                "frappe.app:application",
+            ],
+            "/tmp/fmd-green-gunicorn.log",
+            env={"PYTHONPATH": ":".join(app_paths)},
+        )
+
+    def wait_healthy(self, release: BenchDirectory, site_name: str, port: int) -> None:
+        d = self.config.switch
+        self.printer.change_head(f"Waiting for port {port} to answer /api/method/ping")
+        self.runner.run(
+            [
+                self._container_path(release, "env", "bin", "python"),
+                self._install_probe_script(release),
+                "wait",
+                f"http://127.0.0.1:{port}/api/method/ping",
+                "--host",
+                site_name,
+                "--timeout",
+                str(d.blue_green_health_timeout),
+            ],
+            release,
+            capture_output=True,
+        )
+        self.printer.print(f"Port {port} is healthy")
+
+    def stop_green(self, release: BenchDirectory) -> None:
+        self.runner.run(
+            ["bash", "-c", f"test -f {GREEN_PID_FILE} && kill -TERM $(cat {GREEN_PID_FILE}) || true"],
+            release,
+            capture_output=True,
+        )
+        self.printer.print("Stopped green gunicorn")
+
+    def route(self, port: int) -> None:
+        """Point nginx's frappe upstream at ``port`` and reload nginx gracefully."""
+        conf = self._nginx_site_conf
+        text = conf.read_text()
+        routed = _FRAPPE_UPSTREAM.sub(f"frappe:{port}", text)
+        if routed == text:
+            return
+        conf.write_text(routed)
+        compose = ["docker", "compose", "-f", str(self._compose_file), "exec", "-T", "nginx"]
+        try:
+            self.host_runner.run_cmd(compose + ["nginx", "-t", "-q"])
+            self.host_runner.run_cmd(compose + ["nginx", "-s", "reload"])
+        except Exception:
+            conf.write_text(text)
+            raise
+        time.sleep(_NGINX_RELOAD_SETTLE)
+        self.printer.print(f"nginx now routes to frappe:{port}")
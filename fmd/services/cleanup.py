@@ -3,8 +3,12 @@ import importlib
 import shutil
 from typing import Any
 
-from fmd.consts import BACKUP_DIR_NAME, RELEASE_DIR_NAME
+from fmd.backup_store import BackupStore
+from fmd.consts import BACKUP_DIR_NAME, RELEASE_DIR_NAME, RUNTIME_STORE_DIR_NAME
 from fmd.runner.base import is_ci
+from fmd.runtime_store import RuntimeStore
+from fmd.services.backup import parallel_backup_dependencies
+from fmd.tracing import traced_service
 
 _rich = None
 try:
@@ -40,6 +44,7 @@ except Exception:
             pass
 
 
+@traced_service
 class CleanupService:
     def __init__(self, runner: Any, host_runner: Any, config: Any, printer: Any):
         self.runner = runner
@@ -93,6 +98,17 @@ class CleanupService:
             shutil.rmtree(d)
             self.printer.print(f"Removed old release: {d.name}")
 
+        self.gc_runtime_store(workspace)
+
+    def gc_runtime_store(self, workspace: Path) -> None:
+        store = RuntimeStore(workspace / RUNTIME_STORE_DIR_NAME)
+        releases = [d for d in workspace.iterdir() if d.is_dir() and d.name.startswith(RELEASE_DIR_NAME)]
+        for entry in store.gc(releases):
+            self.printer.print(f"Removed unused runtime: {entry}")
+
+    def gc_backup_store(self, workspace_root: Path) -> tuple[int, int]:
+        return BackupStore.for_workspace(workspace_root).gc()
+
     def cleanup_workspace_cache(
         self,
         workspace_root: Path,
@@ -180,6 +196,11 @@ class CleanupService:
             except Exception as e:
                 console.print(f"[red]Failed to remove {prev_bench.absolute()}: {str(e)}[/red]")
 
+        def backups_needed_by(backup_dirs: list[Path], removing: list[Path]) -> set[Path]:
+            # Incremental backups read unchanged tables from earlier ones, which must stay.
+            return parallel_backup_dependencies([d for d in backup_dirs if d not in removing])
+
+        needed_message = "a kept incremental backup reads tables from it"
         backup_dir = workspace_root / BACKUP_DIR_NAME
 
         if backup_dir.exists():
@@ -202,9 +223,13 @@ class CleanupService:
                             backups_to_remove,
                             f"Backup directories to clean (keeping {backup_retain_limit} most recent)",
                         )
+                        needed = backups_needed_by(backup_dirs, [backups_to_remove[i] for i in selected_indices])
 
                         for idx in selected_indices:
                             backup_to_remove = backups_to_remove[idx]
+                            if backup_to_remove.resolve() in needed:
+                                console.print(f"[yellow]Keeping {backup_to_remove.name}: {needed_message}[/yellow]")
+                                continue
                             try:
                                 if auto_approve or Confirm.ask(f"Delete backup directory: {backup_to_remove.name}?"):
                                     shutil.rmtree(backup_to_remove)
@@ -216,9 +241,13 @@ class CleanupService:
                     selected_indices = get_selected_indices(
                         backup_dirs, "Backup directories to clean (no retention limit)"
                     )
+                    needed = backups_needed_by(backup_dirs, [backup_dirs[i] for i in selected_indices])
 
                     for idx in selected_indices:
                         backup_to_remove = backup_dirs[idx]
+                        if backup_to_remove.resolve() in needed:
+                            console.print(f"[yellow]Keeping {backup_to_remove.name}: {needed_message}[/yellow]")
+                            continue
                         try:
                             if auto_approve or Confirm.ask(f"Delete backup directory: {backup_to_remove.name}?"):
                                 shutil.rmtree(backup_to_remove)
@@ -228,6 +257,31 @@ class CleanupService:
         else:
             console.print("\n[blue]No backup directory exists - already clean[/blue]")
 
+        store = BackupStore.for_workspace(workspace_root)
+        snapshots = [store.snapshot_path(snapshot["name"]) for snapshot in store.snapshots()]
+        if not snapshots:
+            console.print("\n[blue]No backups in the backup store - already clean[/blue]")
+        else:
+            if backup_retain_limit > 0:
+                snapshots_to_remove = snapshots[backup_retain_limit:]
+                title = f"Backup store backups to clean (keeping {backup_retain_limit} most recent)"
+            else:
+                snapshots_to_remove = snapshots
+                title = "Backup store backups to clean (no retention limit)"
+            for idx in get_selected_indices(snapshots_to_remove, title):
+                name = snapshots_to_remove[idx].stem
+                try:
+                    if auto_approve or Confirm.ask(f"Delete backup {name} from the backup store?"):
+                        store.remove(name)
+                        console.print(f"[green]Removed backup {name} from the backup store[/green]")
+                except Exception as e:
+                    console.print(f"[red]Failed to remove {name}: {str(e)}[/red]")
+            try:
+                count, size = self.gc_backup_store(workspace_root)
+                console.print(f"[green]Removed {count} unreferenced chunks ({size / 1024 / 1024:.1f} MB)[/green]")
+            except Exception as e:
+                console.print(f"[red]Failed to garbage-collect the backup store: {str(e)}[/red]")
+
         current_release = bench_path.resolve()
         workspace = workspace_root / "workspace"
         release_dirs = [d for d in workspace.iterdir() if d.is_dir() and d.name.startswith(RELEASE_DIR_NAME)]
@@ -286,3 +340,5 @@ class CleanupService:
                                 console.print(f"[green]Removed release directory: {release_to_remove.name}[/green]")
                         except Exception as e:
                             console.print(f"[red]Failed to remove release {release_to_remove.name}: {str(e)}[/red]")
+
+        self.gc_runtime_store(workspace)
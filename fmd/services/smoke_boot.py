@@ -0,0 +1,123 @@
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from fmd.release_directory import BenchDirectory
+from fmd.tracing import traced_service
+
+SMOKE_DIR = ".fmd-smoke"
+SMOKE_SCRIPT = "smoke_boot.py"
+_REDIS_KEYS = ("redis_cache", "redis_queue", "redis_socketio")
+
+
+def _isolated_redis_url(url: str, db: int) -> str:
+    parts = urlsplit(url)
+    return urlunsplit(parts._replace(path=f"/{db}"))
+
+
+@traced_service
+class SmokeBootService:
+    """Boots a freshly built release in a throwaway container before it can be switched to.
+
+    The container runs the runner image with the release mounted, so import errors and a
+    broken venv show up at create time instead of during the switch's restart. When the
+    bench's frappe service is running, the container joins its network namespace and
+    gunicorn boots against a copy of the site's config with read-only maintenance mode on
+    and Redis moved to a spare database, so it can answer ``/api/method/ping`` without
+    writing to the live site.
+    """
+
+    def __init__(self, runner: Any, host_runner: Any, config: Any, printer: Any):
+        self.runner = runner
+        self.host_runner = host_runner
+        self.config = config
+        self.printer = printer
+
+    def _frappe_container(self) -> Optional[str]:
+        compose_file = self.config.workspace_root / "docker-compose.yml"
+        if not compose_file.is_file():
+            return None
+        try:
+            output = self.host_runner.run_cmd(["docker", "compose", "-f", str(compose_file), "ps", "-q", "frappe"])
+        except Exception:
+            return None
+        ids = [line.strip() for line in (getattr(output, "stdout", None) or []) if line.strip()]
+        return ids[0] if ids else None
+
+    def _prepare_sites(self, release: BenchDirectory, data: BenchDirectory, site_name: str) -> tuple[Path, bool]:
+        """Write the sites directory gunicorn boots against; returns it and whether a site config was found."""
+        d = self.config.release
+        sites = release.path / SMOKE_DIR / "sites"
+        shutil.rmtree(sites.parent, ignore_errors=True)
+        sites.mkdir(parents=True)
+        shutil.copy2(Path(__file__).parent.parent / SMOKE_SCRIPT, sites.parent / SMOKE_SCRIPT)
+        shutil.copy2(release.sites / "apps.txt", sites / "apps.txt")
+
+        common = json.loads(release.common_site_config.read_text()) if release.common_site_config.is_file() else {}
+        for key in _REDIS_KEYS:
+            if common.get(key):
+                common[key] = _isolated_redis_url(common[key], d.smoke_boot_redis_db)
+        (sites / "common_site_config.json").write_text(json.dumps(common, indent=2))
+
+        site_config_path = data.sites / site_name / "site_config.json"
+        site_config = json.loads(site_config_path.read_text()) if site_config_path.is_file() else {}
+        site_config.update({"maintenance_mode": 1, "allow_reads_during_maintenance": 1, "pause_scheduler": 1})
+        (sites / site_name).mkdir()
+        (sites / site_name / "site_config.json").write_text(json.dumps(site_config, indent=2))
+        return sites, site_config_path.is_file()
+
+    def boot(self, release: BenchDirectory, data: BenchDirectory, site_name: str) -> dict:
+        """Boot ``release``; the report's ``passed`` says whether it imported and served requests."""
+        d = self.config.release
+        self.printer.change_head("Smoke booting release in a throwaway container")
+        sites, has_site_config = self._prepare_sites(release, data, site_name)
+        container = self._frappe_container() if has_site_config else None
+        ping = container is not None
+        if not ping:
+            self.printer.warning("No running frappe service or site config found, smoke boot won't reach the database")
+
+        mount = "/workspace/frappe-bench"
+        command = [
+            f"{mount}/env/bin/python",
+            f"{mount}/{SMOKE_DIR}/{SMOKE_SCRIPT}",
+            "--sites",
+            f"{mount}/{SMOKE_DIR}/sites",
+            "--site",
+            site_name,
+            "--port",
+            str(d.smoke_boot_port),
+            "--timeout",
+            str(d.smoke_boot_timeout),
+        ]
+        if ping:
+            command.append("--ping")
+
+        try:
+            try:
+                output = self.runner.run_isolated(
+                    command, release, network=f"container:{container}" if container else None
+                )
+            except Exception as e:
+                output = getattr(e, "output", None)
+                if output is None:
+                    raise
+            lines = [line for line in (getattr(output, "stdout", None) or []) if line.strip()]
+            try:
+                report = json.loads(lines[-1])
+            except (IndexError, ValueError):
+                stderr = "\n".join(getattr(output, "stderr", None) or [])[-2000:]
+                report = {"passed": False, "ping": ping, "errors": [f"smoke boot produced no result: {stderr}"]}
+        finally:
+            shutil.rmtree(sites.parent, ignore_errors=True)
+
+        if report["passed"]:
+            self.printer.print(
+                f"Smoke boot passed in {report['boot_seconds']}s, worker RSS {report['worker_rss_mb']}MB"
+                + ("" if ping else " (database not reached)")
+            )
+        else:
+            for error in report["errors"]:
+                self.printer.warning(f"Smoke boot: {error}")
+        return report
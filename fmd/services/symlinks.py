@@ -5,6 +5,7 @@ from typing import Any
 from fmd.release_directory import BenchDirectory
 from fmd.helpers import get_relative_path
 from fmd.consts import DATA_DIR_NAME
+from fmd.tracing import traced_service
 
 
 def _replace_with_symlink(path: Path, target: Path, target_is_directory: bool):
@@ -17,6 +18,7 @@ def _replace_with_symlink(path: Path, target: Path, target_is_directory: bool):
     path.symlink_to(target, target_is_directory)
 
 
+@traced_service
 class SymlinkService:
     def __init__(self, runner: Any, host_runner: Any, config: Any, printer: Any):
         self.runner = runner
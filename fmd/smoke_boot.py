@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Boot a release in a throwaway container, run by ``SmokeBootService``.
+
+Imports frappe and every app in apps.txt, starts one gunicorn worker against the given
+sites directory and waits for it to answer. With ``--ping`` the worker must answer
+``/api/method/ping`` with 200, which needs the database; without it any HTTP response
+counts as booted. Prints one JSON line with the timings, the worker's memory and
+whether the boot passed.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import traceback
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+
+def import_apps(apps: list[str]) -> tuple[dict, list[str]]:
+    timings, errors = {}, []
+    for app in apps:
+        start = time.time()
+        try:
+            importlib.import_module(app)
+            importlib.import_module(f"{app}.hooks")
+        except Exception:
+            errors.append(f"import {app}: {traceback.format_exc(limit=3).strip()}")
+        timings[app] = round(time.time() - start, 3)
+    return timings, errors
+
+
+def request(url: str, host: str) -> int:
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers={"Host": host}), timeout=5) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except Exception:
+        return 0
+
+
+def children(pid: int) -> list[int]:
+    pids = []
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if int(fields[1]) == pid:
+            pids.append(int(stat.parent.name))
+    return pids
+
+
+def rss_mb(pid: int) -> float:
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return 0.0
+
+
+def boot(args) -> dict:
+    result: dict = {"passed": False, "ping": args.ping, "errors": []}
+    start = time.time()
+
+    apps = [line.strip() for line in Path(args.sites, "apps.txt").read_text().splitlines() if line.strip()]
+    result["import_seconds"], errors = import_apps(apps)
+    result["errors"] += errors
+    if errors:
+        return result
+
+    log_path = Path(args.sites) / "smoke-gunicorn.log"
+    with open(log_path, "w") as log:
+        gunicorn = subprocess.Popen(
+            [
+                str(Path(sys.executable).parent / "gunicorn"),
+                "--chdir",
+                args.sites,
+                "--bind",
+                f"127.0.0.1:{args.port}",
+                "--workers",
+                "1",
+                "--timeout",
+                "120",
+                "frappe.app:application",
+            ],
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+    try:
+        url = f"http://127.0.0.1:{args.port}/api/method/ping"
+        deadline = start + args.timeout
+        status = 0
+        while time.time() < deadline and gunicorn.poll() is None:
+            status = request(url, args.site)
+            if status == 200 or (status and not args.ping):
+                break
+            time.sleep(0.5)
+
+        result["status"] = status
+        result["boot_seconds"] = round(time.time() - start, 3)
+        workers = children(gunicorn.pid)
+        result["worker_rss_mb"] = max((rss_mb(pid) for pid in workers), default=0.0)
+        result["master_rss_mb"] = rss_mb(gunicorn.pid)
+
+        if gunicorn.poll() is not None:
+            result["errors"].append(f"gunicorn exited with {gunicorn.returncode}")
+        elif status == 200 or (status and not args.ping):
+            result["passed"] = True
+        else:
+            result["errors"].append(f"{url} answered {status or 'nothing'} within {args.timeout}s")
+    finally:
+        if gunicorn.poll() is None:
+            os.killpg(gunicorn.pid, signal.SIGTERM)
+            try:
+                gunicorn.wait(10)
+            except subprocess.TimeoutExpired:
+                os.killpg(gunicorn.pid, signal.SIGKILL)
+
+    if not result["passed"]:
+        result["gunicorn_log"] = log_path.read_text(errors="replace")[-4000:]
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sites", required=True, help="Sites directory to boot against.")
+    parser.add_argument("--site", required=True, help="Site name, sent as the Host header.")
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--ping", action="store_true", help="Require /api/method/ping to answer 200.")
+    args = parser.parse_args()
+
+    result = boot(args)
+    print(json.dumps(result))
+    return 0 if result["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
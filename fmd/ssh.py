@@ -4,6 +4,8 @@ import subprocess
 import time
 from typing import Optional
 
+from fmd.tracing import get_tracer
+
 
 class SSHClient:
     def __init__(self, host: str, user: str, port: int = 22) -> None:
@@ -79,12 +81,16 @@ class SSHClient:
         self._log_command(remote_cmd)
         start = time.time()
 
-        proc = subprocess.Popen(
-            self._base_cmd() + [remote_cmd],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        stdout_str, stderr_str = self._stream_output(proc)
+        with get_tracer().span(
+            f"ssh {command.split(' ', 1)[0]}", category="command", command=remote_cmd, mode="ssh", host=self.host
+        ) as span:
+            proc = subprocess.Popen(
+                self._base_cmd() + [remote_cmd],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            stdout_str, stderr_str = self._stream_output(proc)
+            span.set(exit_code=proc.returncode, output_bytes=len(stdout_str.encode()) + len(stderr_str.encode()))
 
         self._log_timing(start, remote_cmd, "ssh")
 
@@ -111,8 +117,10 @@ class SSHClient:
         self._log_command(label, "RSYNC")
         start = time.time()
 
-        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        _, stderr_str = self._stream_output(proc)
+        with get_tracer().span("rsync", category="command", command=label, mode="rsync", host=self.host) as span:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            stdout_str, stderr_str = self._stream_output(proc)
+            span.set(exit_code=proc.returncode, output_bytes=len(stdout_str.encode()) + len(stderr_str.encode()))
 
         self._log_timing(start, f"{self.user}@{self.host}:{remote_dest}", "rsync")
 
@@ -0,0 +1,267 @@
+import contextvars
+import functools
+import json
+import os
+import secrets
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from fmd.logger import get_logger
+
+OK = "ok"
+ERROR = "error"
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("_current_span", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    category: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    thread_id: int
+    thread_name: str
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    status: str = OK
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update({k: v for k, v in attributes.items() if v is not None})
+
+    def add_output(self, nbytes: int) -> None:
+        self.attributes["output_bytes"] = self.attributes.get("output_bytes", 0) + nbytes
+
+    @property
+    def duration(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+
+class Tracer:
+    """Collects spans for one fmd invocation.
+
+    Spans nest through a context variable, so a span opened in a pipeline stage thread is
+    parented to the span that was current when the stage was submitted. Spans are always
+    recorded; ``export`` writes them out only when a Chrome trace path or an OTLP target
+    has been configured.
+    """
+
+    def __init__(self, service_name: str = "fmd") -> None:
+        self.service_name = service_name
+        self.trace_id = secrets.token_hex(16)
+        self.spans: list[Span] = []
+        self.chrome_path: Optional[Path] = None
+        self.otlp_target: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def configure(self, chrome_path: Optional[Path] = None, otlp_target: Optional[str] = None) -> None:
+        self.chrome_path = chrome_path
+        self.otlp_target = otlp_target
+
+    @property
+    def enabled(self) -> bool:
+        return self.chrome_path is not None or self.otlp_target is not None
+
+    def current(self) -> Optional[Span]:
+        return _current_span.get()
+
+    @contextmanager
+    def span(self, name: str, category: str = "fmd", **attributes: Any) -> Iterator[Span]:
+        parent = _current_span.get()
+        thread = threading.current_thread()
+        span = Span(
+            name=name,
+            category=category,
+            trace_id=self.trace_id,
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            thread_id=thread.ident or 0,
+            thread_name=thread.name,
+        )
+        span.set(**attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = ERROR
+            span.set(error=f"{type(e).__name__}: {e}"[:500])
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            with self._lock:
+                self.spans.append(span)
+
+    def to_chrome_trace(self) -> dict:
+        """Trace Event Format, loadable in chrome://tracing and Perfetto."""
+        pid = os.getpid()
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start_ns)
+
+        tids: dict[int, int] = {}
+        events: list[dict] = []
+        for span in spans:
+            if span.thread_id not in tids:
+                tids[span.thread_id] = len(tids) + 1
+                events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": pid,
+                        "tid": tids[span.thread_id],
+                        "args": {"name": span.thread_name},
+                    }
+                )
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": span.start_ns / 1000,
+                    "dur": ((span.end_ns or span.start_ns) - span.start_ns) / 1000,
+                    "pid": pid,
+                    "tid": tids[span.thread_id],
+                    "args": {**span.attributes, "status": span.status},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_otlp(self) -> dict:
+        """OTLP/HTTP JSON body (``ExportTraceServiceRequest``)."""
+        from fmd.__about__ import __version__
+
+        with self._lock:
+            spans = list(self.spans)
+
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "fmd", "version": __version__},
+                            "spans": [_otlp_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def export(self) -> list[str]:
+        """Write the configured exports; returns where the trace went."""
+        if not self.enabled or not self.spans:
+            return []
+
+        written = []
+        if self.chrome_path is not None:
+            self.chrome_path.parent.mkdir(parents=True, exist_ok=True)
+            self.chrome_path.write_text(json.dumps(self.to_chrome_trace()))
+            written.append(str(self.chrome_path))
+
+        if self.otlp_target is not None:
+            body = json.dumps(self.to_otlp()).encode()
+            if self.otlp_target.startswith(("http://", "https://")):
+                request = urllib.request.Request(
+                    self.otlp_target, data=body, headers={"Content-Type": "application/json"}, method="POST"
+                )
+                try:
+                    with urllib.request.urlopen(request, timeout=10):
+                        pass
+                    written.append(self.otlp_target)
+                except Exception as e:
+                    get_logger().warning(f"TRACE: failed to send OTLP trace to {self.otlp_target}: {e}")
+            else:
+                path = Path(self.otlp_target)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(body)
+                written.append(str(path))
+
+        for target in written:
+            get_logger().info(f"TRACE: {len(self.spans)} spans exported to {target}")
+        return written
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def _otlp_span(span: Span) -> dict:
+    data = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns or span.start_ns),
+        "attributes": _otlp_attributes(
+            {"fmd.category": span.category, "thread.name": span.thread_name, **span.attributes}
+        ),
+        "status": {"code": 2 if span.status == ERROR else 1},
+    }
+    if span.parent_id:
+        data["parentSpanId"] = span.parent_id
+    if span.status == ERROR and "error" in span.attributes:
+        data["status"]["message"] = span.attributes["error"]
+    return data
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def traced(name: Optional[str] = None, category: str = "fmd") -> Callable:
+    """Decorator running the function inside a span named ``name`` (default: its qualified name)."""
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _tracer.span(span_name, category=category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def traced_service(cls: type) -> type:
+    """Class decorator wrapping every public method of a service in a ``service`` span."""
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") or not callable(value) or isinstance(value, (staticmethod, classmethod, type)):
+            continue
+        setattr(cls, attr, traced(f"{cls.__name__}.{attr}", category="service")(value))
+    return cls
+
+
+def command_label(command: list[str]) -> str:
+    """Short span name for a command: the program and its first non-option argument."""
+    if not command:
+        return "command"
+    parts = [os.path.basename(str(command[0]))]
+    for arg in command[1:]:
+        arg = str(arg)
+        if not arg.startswith("-"):
+            parts.append(arg if len(arg) <= 40 else arg[:37] + "...")
+            break
+    return " ".join(parts)
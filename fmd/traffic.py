@@ -0,0 +1,107 @@
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+
+class LogRateSampler:
+    """Counts lines appended to access logs between samples.
+
+    Each log is read from where the previous sample stopped; a log that shrank or was
+    replaced (rotation) is read again from the start.
+    """
+
+    def __init__(self, paths: list[Path]):
+        self.paths = paths
+        self._offsets: dict[Path, tuple[int, int]] = {}
+        for path in paths:
+            self._offsets[path] = self._position(path)
+
+    @staticmethod
+    def _position(path: Path) -> tuple[int, int]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return 0, 0
+        return stat.st_ino, stat.st_size
+
+    def sample(self) -> int:
+        lines = 0
+        for path in self.paths:
+            inode, offset = self._offsets.get(path, (0, 0))
+            new_inode, size = self._position(path)
+            if new_inode != inode or size < offset:
+                offset = 0
+            if size > offset:
+                try:
+                    with open(path, "rb") as f:
+                        f.seek(offset)
+                        lines += f.read(size - offset).count(b"\n")
+                except OSError:
+                    pass
+            self._offsets[path] = (new_inode, size)
+        return lines
+
+
+def find_access_logs(*dirs: Path) -> list[Path]:
+    logs = []
+    for directory in dirs:
+        if directory.is_dir():
+            logs += sorted(path for path in directory.glob("*access*.log") if path.is_file())
+    return logs
+
+
+def wait_for_quiet(
+    sampler: LogRateSampler,
+    config: Any,
+    on_sample: Optional[Callable[[float, float], None]] = None,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> dict:
+    """Block until the request rate is low, returning when and why the wait ended.
+
+    The rate is averaged over the last ``traffic_wait_window`` samples. The wait ends as
+    soon as it drops to ``traffic_wait_threshold`` requests/second; after
+    ``traffic_wait_observe`` seconds it also ends when the rate falls back to the lowest
+    rate seen so far (a local minimum); at ``traffic_wait_max`` it ends regardless.
+    """
+    interval = config.traffic_wait_interval
+    window: deque = deque(maxlen=max(1, config.traffic_wait_window))
+    start = clock()
+    lowest: Optional[float] = None
+    highest = 0.0
+    rate = 0.0
+    reason = "deadline reached"
+
+    while True:
+        sleep(interval)
+        elapsed = clock() - start
+        window.append(sampler.sample() / interval)
+        rate = sum(window) / len(window)
+        highest = max(highest, rate)
+        if on_sample is not None:
+            on_sample(elapsed, rate)
+
+        if rate <= config.traffic_wait_threshold:
+            reason = "below threshold"
+            break
+        if len(window) == window.maxlen:
+            if elapsed >= config.traffic_wait_observe and lowest is not None and rate <= lowest:
+                reason = "local minimum"
+                break
+            lowest = rate if lowest is None else min(lowest, rate)
+        if elapsed >= config.traffic_wait_max:
+            break
+
+    return {
+        "reason": reason,
+        "rps": round(rate, 2),
+        "lowest_rps": round(min(rate, lowest if lowest is not None else rate), 2),
+        "highest_rps": round(highest, 2),
+        "threshold_rps": config.traffic_wait_threshold,
+        "waited_seconds": round(clock() - start, 1),
+        "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "logs": [os.fspath(path) for path in sampler.paths],
+    }
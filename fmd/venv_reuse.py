@@ -0,0 +1,62 @@
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from fmd.config.app import AppConfig
+from fmd.helpers import clone_tree, hardlink_or_copy
+
+DEPENDENCY_SPEC_FILES = (
+    "pyproject.toml",
+    "setup.py",
+    "setup.cfg",
+    "requirements.txt",
+    "dev-requirements.txt",
+)
+
+# Files inside a venv that installers rewrite for an editable/relocated install.
+# These are copied rather than hardlinked so relinking in the new release never
+# touches the live release's venv.
+_COPIED_SUFFIXES = (".pth", ".cfg", ".json", ".txt")
+_COPIED_NAMES = ("RECORD", "INSTALLER", "REQUESTED", "METADATA")
+
+_PYTHON_INSTALL_HOOKS = (
+    "before_python_install",
+    "after_python_install",
+    "host_before_python_install",
+    "host_after_python_install",
+)
+
+
+def app_dependency_fingerprint(app: AppConfig, app_path: Path) -> Optional[str]:
+    """Hash of the files that decide what ``uv pip install -e <app>`` pulls in.
+
+    Returns None for apps with python-install hooks: the hooks may change the env in
+    ways the spec files don't show, so such apps are always reinstalled.
+    """
+    if any(getattr(app, hook, None) for hook in _PYTHON_INSTALL_HOOKS):
+        return None
+
+    digest = hashlib.sha256()
+    for name in DEPENDENCY_SPEC_FILES:
+        spec = app_path / name
+        if spec.is_file():
+            digest.update(name.encode())
+            digest.update(b"\0")
+            digest.update(spec.read_bytes())
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _hardlink_or_copy(src: str, dst: str) -> None:
+    name = os.path.basename(src)
+    if name.endswith(_COPIED_SUFFIXES) or name in _COPIED_NAMES or os.sep + "bin" + os.sep in dst:
+        shutil.copy2(src, dst)
+        return
+    hardlink_or_copy(src, dst)
+
+
+def clone_venv(src: Path, dest: Path) -> str:
+    """Copy the venv at ``src`` to ``dest``, reflinked or hardlinked with the installer-rewritten files copied."""
+    return clone_tree(src, dest, copy_function=_hardlink_or_copy)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Compare the old and the streaming DB backup paths on a SQL dump.
+
+old:    the dump is written to a plain .sql file, re-read and gzipped on one core with
+        shutil.copyfileobj, then deleted (BackupService.bench_backup before streaming)
+stream: the dump's stdout goes through fmd.db_stream's parallel compressor and is written
+        once (BackupService.bench_backup with backup_method = "stream")
+
+The dump is simulated by `cat`-ing a SQL file, so both paths read the same bytes from a
+pipe. Without --sql, a synthetic dump of --size-gb is generated first.
+
+    python scripts/bench_backup_compression.py --size-gb 4
+    python scripts/bench_backup_compression.py --sql /path/to/site.sql --compression zstd
+"""
+
+import argparse
+import gzip
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fmd.db_stream import dump_to_file, human_bytes  # noqa: E402
+
+
+def generate_dump(path: Path, size: int) -> None:
+    """Write INSERT statements resembling a frappe dump until ``path`` reaches ``size`` bytes."""
+    rng = random.Random(0)
+    words = [f"{rng.getrandbits(48):x}" for _ in range(5000)]
+    with open(path, "w") as f:
+        row = 0
+        while f.tell() < size:
+            values = ",".join(
+                f"('{row + i:010d}','2024-01-01 00:00:00.000000','Administrator',{rng.random() * 1000:.2f},"
+                f"'{' '.join(rng.choices(words, k=12))}')"
+                for i in range(200)
+            )
+            f.write(f"INSERT INTO `tabSales Invoice Item` VALUES {values};\n")
+            row += 200
+
+
+def old_path(sql: Path, out_dir: Path) -> dict:
+    start = time.monotonic()
+    raw = out_dir / "old.sql"
+    with open(raw, "wb") as f:
+        subprocess.run(["cat", str(sql)], stdout=f, check=True)
+    dumped = time.monotonic()
+    with open(raw, "rb") as f_in, gzip.open(str(raw) + ".gz", "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    raw.unlink()
+    end = time.monotonic()
+    size = sql.stat().st_size
+    return {
+        "seconds": round(end - start, 2),
+        "dump_seconds": round(dumped - start, 2),
+        "compress_seconds": round(end - dumped, 2),
+        "bytes_per_second": size / (end - start),
+        "compressed_bytes": Path(str(raw) + ".gz").stat().st_size,
+        "peak_disk_bytes": size + Path(str(raw) + ".gz").stat().st_size,
+    }
+
+
+def stream_path(sql: Path, out_dir: Path, compression: str, threads: int) -> dict:
+    path = out_dir / f"stream.sql.{'gz' if compression == 'gzip' else 'zst'}"
+    result = dump_to_file(
+        ["cat", str(sql)], path, compression=compression, level=6 if compression == "gzip" else 3, threads=threads
+    )
+    return {**result, "peak_disk_bytes": result["compressed_bytes"]}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sql", type=Path, help="SQL dump to use instead of a generated one")
+    parser.add_argument("--size-gb", type=float, default=2.0, help="Size of the generated dump")
+    parser.add_argument("--compression", choices=["gzip", "zstd"], default="gzip")
+    parser.add_argument("--threads", type=int, default=0, help="Compression threads, 0 = all cores")
+    parser.add_argument("--dir", type=Path, default=None, help="Scratch directory (default: system temp)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as scratch:
+        out_dir = Path(scratch)
+        sql = args.sql
+        if sql is None:
+            sql = out_dir / "dump.sql"
+            print(f"Generating {args.size_gb} GB dump in {sql}")
+            generate_dump(sql, int(args.size_gb * 1024**3))
+        size = sql.stat().st_size
+        print(f"Dump: {human_bytes(size)}, {os.cpu_count()} cores\n")
+
+        results = {"old (dump, gzip 1 core)": old_path(sql, out_dir)}
+        results[f"stream ({args.compression})"] = stream_path(sql, out_dir, args.compression, args.threads)
+
+        print(f"{'path':<26}{'seconds':>10}{'throughput':>14}{'on disk':>12}{'peak disk':>12}")
+        for name, result in results.items():
+            print(
+                f"{name:<26}{result['seconds']:>10}{human_bytes(result['bytes_per_second']) + '/s':>14}"
+                f"{human_bytes(result['compressed_bytes']):>12}{human_bytes(result['peak_disk_bytes']):>12}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
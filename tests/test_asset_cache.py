@@ -0,0 +1,135 @@
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fmd.asset_cache import AssetCache
+from fmd.config.app import AppConfig
+
+PASS = []
+FAIL = []
+
+
+def check(label, got, expected):
+    if got == expected:
+        PASS.append(label)
+        print(f"  PASS  {label}")
+    else:
+        FAIL.append(label)
+        print(f"  FAIL  {label}  ->  expected {expected!r}, got {got!r}")
+
+
+def git_repo(path: Path, files: dict) -> None:
+    path.mkdir(parents=True)
+    for name, content in files.items():
+        (path / name).write_text(content)
+    git = ["git", "-C", str(path), "-c", "user.name=fmd", "-c", "user.email=fmd@localhost"]
+    subprocess.run(git + ["init", "-q"], check=True)
+    subprocess.run(git + ["add", "-A"], check=True)
+    subprocess.run(git + ["commit", "-q", "-m", "init"], check=True)
+
+
+root = Path(tempfile.mkdtemp(prefix="fmd-asset-cache-"))
+app_path = root / "apps" / "myapp"
+frappe_path = root / "apps" / "frappe"
+git_repo(app_path, {"package.json": "{}", "yarn.lock": "lock v1\n"})
+git_repo(frappe_path, {"package.json": "{}"})
+app = AppConfig(repo="org/myapp")
+cache = AssetCache(root / "cache")
+
+
+# -- key ----------------------------------------------------------------------
+print("\n-- key --")
+key = AssetCache.key(app, app_path, frappe_path, "18.0.0")
+check("key: clean checkouts give a key", key is not None, True)
+check("key: stable", AssetCache.key(app, app_path, frappe_path, "18.0.0"), key)
+check("key: changes with node version", AssetCache.key(app, app_path, frappe_path, "20.0.0") != key, True)
+hooked = AppConfig(repo="org/myapp", before_bench_build="yarn prepare")
+check("key: changes with build hook", AssetCache.key(hooked, app_path, frappe_path, "18.0.0") != key, True)
+check("key: none outside git", AssetCache.key(app, root, frappe_path, "18.0.0"), None)
+
+(app_path / "package.json").write_text('{"dirty": true}')
+check("key: none for dirty checkout", AssetCache.key(app, app_path, frappe_path, "18.0.0"), None)
+subprocess.run(["git", "-C", str(app_path), "checkout", "-q", "--", "package.json"], check=True)
+check("key: back after revert", AssetCache.key(app, app_path, frappe_path, "18.0.0"), key)
+
+
+# -- store --------------------------------------------------------------------
+print("\n-- store --")
+dist = root / "build" / "dist"
+(dist / "js").mkdir(parents=True)
+(dist / "js" / "myapp.bundle.ABC.js").write_text("bundle")
+assets = root / "build" / "assets"
+assets.mkdir(parents=True)
+(assets / "assets.json").write_text(
+    json.dumps(
+        {
+            "myapp.bundle.js": "/assets/myapp/dist/js/myapp.bundle.ABC.js",
+            "desk.bundle.js": "/assets/frappe/dist/js/desk.bundle.XYZ.js",
+        }
+    )
+)
+
+check("store: miss before store", cache.has(key), False)
+cache.store(key, "myapp", dist, assets)
+check("store: hit after store", cache.has(key), True)
+stored = json.loads((cache.entry(key) / "assets.json").read_text())
+check(
+    "store: keeps only the app's entries",
+    stored,
+    {"assets.json": {"myapp.bundle.js": "/assets/myapp/dist/js/myapp.bundle.ABC.js"}},
+)
+check("store: dist copied", (cache.entry(key) / "dist" / "js" / "myapp.bundle.ABC.js").read_text(), "bundle")
+
+(dist / "js" / "myapp.bundle.ABC.js").unlink()
+(dist / "js" / "myapp.bundle.ABC.js").write_text("rebuilt")
+cache.store(key, "myapp", dist, assets)
+check("store: existing entry kept", (cache.entry(key) / "dist" / "js" / "myapp.bundle.ABC.js").read_text(), "bundle")
+
+
+# -- restore ------------------------------------------------------------------
+print("\n-- restore --")
+release = root / "release"
+release_assets = release / "sites" / "assets"
+release_assets.mkdir(parents=True)
+(release_assets / "assets.json").write_text(json.dumps({"desk.bundle.js": "/assets/frappe/dist/js/desk.bundle.NEW.js"}))
+
+method = cache.restore(key, release / "apps" / "myapp" / "myapp" / "public" / "dist", release_assets)
+check("restore: copy method", method in ("reflink", "hardlink"), True)
+check(
+    "restore: dist restored",
+    (release / "apps" / "myapp" / "myapp" / "public" / "dist" / "js" / "myapp.bundle.ABC.js").read_text(),
+    "bundle",
+)
+check(
+    "restore: entries merged",
+    json.loads((release_assets / "assets.json").read_text()),
+    {
+        "desk.bundle.js": "/assets/frappe/dist/js/desk.bundle.NEW.js",
+        "myapp.bundle.js": "/assets/myapp/dist/js/myapp.bundle.ABC.js",
+    },
+)
+check("restore: no rtl file created", (release_assets / "assets-rtl.json").exists(), False)
+
+
+# -- prune --------------------------------------------------------------------
+print("\n-- prune --")
+check("prune: fresh entry kept", cache.prune(), [])
+check("prune: expired entry removed", AssetCache(cache.root, max_age_days=0).prune(), [key])
+check("prune: gone", cache.has(key), False)
+
+shutil.rmtree(root, ignore_errors=True)
+
+
+# -- summary ------------------------------------------------------------------
+print(f"\n{'=' * 54}")
+print(f"  {len(PASS)} passed  /  {len(FAIL)} failed  /  {len(PASS) + len(FAIL)} total")
+if FAIL:
+    print("\nFailed:")
+    for f in FAIL:
+        print(f"  - {f}")
+    sys.exit(1)
@@ -0,0 +1,76 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fmd.runner.docker import DockerRunner
+from fmd.runner.host import HostRunner
+from fmd.services.backup import DUMP_FALLBACK, BackupService
+
+PASS = []
+FAIL = []
+
+
+def check(label, got, expected):
+    if got == expected:
+        PASS.append(label)
+        print(f"  PASS  {label}")
+    else:
+        FAIL.append(label)
+        print(f"  FAIL  {label}  ->  expected {expected!r}, got {got!r}")
+
+
+PASSWORD = "s3cret-pw"
+DUMP = ["sh", "-c", DUMP_FALLBACK, "dump", "-uroot", "-hglobal-db", "-P3306", "--single-transaction", "--quick"]
+mariadb_client = SimpleNamespace(
+    database_server_info=SimpleNamespace(host="global-db", port=3306, user="root", password=PASSWORD)
+)
+config = SimpleNamespace(workspace_root=Path("/benches/site.localhost"))
+
+
+def dump_command(runner):
+    return BackupService(runner, None, config, None)._db_dump_command(mariadb_client, "_site_db")
+
+
+# -- _db_dump_command ---------------------------------------------------------
+print("\n-- _db_dump_command --")
+command, env = dump_command(DockerRunner("exec", config, verbose=False, printer=None))
+check(
+    "exec runner: dump runs in the bench's frappe service",
+    command,
+    [
+        "docker",
+        "compose",
+        "-f",
+        "/benches/site.localhost/docker-compose.yml",
+        "exec",
+        "-T",
+        "--user",
+        "frappe",
+        "-e",
+        "MYSQL_PWD",
+        "frappe",
+        *DUMP,
+        "_site_db",
+    ],
+)
+check("exec runner: password not in argv", any(PASSWORD in arg for arg in command), False)
+check("exec runner: password in environment", env["MYSQL_PWD"], PASSWORD)
+
+runner = DockerRunner("exec", config, verbose=False, printer=None, docker_host="ssh://deploy@db")
+check("docker host passed to compose", dump_command(runner)[1]["DOCKER_HOST"], "ssh://deploy@db")
+
+command, env = dump_command(HostRunner(verbose=False, printer=None))
+check("host runner: dump runs directly", command, [*DUMP, "_site_db"])
+check("host runner: password in environment", env["MYSQL_PWD"], PASSWORD)
+
+
+# -- summary ------------------------------------------------------------------
+print(f"\n{'=' * 54}")
+print(f"  {len(PASS)} passed  /  {len(FAIL)} failed  /  {len(PASS) + len(FAIL)} total")
+if FAIL:
+    print("\nFailed:")
+    for f in FAIL:
+        print(f"  - {f}")
+    sys.exit(1)
@@ -0,0 +1,143 @@
+import gzip
+import io
+import random
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fmd.backup_store import MAX_CHUNK, MIN_CHUNK, BackupStore, split_chunks
+
+PASS = []
+FAIL = []
+
+
+def check(label, got, expected):
+    if got == expected:
+        PASS.append(label)
+        print(f"  PASS  {label}")
+    else:
+        FAIL.append(label)
+        print(f"  FAIL  {label}  ->  expected {expected!r}, got {got!r}")
+
+
+def insert_rows(table: str, start: int, count: int, seed: int) -> bytes:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(start, start + count):
+        rows.append(f"('{table}-{i:08d}','{rng.getrandbits(128):032x}','note {rng.randint(0, 10**9)}',{i % 7})")
+    statements = []
+    for offset in range(0, len(rows), 500):
+        statements.append(f"INSERT INTO `{table}` VALUES " + ",".join(rows[offset : offset + 500]) + ";\n")
+    return "".join(statements).encode()
+
+
+def dump() -> bytes:
+    return b"-- MariaDB dump\n" + insert_rows("tabNote", 0, 40000, 1) + insert_rows("tabUser", 0, 4000, 2)
+
+
+def chunks(data: bytes) -> list[bytes]:
+    return list(split_chunks(io.BytesIO(data)))
+
+
+# -- split_chunks -------------------------------------------------------------
+print("\n-- split_chunks --")
+data = dump()
+parts = chunks(data)
+check("chunks reassemble the input", b"".join(parts), data)
+check("several chunks", len(parts) > 10, True)
+check("chunks within size bounds", all(MIN_CHUNK <= len(p) <= MAX_CHUNK for p in parts[:-1]), True)
+check("chunks end at row or line boundaries", all(p.endswith((b"\n", b"),(")) for p in parts[:-1]), True)
+check("deterministic", chunks(data), parts)
+check("empty input", chunks(b""), [])
+check("short input is one chunk", chunks(b"SELECT 1;\n"), [b"SELECT 1;\n"])
+check("no anchors cut at MAX_CHUNK", [len(p) for p in chunks(b"x" * (2 * MAX_CHUNK + 5))], [MAX_CHUNK, MAX_CHUNK, 5])
+
+# One row inserted in the middle of the first table.
+middle = data.index(b"('tabNote-00020000'")
+inserted = data[:middle] + b"('tabNote-new','inserted','row',0)," + data[middle:]
+changed = chunks(inserted)
+check("insertion: reassembles", b"".join(changed), inserted)
+check("insertion: only the chunk around it differs", len(set(changed) - set(parts)), 1)
+check("insertion: chunks after it unchanged", changed[-len(parts) // 3 :], parts[-len(parts) // 3 :])
+
+deleted = data[:middle] + data[data.index(b"('tabNote-00020001'") :]
+check("deletion: only the chunk around it differs", len(set(chunks(deleted)) - set(parts)), 1)
+
+
+# -- BackupStore --------------------------------------------------------------
+print("\n-- BackupStore --")
+root = Path(tempfile.mkdtemp(prefix="fmd-backup-store-"))
+store = BackupStore(root / "store", threads=2)
+
+
+def backup(name: str, sql: bytes) -> Path:
+    source = root / "sources" / name
+    source.mkdir(parents=True)
+    (source / "20260101-site.sql.gz").write_bytes(gzip.compress(sql))
+    (source / "config").mkdir()
+    (source / "config" / "site_config.json").write_text('{"db_name": "site"}')
+    return source
+
+
+first = store.add("20260101T000000", backup("20260101T000000", data), site="site.localhost")
+check("add: files recorded", sorted(first["files"]), ["20260101-site.sql.gz", "config/site_config.json"])
+check("add: compression detected", first["files"]["20260101-site.sql.gz"]["compression"], "gzip")
+check("add: plain file uncompressed", first["files"]["config/site_config.json"]["compression"], None)
+check("add: uncompressed size", first["size"], len(data) + len('{"db_name": "site"}'))
+check("add: site recorded", first["site"], "site.localhost")
+
+second = store.add("20260102T000000", backup("20260102T000000", inserted))
+check("add: unchanged data deduplicated", second["added_bytes"] < first["added_bytes"] / 5, True)
+check("snapshots newest first", [s["name"] for s in store.snapshots()], ["20260102T000000", "20260101T000000"])
+
+restored = store.restore("20260101T000000", root / "restored")
+written = sorted(path.relative_to(root / "restored").as_posix() for path in restored)
+check("restore: files written", written, sorted(first["files"]))
+restored_sql = gzip.decompress((root / "restored" / "20260101-site.sql.gz").read_bytes())
+check("restore: gzip readable", restored_sql == data, True)
+check("restore: plain file", (root / "restored" / "config" / "site_config.json").read_text(), '{"db_name": "site"}')
+
+try:
+    store.get("20250101T000000")
+    check("get: unknown snapshot raises", None, "FileNotFoundError")
+except FileNotFoundError:
+    check("get: unknown snapshot raises", True, True)
+
+
+# -- prune and gc -------------------------------------------------------------
+print("\n-- prune and gc --")
+usage = store.disk_usage()
+check("gc: nothing unreferenced", store.gc(), (0, 0))
+check("prune: keep 0 removes nothing", store.prune(0), [])
+check("prune: drops older snapshots", store.prune(1), ["20260101T000000"])
+count, size = store.gc()
+check("gc: removes chunks only the pruned snapshot used", count > 0, True)
+check("gc: frees what it reports", store.disk_usage(), usage - size)
+
+store.restore("20260102T000000", root / "restored-2")
+restored_sql = gzip.decompress((root / "restored-2" / "20260101-site.sql.gz").read_bytes())
+check("gc: kept snapshot still restores", restored_sql == inserted, True)
+
+entry = store.get("20260102T000000")["files"]["20260101-site.sql.gz"]
+chunk = store.chunk_path(entry["chunks"][0])
+chunk.write_bytes(BackupStore._compress(b"tampered")[1])
+try:
+    store.restore("20260102T000000", root / "restored-3")
+    check("restore: corrupt chunk detected", None, "RuntimeError")
+except RuntimeError as e:
+    check("restore: corrupt chunk detected", "corrupt" in str(e), True)
+
+shutil.rmtree(root, ignore_errors=True)
+
+
+# -- summary ------------------------------------------------------------------
+print(f"\n{'=' * 54}")
+print(f"  {len(PASS)} passed  /  {len(FAIL)} failed  /  {len(PASS) + len(FAIL)} total")
+if FAIL:
+    print("\nFailed:")
+    for f in FAIL:
+        print(f"  - {f}")
+    sys.exit(1)
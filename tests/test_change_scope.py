@@ -0,0 +1,121 @@
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fmd.change_scope import python_only_change
+from fmd.release_directory import BenchDirectory
+
+PASS = []
+FAIL = []
+
+
+def check(label, got, expected):
+    if got == expected:
+        PASS.append(label)
+        print(f"  PASS  {label}")
+    else:
+        FAIL.append(label)
+        print(f"  FAIL  {label}  ->  expected {expected!r}, got {got!r}")
+
+
+def write(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+root = Path(tempfile.mkdtemp(prefix="fmd-change-scope-"))
+live = BenchDirectory(root / "release_live")
+app = live.apps / "myapp"
+write(app / "setup.py", "setup()\n")
+write(app / "myapp" / "api.py", "def ping(): return 'pong'\n")
+write(app / "myapp" / "hooks.py", 'app_name = "myapp"\n')
+write(app / "myapp" / "public" / "js" / "form.js", "frappe.ui.form.on('Note', {});\n")
+write(app / "node_modules" / "left-pad" / "index.js", "module.exports = 1\n")
+write(live.sites / "apps.txt", "frappe\nmyapp\n")
+write(live.sites / "assets" / "assets.json", json.dumps({"form.bundle.js": "/assets/myapp/dist/js/form.bundle.A.js"}))
+live.update_metadata(python_env={"apps": {"frappe": "f1", "myapp": "m1"}})
+
+
+def changed(edit) -> tuple[bool, str]:
+    """python_only_change of a copy of the live release after ``edit``."""
+    new = BenchDirectory(root / "release_new")
+    if new.path.exists():
+        shutil.rmtree(new.path)
+    shutil.copytree(live.path, new.path)
+    metadata = new.read_metadata()
+    metadata.pop("non_python_fingerprint", None)
+    new.metadata_file.write_text(json.dumps(metadata))
+    edit(new)
+    return python_only_change(new, live)
+
+
+# -- python_only_change -------------------------------------------------------
+print("\n-- python_only_change --")
+check("identical release", changed(lambda new: None), (True, "only Python code changed"))
+check(
+    "python module edit",
+    changed(lambda new: write(new.apps / "myapp" / "myapp" / "api.py", "def ping(): return 'PONG'\n")),
+    (True, "only Python code changed"),
+)
+check(
+    "new python module",
+    changed(lambda new: write(new.apps / "myapp" / "myapp" / "utils.py", "X = 1\n")),
+    (True, "only Python code changed"),
+)
+check(
+    "node_modules ignored",
+    changed(lambda new: write(new.apps / "myapp" / "node_modules" / "left-pad" / "index.js", "module.exports = 2\n")),
+    (True, "only Python code changed"),
+)
+check(
+    "js edit",
+    changed(lambda new: write(new.apps / "myapp" / "myapp" / "public" / "js" / "form.js", "// changed\n")),
+    (False, "non-Python files changed in myapp"),
+)
+check(
+    "setup.py counts as non-Python",
+    changed(lambda new: write(new.apps / "myapp" / "setup.py", "setup(name='myapp')\n")),
+    (False, "non-Python files changed in myapp"),
+)
+check(
+    "new app",
+    changed(lambda new: write(new.sites / "apps.txt", "frappe\nmyapp\nhrms\n")),
+    (False, "apps.txt changed"),
+)
+check(
+    "rebuilt assets",
+    changed(lambda new: write(new.sites / "assets" / "assets.json", json.dumps({"form.bundle.js": "B"}))),
+    (False, "built assets changed"),
+)
+check(
+    "missing assets.json",
+    changed(lambda new: (new.sites / "assets" / "assets.json").unlink()),
+    (False, "built assets changed"),
+)
+check(
+    "dependency change",
+    changed(lambda new: new.update_metadata(python_env={"apps": {"frappe": "f1", "myapp": "m2"}})),
+    (False, "Python dependencies changed or unknown"),
+)
+check(
+    "unknown dependencies",
+    changed(lambda new: new.update_metadata(python_env={"apps": {"frappe": "f1", "myapp": None}})),
+    (False, "Python dependencies changed or unknown"),
+)
+check("fingerprint recorded", "non_python_fingerprint" in live.read_metadata(), True)
+
+shutil.rmtree(root, ignore_errors=True)
+
+
+# -- summary ------------------------------------------------------------------
+print(f"\n{'=' * 54}")
+print(f"  {len(PASS)} passed  /  {len(FAIL)} failed  /  {len(PASS) + len(FAIL)} total")
+if FAIL:
+    print("\nFailed:")
+    for f in FAIL:
+        print(f"  - {f}")
+    sys.exit(1)
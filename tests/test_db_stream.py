@@ -0,0 +1,195 @@
+import gzip
+import random
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fmd.db_stream import ParallelGzipWriter, ReadAhead, dump_to_file, restore_from_source
+
+PASS = []
+FAIL = []
+
+
+def check(label, got, expected):
+    if got == expected:
+        PASS.append(label)
+        print(f"  PASS  {label}")
+    else:
+        FAIL.append(label)
+        print(f"  FAIL  {label}  ->  expected {expected!r}, got {got!r}")
+
+
+def gzip_members(data: bytes) -> int:
+    members = 0
+    while data:
+        decompressor = zlib.decompressobj(wbits=31)
+        decompressor.decompress(data)
+        data = decompressor.unused_data
+        members += 1
+    return members
+
+
+class ChunkReader:
+    """Returns ``chunks`` one per read, then raises ``error`` if given, else EOF."""
+
+    def __init__(self, chunks, error=None):
+        self.chunks = list(chunks)
+        self.error = error
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        if self.chunks:
+            return self.chunks.pop(0)
+        if self.error is not None:
+            raise self.error
+        return b""
+
+
+def read_all(reader) -> bytes:
+    parts = []
+    while chunk := reader.read():
+        parts.append(chunk)
+    return b"".join(parts)
+
+
+def sql_rows(count: int) -> bytes:
+    rng = random.Random(42)
+    rows = [f"({i},'{rng.getrandbits(64):x}','note {rng.randint(0, 10**6)}')" for i in range(count)]
+    return ("INSERT INTO `tabNote` VALUES " + ",".join(rows) + ";\n").encode()
+
+
+root = Path(tempfile.mkdtemp(prefix="fmd-db-stream-"))
+data = sql_rows(20000) * 3
+
+
+# -- ParallelGzipWriter -------------------------------------------------------
+print("\n-- ParallelGzipWriter --")
+path = root / "dump.sql.gz"
+with open(path, "wb") as f, ParallelGzipWriter(f, level=1, threads=4, block_size=64 << 10) as writer:
+    offset, step = 0, 1
+    while offset < len(data):
+        # Writes straddle block boundaries at uneven sizes.
+        writer.write(data[offset : offset + step])
+        offset += step
+        step = step * 7 % 100003 + 1
+
+with gzip.open(path, "rb") as f:
+    check("round trip through gzip.open", f.read() == data, True)
+check("one member per block", gzip_members(path.read_bytes()), -(-len(data) // (64 << 10)))
+
+small = root / "small.sql.gz"
+with open(small, "wb") as f, ParallelGzipWriter(f, threads=2) as writer:
+    writer.write(b"SELECT 1;\n")
+check("short input is one member", gzip_members(small.read_bytes()), 1)
+check("short input round trip", gzip.decompress(small.read_bytes()), b"SELECT 1;\n")
+
+empty = root / "empty.sql.gz"
+with open(empty, "wb") as f, ParallelGzipWriter(f, threads=2) as writer:
+    pass
+check("no input writes nothing", empty.read_bytes(), b"")
+
+output = []
+for threads in (1, 3):
+    target = root / f"threads-{threads}.gz"
+    with open(target, "wb") as f, ParallelGzipWriter(f, threads=threads, block_size=32 << 10) as writer:
+        writer.write(data)
+    output.append(target.read_bytes())
+check("output independent of thread count", output[0] == output[1], True)
+
+
+# -- dump_to_file -------------------------------------------------------------
+print("\n-- dump_to_file --")
+source = root / "source.sql"
+source.write_bytes(data)
+path = root / "piped.sql.gz"
+result = dump_to_file(
+    [sys.executable, "-c", f"import shutil, sys; shutil.copyfileobj(open({str(source)!r}, 'rb'), sys.stdout.buffer)"],
+    path,
+    threads=2,
+)
+check("dump: uncompressed bytes", result["bytes"], len(data))
+check("dump: compressed size", result["compressed_bytes"], path.stat().st_size)
+check("dump: content", gzip.decompress(path.read_bytes()) == data, True)
+
+failed = root / "failed.sql.gz"
+try:
+    dump_to_file([sys.executable, "-c", "import sys; print('partial'); sys.exit('access denied')"], failed)
+    check("dump: failure raises", None, "RuntimeError")
+except RuntimeError as e:
+    check("dump: failure raises", "access denied" in str(e), True)
+check("dump: partial file removed", failed.exists(), False)
+
+
+
+# -- ReadAhead ----------------------------------------------------------------
+print("\n-- ReadAhead --")
+chunks = [bytes([i]) * 1024 for i in range(50)]
+buffered = ReadAhead(ChunkReader(chunks), max_bytes=8 << 10, chunk_size=1024)
+check("reads everything in order", read_all(buffered), b"".join(chunks))
+check("EOF repeats", buffered.read(), b"")
+
+reset = ConnectionResetError("connection reset by peer")
+buffered = ReadAhead(ChunkReader(chunks[:2], error=reset), max_bytes=8 << 10, chunk_size=1024)
+check("chunks before the error delivered", [buffered.read(), buffered.read()], chunks[:2])
+try:
+    buffered.read()
+    check("reader error raised from read", None, reset)
+except ConnectionResetError as e:
+    check("reader error raised from read", e, reset)
+
+source_reader = ChunkReader(chunks)
+buffered = ReadAhead(source_reader, max_bytes=4 << 10, chunk_size=1024)
+time.sleep(0.2)
+check("reads at most the bound ahead", source_reader.reads <= 4 + 1, True)
+buffered.close()
+buffered._thread.join(2)
+check("close stops the reader thread", buffered._thread.is_alive(), False)
+
+
+# -- restore_from_source ------------------------------------------------------
+print("\n-- restore_from_source --")
+backup = root / "backup.sql.gz"
+backup.write_bytes(gzip.compress(data))
+restored = root / "restored.sql"
+sink = [
+    sys.executable,
+    "-c",
+    f"import shutil, sys; shutil.copyfileobj(sys.stdin.buffer, open({str(restored)!r}, 'wb'))",
+]
+for read_ahead in (0, 1 << 20):
+    restored.unlink(missing_ok=True)
+    result = restore_from_source(str(backup), sink, read_ahead_bytes=read_ahead)
+    check(f"restore (read ahead {read_ahead}): content", restored.read_bytes() == data, True)
+    check(f"restore (read ahead {read_ahead}): bytes", result["bytes"], len(data))
+
+corrupt = root / "corrupt.sql.gz"
+corrupt.write_bytes(gzip.compress(data)[: len(data) // 50])
+try:
+    restore_from_source(str(corrupt), sink, read_ahead_bytes=1 << 20)
+    check("truncated backup raises through read ahead", None, "EOFError")
+except EOFError:
+    check("truncated backup raises through read ahead", True, True)
+
+try:
+    restore_from_source(str(backup), [sys.executable, "-c", "import sys; sys.exit('ERROR 1045: access denied')"])
+    check("client failure raises", None, "RuntimeError")
+except RuntimeError as e:
+    check("client failure raises", "ERROR 1045" in str(e), True)
+
+shutil.rmtree(root, ignore_errors=True)
+
+
+# -- summary ------------------------------------------------------------------
+print(f"\n{'=' * 54}")
+print(f"  {len(PASS)} passed  /  {len(FAIL)} failed  /  {len(PASS) + len(FAIL)} total")
+if FAIL:
+    print("\nFailed:")
+    for f in FAIL:
+        print(f"  - {f}")
+    sys.exit(1)
@@ -0,0 +1,94 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fmd.config.switch import SwitchConfig
+from fmd.latency_gate import compare, percentile, summarize
+
+PASS = []
+FAIL = []
+
+
+def check(label, got, expected):
+    if got == expected:
+        PASS.append(label)
+        print(f"  PASS  {label}")
+    else:
+        FAIL.append(label)
+        print(f"  FAIL  {label}  ->  expected {expected!r}, got {got!r}")
+
+
+def samples(latencies: list[float], errors: int = 0) -> list[dict]:
+    return [{"ms": ms, "ok": i >= errors} for i, ms in enumerate(latencies)]
+
+
+# Defaults: p50 1.5x, p95 2x, at least 50ms slower, error rate +5 points.
+thresholds = SwitchConfig()
+
+
+# -- summarize ----------------------------------------------------------------
+print("\n-- summarize --")
+check("percentile: empty", percentile([], 95), 0.0)
+check("percentile: nearest rank", percentile([float(ms) for ms in range(1, 101)], 95), 95.0)
+check("percentile: single value", percentile([7.0], 50), 7.0)
+
+summary = summarize({"/": samples([100.0] * 10, errors=1), "/app": samples([300.0] * 10)})
+check("summarize: request count", summary["requests"], 20)
+check("summarize: error rate", summary["error_rate"], 0.05)
+check("summarize: overall p50", summary["p50_ms"], 100.0)
+check("summarize: per url p50", summary["urls"]["/app"]["p50_ms"], 300.0)
+check("summarize: per url errors", summary["urls"]["/"]["errors"], 1)
+
+
+# -- compare ------------------------------------------------------------------
+print("\n-- compare --")
+before = summarize({"/": samples([100.0] * 20), "/api/ping": samples([5.0] * 20)})
+
+check("no change passes", compare(before, before, thresholds), [])
+
+after = summarize({"/": samples([140.0] * 20), "/api/ping": samples([5.0] * 20)})
+check("small slowdown passes", compare(before, after, thresholds), [])
+
+after = summarize({"/": samples([100.0] * 20), "/api/ping": samples([30.0] * 20)})
+check("fast endpoint 6x but under min delta passes", compare(before, after, thresholds), [])
+
+after = summarize({"/": samples([300.0] * 20), "/api/ping": samples([5.0] * 20)})
+reasons = compare(before, after, thresholds)
+check("3x slowdown on one url fails", any(reason.startswith("/ p50") for reason in reasons), True)
+check("3x slowdown reports p95 too", any(reason.startswith("/ p95") for reason in reasons), True)
+
+mixed_before = summarize({"/": samples([100.0] * 95), "/report": samples([100.0] * 5)})
+mixed_after = summarize({"/": samples([100.0] * 95), "/report": samples([400.0] * 5)})
+reasons = compare(mixed_before, mixed_after, thresholds)
+check("hidden in aggregate p50 still caught", any(reason.startswith("/report p50") for reason in reasons), True)
+check("aggregate p50 not flagged", any(reason.startswith("overall p50") for reason in reasons), False)
+
+after = summarize({"/": samples([100.0] * 20, errors=4), "/api/ping": samples([5.0] * 20)})
+reasons = compare(before, after, thresholds)
+check("error rate increase fails", [reason for reason in reasons if reason.startswith("error rate")] != [], True)
+
+after = summarize({"/": samples([100.0] * 20, errors=1), "/api/ping": samples([5.0] * 20)})
+check("error rate within limit passes", compare(before, after, thresholds), [])
+
+after = summarize({"/": samples([100.0] * 20), "/new": samples([900.0] * 20)})
+reasons = compare(before, after, thresholds)
+check("url missing before isn't compared alone", any(reason.startswith("/new") for reason in reasons), False)
+
+empty = summarize({})
+after = summarize({"/": samples([100.0] * 20)})
+check(
+    "no baseline latency counts as new",
+    compare(empty, after, thresholds),
+    ["overall p50 0ms -> 100ms (new, limit 1.5x)", "overall p95 0ms -> 100ms (new, limit 2.0x)"],
+)
+
+
+# -- summary ------------------------------------------------------------------
+print(f"\n{'=' * 54}")
+print(f"  {len(PASS)} passed  /  {len(FAIL)} failed  /  {len(PASS) + len(FAIL)} total")
+if FAIL:
+    print("\nFailed:")
+    for f in FAIL:
+        print(f"  - {f}")
+    sys.exit(1)
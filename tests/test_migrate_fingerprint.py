@@ -0,0 +1,122 @@
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fmd.migrate_fingerprint import changed_apps, changed_since_migrate, migration_fingerprint, record_migrated
+from fmd.release_directory import BenchDirectory
+
+PASS = []
+FAIL = []
+
+
+def check(label, got, expected):
+    if got == expected:
+        PASS.append(label)
+        print(f"  PASS  {label}")
+    else:
+        FAIL.append(label)
+        print(f"  FAIL  {label}  ->  expected {expected!r}, got {got!r}")
+
+
+def make_app(release: Path, name: str) -> Path:
+    module = release / "apps" / name / name
+    (module / "doctype" / "invoice").mkdir(parents=True)
+    (module / "public" / "js").mkdir(parents=True)
+    (module / "hooks.py").write_text(f'app_name = "{name}"\napp_title = "{name}"\nafter_migrate = ["{name}.setup"]\n')
+    (module / "patches.txt").write_text(f"{name}.patches.v1\n")
+    (module / "doctype" / "invoice" / "invoice.json").write_text('{"name": "Invoice"}')
+    (module / "doctype" / "invoice" / "invoice.py").write_text("class Invoice: pass\n")
+    (module / "public" / "js" / "manifest.json").write_text("{}")
+    return module
+
+
+# -- changed_apps -------------------------------------------------------------
+print("\n-- changed_apps --")
+check("identical fingerprints", changed_apps({"frappe": "a", "erpnext": "b"}, {"frappe": "a", "erpnext": "b"}), [])
+check("changed app", changed_apps({"frappe": "a", "erpnext": "c"}, {"frappe": "a", "erpnext": "b"}), ["erpnext"])
+check("added app", changed_apps({"frappe": "a", "hrms": "h"}, {"frappe": "a"}), ["hrms"])
+check("removed app", changed_apps({"frappe": "a"}, {"frappe": "a", "hrms": "h"}), ["hrms"])
+check("unhashable app counts as changed", changed_apps({"frappe": None}, {"frappe": None}), ["frappe"])
+check("sorted by name", changed_apps({"b": "1", "a": "1"}, {}), ["a", "b"])
+
+
+# -- migration_fingerprint ----------------------------------------------------
+print("\n-- migration_fingerprint --")
+root = Path(tempfile.mkdtemp(prefix="fmd-migrate-fingerprint-"))
+release = root / "release"
+module = make_app(release, "myapp")
+make_app(release, "frappe")
+(release / "apps" / "broken").mkdir()
+live = migration_fingerprint(BenchDirectory(release))
+check("one entry per app", sorted(live), ["broken", "frappe", "myapp"])
+check("app without hooks.py can't be hashed", live["broken"], None)
+check("stable", migration_fingerprint(BenchDirectory(release)), live)
+(release / "apps" / "broken").rmdir()
+del live["broken"]
+
+
+def changed_after(edit) -> list[str]:
+    copy = root / "copy"
+    if copy.exists():
+        shutil.rmtree(copy)
+    shutil.copytree(release, copy)
+    edit(copy / "apps" / "myapp" / "myapp")
+    return changed_apps(migration_fingerprint(BenchDirectory(copy)), live)
+
+
+check("python edit ignored", changed_after(lambda m: (m / "doctype/invoice/invoice.py").write_text("# x\n")), [])
+check("public json ignored", changed_after(lambda m: (m / "public/js/manifest.json").write_text("[]")), [])
+check(
+    "unrelated hook ignored",
+    changed_after(lambda m: (m / "hooks.py").write_text((module / "hooks.py").read_text() + 'app_color = "red"\n')),
+    [],
+)
+check(
+    "migrate hook change",
+    changed_after(lambda m: (m / "hooks.py").write_text((module / "hooks.py").read_text() + 'fixtures = ["Role"]\n')),
+    ["myapp"],
+)
+check("doctype json change", changed_after(lambda m: (m / "doctype/invoice/invoice.json").write_text("{}")), ["myapp"])
+check(
+    "new patch",
+    changed_after(lambda m: (m / "patches.txt").write_text("myapp.patches.v1\nmyapp.patches.v2\n")),
+    ["myapp"],
+)
+
+
+
+# -- changed_since_migrate ----------------------------------------------------
+print("\n-- changed_since_migrate --")
+live_release = BenchDirectory(release)
+new_fp = dict(live, myapp="changed")
+
+# Create records the fingerprint the release was built with, which says nothing about the schema.
+live_release.update_metadata(migration_fingerprint=live)
+check("no migrate record is unknown", changed_since_migrate(live, live_release), None)
+
+live_release.update_metadata(migrate={"ran": False, "reason": "switch.migrate is disabled"})
+check("switched without migrate is unknown", changed_since_migrate(live, live_release), None)
+
+record_migrated(live_release, live)
+check("migrated, same fingerprint", changed_since_migrate(live, live_release), [])
+check("migrated, app changed", changed_since_migrate(new_fp, live_release), ["myapp"])
+
+# A switch clears the record first and sets it again only once migrate has succeeded.
+record_migrated(live_release, None)
+live_release.update_metadata(migrate={"ran": True, "reason": "forced with --force-migrate"})
+check("failed migrate is unknown", changed_since_migrate(live, live_release), None)
+
+shutil.rmtree(root, ignore_errors=True)
+
+
+# -- summary ------------------------------------------------------------------
+print(f"\n{'=' * 54}")
+print(f"  {len(PASS)} passed  /  {len(FAIL)} failed  /  {len(PASS) + len(FAIL)} total")
+if FAIL:
+    print("\nFailed:")
+    for f in FAIL:
+        print(f"  - {f}")
+    sys.exit(1)
@@ -0,0 +1,87 @@
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fmd.services.backup import PARALLEL_BACKUP_SUFFIX, PARALLEL_MANIFEST, parallel_backup_dependencies
+
+PASS = []
+FAIL = []
+
+
+def check(label, got, expected):
+    if got == expected:
+        PASS.append(label)
+        print(f"  PASS  {label}")
+    else:
+        FAIL.append(label)
+        print(f"  FAIL  {label}  ->  expected {expected!r}, got {got!r}")
+
+
+BACKUP_NAME = f"20260101T000000-site.localhost{PARALLEL_BACKUP_SUFFIX}"
+
+
+def parallel_backup(release: Path, tables: dict) -> Path:
+    """Write a parallel backup manifest under ``release``; ``tables`` maps names to the release they reuse."""
+    backup = release / BACKUP_NAME
+    backup.mkdir(parents=True)
+    manifest = {"tables": {}}
+    for table, reused_from in tables.items():
+        entry = {"file": f"{table}.sql.gz"}
+        if reused_from is not None:
+            entry["from"] = f"../../{reused_from.name}/{BACKUP_NAME}"
+        manifest["tables"][table] = entry
+    (backup / PARALLEL_MANIFEST).write_text(json.dumps(manifest))
+    return backup
+
+
+root = Path(tempfile.mkdtemp(prefix="fmd-parallel-backups-"))
+backups = root / "deployment-backup"
+full, first, second, unrelated = (backups / f"release_{name}" for name in ("a", "b", "c", "d"))
+
+
+# -- parallel_backup_dependencies ---------------------------------------------
+print("\n-- parallel_backup_dependencies --")
+parallel_backup(full, {"tabNote": None, "tabUser": None, "tabFile": None})
+parallel_backup(first, {"tabNote": None, "tabUser": full, "tabFile": full})
+parallel_backup(second, {"tabNote": None, "tabUser": full, "tabFile": first})
+parallel_backup(unrelated, {"tabNote": None})
+(backups / "release_e").mkdir()
+
+check("full backup needs nothing", parallel_backup_dependencies([full]), set())
+check("incremental needs its base", parallel_backup_dependencies([first]), {full.resolve()})
+check("chain followed transitively", parallel_backup_dependencies([second]), {first.resolve(), full.resolve()})
+check("several backups", parallel_backup_dependencies([second, unrelated]), {first.resolve(), full.resolve()})
+check("release without parallel backup", parallel_backup_dependencies([backups / "release_e"]), set())
+check("missing directory", parallel_backup_dependencies([backups / "release_missing"]), set())
+
+broken = backups / "release_f"
+parallel_backup(broken, {"tabNote": first})
+(broken / BACKUP_NAME / PARALLEL_MANIFEST).write_text("{not json")
+check("unreadable manifest skipped", parallel_backup_dependencies([broken]), set())
+
+# A reference back to a release already collected must not loop.
+manifest_path = full / BACKUP_NAME / PARALLEL_MANIFEST
+loop = json.loads(manifest_path.read_text())
+loop["tables"]["tabNote"]["from"] = f"../../{second.name}/{BACKUP_NAME}"
+manifest_path.write_text(json.dumps(loop))
+check(
+    "reference cycle terminates",
+    parallel_backup_dependencies([second]),
+    {first.resolve(), full.resolve(), second.resolve()},
+)
+
+shutil.rmtree(root, ignore_errors=True)
+
+
+# -- summary ------------------------------------------------------------------
+print(f"\n{'=' * 54}")
+print(f"  {len(PASS)} passed  /  {len(FAIL)} failed  /  {len(PASS) + len(FAIL)} total")
+if FAIL:
+    print("\nFailed:")
+    for f in FAIL:
+        print(f"  - {f}")
+    sys.exit(1)
@@ -0,0 +1,140 @@
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+try:
+    # The dump script runs with the bench's Python, where frappe brings pymysql.
+    from fmd.parallel_dump import run_jobs, split_indexes, table_path
+except ImportError as e:
+    run_jobs = split_indexes = table_path = None
+    print(f"  SKIP  parallel_dump tests: {e}")
+
+PASS = []
+FAIL = []
+
+
+def check(label, got, expected):
+    if got == expected:
+        PASS.append(label)
+        print(f"  PASS  {label}")
+    else:
+        FAIL.append(label)
+        print(f"  FAIL  {label}  ->  expected {expected!r}, got {got!r}")
+
+
+NOTE = """CREATE TABLE `tabNote` (
+  `name` varchar(140) NOT NULL,
+  `title` varchar(140) DEFAULT NULL,
+  `modified` datetime(6) DEFAULT NULL,
+  `content` longtext DEFAULT NULL,
+  PRIMARY KEY (`name`),
+  UNIQUE KEY `title` (`title`),
+  KEY `modified` (`modified`),
+  KEY `title_modified` (`title`,`modified`),
+  FULLTEXT KEY `content` (`content`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"""
+
+ORDER = """CREATE TABLE `order_item` (
+  `id` int(11) NOT NULL AUTO_INCREMENT,
+  `order_id` int(11) NOT NULL,
+  `product_id` int(11) NOT NULL,
+  `warehouse` varchar(140) DEFAULT NULL,
+  `qty` int(11) DEFAULT NULL,
+  PRIMARY KEY (`id`),
+  KEY `fk_order` (`order_id`),
+  KEY `product_qty` (`product_id`,`qty`),
+  KEY `qty` (`qty`),
+  KEY `warehouse` (`warehouse`),
+  CONSTRAINT `fk_order` FOREIGN KEY (`order_id`) REFERENCES `orders` (`id`),
+  CONSTRAINT `fk_product` FOREIGN KEY (`product_id`) REFERENCES `products` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB AUTO_INCREMENT=7 DEFAULT CHARSET=utf8mb4"""
+
+
+def section_split_indexes():
+    print("\n-- split_indexes --")
+    table, indexes = split_indexes(NOTE)
+    check(
+        "secondary indexes split off",
+        indexes,
+        [
+            "KEY `modified` (`modified`)",
+            "KEY `title_modified` (`title`,`modified`)",
+            "FULLTEXT KEY `content` (`content`)",
+        ],
+    )
+    check(
+        "primary and unique keys stay",
+        table,
+        "CREATE TABLE `tabNote` (\n"
+        "  `name` varchar(140) NOT NULL,\n"
+        "  `title` varchar(140) DEFAULT NULL,\n"
+        "  `modified` datetime(6) DEFAULT NULL,\n"
+        "  `content` longtext DEFAULT NULL,\n"
+        "  PRIMARY KEY (`name`),\n"
+        "  UNIQUE KEY `title` (`title`)\n"
+        ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci",
+    )
+
+    table, indexes = split_indexes(ORDER)
+    check("indexes no foreign key needs are split off", indexes, ["KEY `qty` (`qty`)", "KEY `warehouse` (`warehouse`)"])
+    check("index named after its constraint stays", "  KEY `fk_order` (`order_id`)," in table, True)
+    check("index leading with foreign key columns stays", "  KEY `product_qty` (`product_id`,`qty`)," in table, True)
+    check("constraints stay", table.count("CONSTRAINT"), 2)
+    check("last line keeps no trailing comma", table.splitlines()[-2].endswith(","), False)
+
+    plain = "CREATE TABLE `t` (\n  `id` int(11) NOT NULL,\n  PRIMARY KEY (`id`)\n) ENGINE=InnoDB"
+    check("table without indexes unchanged", split_indexes(plain), (plain, []))
+
+
+def section_table_path():
+    print("\n-- table_path --")
+    src = Path("/backups/20260101")
+    check("own file", table_path(src, {"file": "tabNote.sql.gz"}), src / "tabNote.sql.gz")
+    check(
+        "reused from an earlier backup",
+        table_path(src, {"file": "tabNote.sql.gz", "from": "../20251231"}),
+        Path("/backups/20260101/../20251231/tabNote.sql.gz"),
+    )
+
+
+def section_run_jobs():
+    print("\n-- run_jobs --")
+    workers = set()
+    lock = threading.Lock()
+
+    def work(index, item):
+        with lock:
+            workers.add(index)
+        return item * 2
+
+    check("results by item", run_jobs(3, list(range(20)), work), {i: i * 2 for i in range(20)})
+    check("worker indexes in range", workers <= {0, 1, 2}, True)
+
+    def fail(index, item):
+        if item == 3:
+            raise ValueError("table is corrupt")
+        return item
+
+    try:
+        run_jobs(2, list(range(6)), fail)
+        check("worker error raised", None, "RuntimeError")
+    except RuntimeError as e:
+        check("worker error raised", str(e), "3: ValueError: table is corrupt")
+
+
+if split_indexes is not None:
+    section_split_indexes()
+    section_table_path()
+    section_run_jobs()
+
+
+# -- summary ------------------------------------------------------------------
+print(f"\n{'=' * 54}")
+print(f"  {len(PASS)} passed  /  {len(FAIL)} failed  /  {len(PASS) + len(FAIL)} total")
+if FAIL:
+    print("\nFailed:")
+    for f in FAIL:
+        print(f"  - {f}")
+    sys.exit(1)
@@ -0,0 +1,193 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fmd.pipeline import CANCELLED, DONE, FAILED, SKIPPED, Pipeline, Stage
+
+PASS = []
+FAIL = []
+
+
+def check(label, got, expected):
+    if got == expected:
+        PASS.append(label)
+        print(f"  PASS  {label}")
+    else:
+        FAIL.append(label)
+        print(f"  FAIL  {label}  ->  expected {expected!r}, got {got!r}")
+
+
+class RecordingPrinter:
+    def __init__(self):
+        self.lines = []
+
+    def print(self, message, **kwargs):
+        self.lines.append(message)
+
+    warning = error = print
+
+    def change_head(self, text):
+        pass
+
+    def live_lines(self, data, **kwargs):
+        pass
+
+    def start(self, text):
+        pass
+
+    def stop(self):
+        pass
+
+
+class Tracker:
+    """Records stage start/end order and the highest concurrent weight seen."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = []
+        self.weight = 0
+        self.peak = 0
+
+    def stage(self, name, deps=(), weight=1, seconds=0.05):
+        def run():
+            with self.lock:
+                self.events.append(("start", name))
+                self.weight += weight
+                self.peak = max(self.peak, self.weight)
+            time.sleep(seconds)
+            with self.lock:
+                self.weight -= weight
+                self.events.append(("end", name))
+
+        return Stage(name, run, deps=tuple(deps), weight=weight)
+
+    def index(self, kind, name):
+        return self.events.index((kind, name))
+
+
+# -- dependency ordering ------------------------------------------------------
+print("\n-- dependency ordering --")
+t = Tracker()
+pipeline = Pipeline(
+    [t.stage("venv", ["clone"]), t.stage("clone"), t.stage("node", ["clone"]), t.stage("build", ["venv", "node"])],
+    RecordingPrinter(),
+    budget=4,
+    status_interval=0.01,
+)
+pipeline.run()
+check("all stages done", {s.status for s in pipeline.stages.values()}, {DONE})
+check("venv after clone", t.index("end", "clone") < t.index("start", "venv"), True)
+check("node after clone", t.index("end", "clone") < t.index("start", "node"), True)
+check("build after venv", t.index("end", "venv") < t.index("start", "build"), True)
+check("build after node", t.index("end", "node") < t.index("start", "build"), True)
+check("venv and node overlap", t.index("start", "node") < t.index("end", "venv"), True)
+
+try:
+    Pipeline([t.stage("a", ["missing"])], RecordingPrinter())
+    check("unknown dependency raises", False, True)
+except ValueError:
+    check("unknown dependency raises", True, True)
+
+try:
+    Pipeline([t.stage("a", ["b"]), t.stage("b", ["a"])], RecordingPrinter())
+    check("dependency cycle raises", False, True)
+except ValueError:
+    check("dependency cycle raises", True, True)
+
+
+# -- budget and weights -------------------------------------------------------
+print("\n-- budget and weights --")
+t = Tracker()
+Pipeline([t.stage(f"s{i}") for i in range(6)], RecordingPrinter(), budget=2, status_interval=0.01).run()
+check("budget caps concurrency", t.peak, 2)
+
+t = Tracker()
+Pipeline([t.stage(f"s{i}") for i in range(4)], RecordingPrinter(), budget=1, status_interval=0.01).run()
+check("budget 1 runs serially", t.peak, 1)
+
+t = Tracker()
+Pipeline(
+    [t.stage("heavy", weight=3), t.stage("light1"), t.stage("light2")],
+    RecordingPrinter(),
+    budget=4,
+    status_interval=0.01,
+).run()
+check("weights count against the budget", t.peak, 4)
+
+t = Tracker()
+stages = [t.stage("huge", weight=8), t.stage("light")]
+Pipeline(stages, RecordingPrinter(), budget=2, status_interval=0.01).run()
+check("stage over budget still runs", stages[0].status, DONE)
+check("stage over budget runs alone", t.index("end", "huge") < t.index("start", "light"), True)
+
+
+# -- cancellation -------------------------------------------------------------
+print("\n-- cancellation --")
+interrupted = threading.Event()
+
+
+def fail():
+    time.sleep(0.02)
+    raise RuntimeError("clone failed")
+
+
+def long_running():
+    if interrupted.wait(5):
+        raise RuntimeError("container stopped")
+
+
+ran = []
+stages = [
+    Stage("clone", fail),
+    Stage("node", long_running),
+    Stage("venv", lambda: ran.append("venv"), deps=("clone",)),
+    Stage("later", lambda: ran.append("later")),
+]
+printer = RecordingPrinter()
+pipeline = Pipeline(stages, printer, budget=2, on_cancel=interrupted.set, status_interval=0.01)
+start = time.time()
+try:
+    pipeline.run()
+    check("failure re-raised", None, "clone failed")
+except RuntimeError as e:
+    check("failure re-raised", str(e), "clone failed")
+status = {name: stage.status for name, stage in pipeline.stages.items()}
+check("failed stage", status["clone"], FAILED)
+check("in-flight stage interrupted", status["node"], CANCELLED)
+check("dependent stage skipped", status["venv"], SKIPPED)
+check("unstarted stage skipped", status["later"], SKIPPED)
+check("skipped stages never ran", ran, [])
+check("cancel hook called", interrupted.is_set(), True)
+check("run returns once interrupted", time.time() - start < 2, True)
+check("failure reported", any("Stage clone failed" in line for line in printer.lines), True)
+
+
+# -- stage output -------------------------------------------------------------
+print("\n-- stage output --")
+
+
+class Holder:
+    pass
+
+
+holder = Holder()
+printer = RecordingPrinter()
+holder.printer = printer
+Pipeline([Stage("clone", lambda: holder.printer.print("cloned frappe"))], printer, status_interval=0.01).run(
+    holders=[holder]
+)
+check("stage output prefixed", "[clone] cloned frappe" in printer.lines, True)
+check("holder printer restored", holder.printer is printer, True)
+
+
+# -- summary ------------------------------------------------------------------
+print(f"\n{'=' * 54}")
+print(f"  {len(PASS)} passed  /  {len(FAIL)} failed  /  {len(PASS) + len(FAIL)} total")
+if FAIL:
+    print("\nFailed:")
+    for f in FAIL:
+        print(f"  - {f}")
+    sys.exit(1)
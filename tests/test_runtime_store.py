@@ -0,0 +1,96 @@
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fmd.runtime_store import REFS_INDEX, RuntimeStore
+
+PASS = []
+FAIL = []
+
+
+def check(label, got, expected):
+    if got == expected:
+        PASS.append(label)
+        print(f"  PASS  {label}")
+    else:
+        FAIL.append(label)
+        print(f"  FAIL  {label}  ->  expected {expected!r}, got {got!r}")
+
+
+def make_runtime(path: Path, binary: str) -> None:
+    (path / "bin").mkdir(parents=True)
+    (path / "bin" / binary).write_text(path.name)
+
+
+workspace = Path(tempfile.mkdtemp(prefix="fmd-runtime-store-"))
+store = RuntimeStore(workspace / ".runtimes")
+
+# Live release from before the store: runtimes are plain directories.
+live = workspace / "release_a"
+make_runtime(live / ".uv" / "python" / "cpython-3.11", "python")
+make_runtime(live / ".fnm" / "node-versions" / "v18.0.0", "node")
+(live / ".uv" / "cache").mkdir(parents=True)
+(live / ".uv" / "cache" / "wheel").write_text("cached")
+(live / ".uv" / "python-default").symlink_to("python/cpython-3.11")
+
+
+# -- seed ---------------------------------------------------------------------
+print("\n-- seed --")
+new = workspace / "release_b"
+new.mkdir()
+linked = store.seed(new, live)
+check("seed: links every version", sorted(linked), ["node/v18.0.0", "python/cpython-3.11"])
+
+link = new / ".uv" / "python" / "cpython-3.11"
+check("seed: version is a symlink", link.is_symlink(), True)
+check("seed: link is relative", os.path.isabs(os.readlink(link)), False)
+check("seed: link resolves into the store", link.resolve(), (store.root / "python" / "cpython-3.11").resolve())
+check("seed: runtime reachable", (link / "bin" / "python").read_text(), "cpython-3.11")
+check("seed: source left in place", (live / ".uv" / "python" / "cpython-3.11").is_symlink(), False)
+check("seed: shared cache linked", (new / ".uv" / "cache").is_symlink(), True)
+check("seed: shared cache content", (new / ".uv" / "cache" / "wheel").read_text(), "cached")
+check("seed: python-default copied", os.readlink(new / ".uv" / "python-default"), "python/cpython-3.11")
+check("seed: again links nothing new", store.seed(new, live), [])
+
+
+# -- adopt --------------------------------------------------------------------
+print("\n-- adopt --")
+make_runtime(new / ".uv" / "python" / "cpython-3.12", "python")
+(new / ".uv" / "python-default").unlink()
+(new / ".uv" / "python-default").symlink_to("python/cpython-3.12")
+
+adopted = store.adopt(new)
+check("adopt: moves installed version", adopted, ["python/cpython-3.12"])
+check("adopt: version now linked", (new / ".uv" / "python" / "cpython-3.12").is_symlink(), True)
+check("adopt: stored in place", (store.root / "python" / "cpython-3.12" / "bin" / "python").is_file(), True)
+check("adopt: unselected inherited link dropped", (new / ".uv" / "python" / "cpython-3.11").is_symlink(), False)
+check("adopt: node link kept without alias", (new / ".fnm" / "node-versions" / "v18.0.0").is_symlink(), True)
+check("adopt: release entries", sorted(store.release_entries(new)), ["node/v18.0.0", "python/cpython-3.12"])
+check("adopt: again adopts nothing", store.adopt(new), [])
+
+
+# -- gc -----------------------------------------------------------------------
+print("\n-- gc --")
+removed = store.gc([live, new])
+check("gc: removes unreferenced version", removed, ["python/cpython-3.11"])
+check("gc: keeps referenced version", (store.root / "python" / "cpython-3.12").is_dir(), True)
+check("gc: writes refs index", (store.root / REFS_INDEX).is_file(), True)
+check("gc: nothing left to remove", store.gc([live, new]), [])
+check("gc: no releases removes all", sorted(store.gc([])), ["node/v18.0.0", "python/cpython-3.12"])
+check("gc: missing store", RuntimeStore(workspace / "missing").gc([new]), [])
+
+shutil.rmtree(workspace, ignore_errors=True)
+
+
+# -- summary ------------------------------------------------------------------
+print(f"\n{'=' * 54}")
+print(f"  {len(PASS)} passed  /  {len(FAIL)} failed  /  {len(PASS) + len(FAIL)} total")
+if FAIL:
+    print("\nFailed:")
+    for f in FAIL:
+        print(f"  - {f}")
+    sys.exit(1)
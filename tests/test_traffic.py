@@ -0,0 +1,123 @@
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fmd.config.switch import SwitchConfig
+from fmd.traffic import LogRateSampler, find_access_logs, wait_for_quiet
+
+PASS = []
+FAIL = []
+
+
+def check(label, got, expected):
+    if got == expected:
+        PASS.append(label)
+        print(f"  PASS  {label}")
+    else:
+        FAIL.append(label)
+        print(f"  FAIL  {label}  ->  expected {expected!r}, got {got!r}")
+
+
+class ScriptedSampler:
+    """Returns the given request counts, then repeats the last one."""
+
+    def __init__(self, counts):
+        self.counts = list(counts)
+        self.paths = []
+
+    def sample(self):
+        return self.counts.pop(0) if len(self.counts) > 1 else self.counts[0]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def wait(counts, **settings):
+    config = SwitchConfig(**{"traffic_wait_interval": 1.0, "traffic_wait_window": 1, **settings})
+    clock = FakeClock()
+    samples = []
+    result = wait_for_quiet(
+        ScriptedSampler(counts),
+        config,
+        on_sample=lambda elapsed, rate: samples.append(rate),
+        clock=clock,
+        sleep=clock.sleep,
+    )
+    return result, samples
+
+
+# -- wait_for_quiet -----------------------------------------------------------
+print("\n-- wait_for_quiet --")
+result, samples = wait([50, 50, 5], traffic_wait_threshold=10)
+check("below threshold: reason", result["reason"], "below threshold")
+check("below threshold: waited", result["waited_seconds"], 3.0)
+check("below threshold: samples reported", samples, [50.0, 50.0, 5.0])
+check("below threshold: highest", result["highest_rps"], 50.0)
+
+result, _ = wait([30, 0, 0, 0], traffic_wait_threshold=5, traffic_wait_window=3)
+check("window: averaged rate", result["rps"], 0.0)
+check("window: one quiet sample isn't enough", result["waited_seconds"], 4.0)
+
+result, _ = wait([40, 20, 30, 35, 20], traffic_wait_threshold=1, traffic_wait_observe=3, traffic_wait_max=60)
+check("local minimum: reason", result["reason"], "local minimum")
+check("local minimum: waited", result["waited_seconds"], 5.0)
+check("local minimum: rate", result["rps"], 20.0)
+check("local minimum: lowest", result["lowest_rps"], 20.0)
+
+result, _ = wait([40, 20, 30, 20], traffic_wait_threshold=1, traffic_wait_observe=30, traffic_wait_max=6)
+check("no local minimum before observe", result["reason"], "deadline reached")
+
+result, _ = wait([30], traffic_wait_threshold=1, traffic_wait_observe=10, traffic_wait_max=4)
+check("deadline: reason", result["reason"], "deadline reached")
+check("deadline: waited", result["waited_seconds"], 4.0)
+check("deadline: rate", result["rps"], 30.0)
+
+result, _ = wait([6], traffic_wait_threshold=1, traffic_wait_interval=2.0, traffic_wait_max=10)
+check("rate is per second", result["rps"], 3.0)
+
+
+# -- LogRateSampler -----------------------------------------------------------
+print("\n-- LogRateSampler --")
+root = Path(tempfile.mkdtemp(prefix="fmd-traffic-"))
+(root / "nginx").mkdir()
+access = root / "nginx" / "access.log"
+access.write_text("old\n" * 10)
+(root / "nginx" / "error.log").write_text("")
+check("find_access_logs", find_access_logs(root / "nginx", root / "missing"), [access])
+
+sampler = LogRateSampler([access, root / "nginx" / "missing-access.log"])
+check("existing lines not counted", sampler.sample(), 0)
+with open(access, "a") as f:
+    f.write("GET /\n" * 7)
+check("appended lines counted", sampler.sample(), 7)
+check("nothing new", sampler.sample(), 0)
+
+access.rename(root / "nginx" / "access.log.1")
+access.write_text("GET /\n" * 3)
+check("rotated log read from start", sampler.sample(), 3)
+
+access.write_text("GET /\n")
+check("truncated log read from start", sampler.sample(), 1)
+
+shutil.rmtree(root, ignore_errors=True)
+
+
+# -- summary ------------------------------------------------------------------
+print(f"\n{'=' * 54}")
+print(f"  {len(PASS)} passed  /  {len(FAIL)} failed  /  {len(PASS) + len(FAIL)} total")
+if FAIL:
+    print("\nFailed:")
+    for f in FAIL:
+        print(f"  - {f}")
+    sys.exit(1)